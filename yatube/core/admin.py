@@ -0,0 +1,38 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'name',
+        'status',
+        'priority',
+        'attempts',
+        'processed',
+        'total',
+        'run_at',
+        'created',
+        'finished',
+    )
+    list_filter = ('status', 'name')
+    readonly_fields = (
+        'name',
+        'payload',
+        'status',
+        'priority',
+        'run_at',
+        'attempts',
+        'max_attempts',
+        'locked_by',
+        'locked_at',
+        'processed',
+        'total',
+        'error',
+        'finished',
+    )
+    empty_value_display = '-пусто-'
+
+
+admin.site.register(Job, JobAdmin)
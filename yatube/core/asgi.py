@@ -0,0 +1,156 @@
+"""Запуск WSGI-приложения под ASGI-сервером.
+
+Django 2.2 не умеет ни ASGI, ни асинхронные представления, поэтому
+приложение целиком выполняется в пуле потоков ограниченного размера,
+а соединения с клиентами обслуживает цикл событий. Медленный клиент
+больше не держит поток: поток занят, только пока работает Django,
+а чтение запроса и отправка ответа идут асинхронно. Исключение —
+потоковые ответы: их куски читаются в потоке запроса.
+"""
+import asyncio
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# Тело запроса больше этого размера уходит из памяти во временный файл.
+MAX_MEMORY_BODY = 1024 * 1024
+
+
+class WsgiToAsgi:
+    def __init__(self, application, max_workers=16):
+        self.application = application
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='asgi'
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self.http(scope, receive, send)
+        else:
+            raise ValueError(f'Неподдерживаемый тип соединения: '
+                             f'{scope["type"]}')
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def http(self, scope, receive, send):
+        body = tempfile.SpooledTemporaryFile(max_size=MAX_MEMORY_BODY)
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                body.close()
+                return
+            body.write(message.get('body', b''))
+            more_body = message.get('more_body', False)
+        body.seek(0)
+        environ = build_environ(scope, body)
+        loop = asyncio.get_running_loop()
+
+        def send_from_thread(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        try:
+            messages = await loop.run_in_executor(
+                self.executor, self.run_application, environ,
+                send_from_thread,
+            )
+        finally:
+            body.close()
+        for message in messages:
+            await send(message)
+
+    def run_application(self, environ, send):
+        """Вызывает приложение в потоке пула.
+
+        Соединения с БД у Django свои в каждом потоке, поэтому весь
+        ответ обрабатывается в одном потоке. Обычный ответ собирается и
+        закрывается здесь же (request_finished закрывает соединение
+        этого потока), а сообщения для клиента возвращаются циклу
+        событий. Потоковый ответ (например, курсор ``.iterator()``)
+        перебирается и закрывается в этом потоке, а каждый кусок ждёт
+        отправки через ``send``: такой ответ держит поток, пока клиент
+        его читает.
+        """
+        response = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [
+                (name.lower().encode('latin1'), value.encode('latin1'))
+                for name, value in response_headers
+            ]
+            return lambda data: None
+
+        def messages(chunks):
+            yield {
+                'type': 'http.response.start',
+                'status': response['status'],
+                'headers': response['headers'],
+            }
+            for chunk in chunks:
+                if chunk:
+                    yield {'type': 'http.response.body', 'body': chunk,
+                           'more_body': True}
+            yield {'type': 'http.response.body', 'body': b''}
+
+        result = self.application(environ, start_response)
+        try:
+            if not getattr(result, 'streaming', True):
+                return list(messages(list(result)))
+            for message in messages(result):
+                send(message)
+            return []
+        finally:
+            _close(result)
+
+
+def _close(result):
+    if hasattr(result, 'close'):
+        result.close()
+
+
+def build_environ(scope, body):
+    # PATH_INFO в WSGI уже раскодирован: берётся path, а не raw_path.
+    path = scope['path']
+    root_path = scope.get('root_path', '')
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path.encode('utf8').decode('latin1'),
+        'PATH_INFO': path.encode('utf8').decode('latin1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+        environ['REMOTE_PORT'] = str(scope['client'][1])
+    for raw_name, raw_value in scope.get('headers', []):
+        name = raw_name.decode('latin1').upper().replace('-', '_')
+        value = raw_value.decode('latin1')
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f'HTTP_{name}'
+        if name in environ:
+            value = f'{environ[name]},{value}'
+        environ[name] = value
+    return environ
@@ -0,0 +1,20 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from . import loader
+
+
+class RequestCachedModelBackend(ModelBackend):
+    """Берёт пользователя сессии из кэша запроса (``core.loader``).
+
+    Если страница уже прочитала этого пользователя, например как
+    автора профиля, ``request.user`` не читается из базы второй раз.
+    """
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = loader.get_object(UserModel, pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,123 @@
+"""Проверки настроек, вредных для производительности.
+
+Запускаются вместе с проверками развёртывания:
+``manage.py check --deploy`` (только эти — ``--tag performance``).
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+PERFORMANCE = 'performance'
+DEBUG_APPS = ('debug_toolbar',)
+LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+CACHED_LOADER = 'django.template.loaders.cached.Loader'
+POOLED_BACKENDS = 'core.db.backends.'
+
+
+def _uses_cached_loader(engine):
+    loaders = engine.get('OPTIONS', {}).get('loaders')
+    if loaders is None:
+        # Без явных загрузчиков Django 2.2 включает кэширующий, только
+        # если DEBUG выключен.
+        return not settings.DEBUG
+    return any(
+        isinstance(loader, (list, tuple)) and loader[0] == CACHED_LOADER
+        for loader in loaders
+    )
+
+
+@register(PERFORMANCE, Tags.compatibility, deploy=True)
+def check_debug(app_configs, **kwargs):
+    warnings = []
+    if settings.DEBUG:
+        warnings.append(Warning(
+            'DEBUG включён: каждый SQL-запрос сохраняется в '
+            'connection.queries, память процесса растёт без ограничений.',
+            id='core.W001',
+        ))
+    debug_apps = [app for app in settings.INSTALLED_APPS
+                  if app.split('.')[0] in DEBUG_APPS]
+    if debug_apps:
+        warnings.append(Warning(
+            f'Отладочные приложения в INSTALLED_APPS: '
+            f'{", ".join(debug_apps)}.',
+            hint='Используйте профиль YATUBE_ENV=prod.',
+            id='core.W002',
+        ))
+    return warnings
+
+
+@register(PERFORMANCE, Tags.templates, deploy=True)
+def check_template_loaders(app_configs, **kwargs):
+    return [
+        Warning(
+            f'Шаблоны движка '
+            f'{engine.get("NAME", engine["BACKEND"].rsplit(".", 2)[-2])} '
+            f'читаются и компилируются заново на каждый запрос.',
+            hint=f'Оберните загрузчики в {CACHED_LOADER}.',
+            id='core.W003',
+        )
+        for engine in settings.TEMPLATES
+        if engine['BACKEND'].endswith('DjangoTemplates')
+        and not _uses_cached_loader(engine)
+    ]
+
+
+@register(PERFORMANCE, Tags.database, deploy=True)
+def check_persistent_connections(app_configs, **kwargs):
+    return [
+        Warning(
+            f'База {alias}: соединение открывается заново на каждый '
+            f'запрос.',
+            hint='Задайте CONN_MAX_AGE больше нуля или используйте пул '
+                 'из core.db.backends.',
+            id='core.W004',
+        )
+        for alias, database in settings.DATABASES.items()
+        if not database.get('CONN_MAX_AGE')
+        and not database['ENGINE'].startswith(POOLED_BACKENDS)
+        and not database['ENGINE'].endswith('sqlite3')
+    ]
+
+
+@register(PERFORMANCE, Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    return [
+        Warning(
+            f'Кэш {alias} хранится в памяти процесса: у каждого '
+            f'процесса свой кэш, сброс из одного не виден другим.',
+            hint='Используйте memcached или другой общий кэш.',
+            id='core.W005',
+        )
+        for alias, cache in settings.CACHES.items()
+        if cache['BACKEND'] in LOCAL_CACHES
+    ]
+
+
+@register(PERFORMANCE, deploy=True)
+def check_request_overhead(app_configs, **kwargs):
+    warnings = []
+    if 'django.middleware.gzip.GZipMiddleware' not in settings.MIDDLEWARE:
+        warnings.append(Warning(
+            'Страницы отдаются без сжатия.',
+            hint='Добавьте django.middleware.gzip.GZipMiddleware или '
+                 'включите сжатие на обратном прокси.',
+            id='core.W006',
+        ))
+    if getattr(settings, 'JOBS_MODE', 'thread') == 'thread':
+        warnings.append(Warning(
+            'Фоновые задачи выполняются в потоках веб-процесса и '
+            'делят с ним CPU.',
+            hint="Задайте JOBS_MODE = 'worker' и запустите "
+                 "manage.py runworker.",
+            id='core.W007',
+        ))
+    if settings.SESSION_ENGINE == 'django.contrib.sessions.backends.db':
+        warnings.append(Warning(
+            'Сессия читается из базы на каждый запрос пользователя.',
+            hint='Используйте cached_db или signed_cookies.',
+            id='core.W008',
+        ))
+    return warnings
@@ -1,6 +1,8 @@
 import datetime
 
+from django.utils.functional import SimpleLazyObject
+
 
 def year(request):
-    """Добавляет переменную с текущим годом."""
-    return {'year': datetime.date.today().year}
+    """Добавляет переменную с текущим годом (вычисляется при обращении)."""
+    return {'year': SimpleLazyObject(lambda: datetime.date.today().year)}
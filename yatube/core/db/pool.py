@@ -0,0 +1,210 @@
+"""Пул соединений с базой данных для бэкендов из ``core.db.backends``.
+
+Django держит отдельное соединение на каждый поток, а с
+``CONN_MAX_AGE = 0`` открывает его заново на каждый запрос. С пулом
+``close()`` возвращает соединение в пул процесса, а следующий запрос
+любого потока берёт уже открытое. Перед выдачей соединение проверяется
+запросом ``SELECT 1``; старые и долго простаивавшие закрываются.
+
+Параметры задаются ключом ``POOL`` в описании базы::
+
+    'POOL': {'MAX_SIZE': 10, 'TIMEOUT': 30,
+             'MAX_IDLE': 300, 'MAX_LIFETIME': 3600}
+"""
+import os
+import threading
+import time
+from collections import Counter, deque
+
+from django.db import DatabaseError
+
+DEFAULTS = {
+    'MAX_SIZE': 10,
+    'TIMEOUT': 30,
+    'MAX_IDLE': 300,
+    'MAX_LIFETIME': 3600,
+}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(DatabaseError):
+    """Свободное соединение не появилось за ``TIMEOUT`` секунд."""
+
+
+class ConnectionPool:
+    def __init__(self, max_size=10, timeout=30, max_idle=300,
+                 max_lifetime=3600):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.pid = os.getpid()
+        self.idle = deque()
+        # Время открытия соединений по id; size учитывает и те, что
+        # сейчас открываются.
+        self.opened = {}
+        self.size = 0
+        self.counters = Counter()
+        self.condition = threading.Condition()
+
+    def _expired(self, raw, returned, now):
+        return (now - returned > self.max_idle
+                or now - self.opened[id(raw)] > self.max_lifetime)
+
+    def _take(self):
+        """Свободное соединение из пула или None, если можно открыть новое.
+
+        Когда пул заполнен, ждёт возврата соединения.
+        """
+        deadline = time.monotonic() + self.timeout
+        with self.condition:
+            while True:
+                while self.idle:
+                    raw, returned = self.idle.pop()
+                    if not self._expired(raw, returned, time.monotonic()):
+                        return raw
+                    self._forget(raw)
+                if self.size < self.max_size:
+                    self.size += 1
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.counters['timeouts'] += 1
+                    raise PoolTimeout(
+                        f'Все {self.max_size} соединений пула заняты'
+                    )
+                self.counters['waits'] += 1
+                self.condition.wait(remaining)
+
+    def _forget(self, raw):
+        """Закрывает соединение и освобождает место в пуле."""
+        del self.opened[id(raw)]
+        self.size -= 1
+        self.counters['discarded'] += 1
+        try:
+            raw.close()
+        except Exception:
+            pass
+        self.condition.notify()
+
+    def acquire(self, connect, check):
+        """Выдаёт проверенное соединение из пула или открывает новое."""
+        while True:
+            raw = self._take()
+            if raw is None:
+                break
+            try:
+                check(raw)
+            except Exception:
+                with self.condition:
+                    self._forget(raw)
+                continue
+            with self.condition:
+                self.counters['reused'] += 1
+            return raw
+        try:
+            raw = connect()
+        except Exception:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.opened[id(raw)] = time.monotonic()
+            self.counters['created'] += 1
+        return raw
+
+    def release(self, raw):
+        with self.condition:
+            if id(raw) not in self.opened:
+                raw.close()
+                return
+            self.idle.append((raw, time.monotonic()))
+            self.condition.notify()
+
+    def discard(self, raw):
+        with self.condition:
+            self._forget(raw)
+
+    def close(self):
+        with self.condition:
+            while self.idle:
+                self._forget(self.idle.pop()[0])
+
+    def stats(self):
+        with self.condition:
+            return {
+                'max_size': self.max_size,
+                'size': self.size,
+                'idle': len(self.idle),
+                'in_use': self.size - len(self.idle),
+                **{name: self.counters[name] for name in (
+                    'created', 'reused', 'discarded', 'waits', 'timeouts',
+                )},
+            }
+
+
+def get_pool(alias, options=None):
+    """Пул процесса для базы ``alias``.
+
+    После fork пул родителя не используется: его соединения принадлежат
+    родительскому процессу.
+    """
+    with _pools_lock:
+        pool = _pools.get(alias)
+        if pool is None or pool.pid != os.getpid():
+            options = dict(DEFAULTS, **(options or {}))
+            pool = _pools[alias] = ConnectionPool(
+                max_size=options['MAX_SIZE'],
+                timeout=options['TIMEOUT'],
+                max_idle=options['MAX_IDLE'],
+                max_lifetime=options['MAX_LIFETIME'],
+            )
+        return pool
+
+
+def stats():
+    """Метрики пулов текущего процесса по псевдонимам баз."""
+    return {
+        alias: pool.stats() for alias, pool in _pools.items()
+        if pool.pid == os.getpid()
+    }
+
+
+def check_connection(raw):
+    cursor = raw.cursor()
+    try:
+        cursor.execute('SELECT 1')
+    finally:
+        cursor.close()
+
+
+class PooledDatabaseWrapperMixin:
+    """Берёт соединения из пула и возвращает их туда вместо закрытия."""
+
+    @property
+    def pool(self):
+        return get_pool(self.alias, self.settings_dict.get('POOL'))
+
+    def get_new_connection(self, conn_params):
+        return self.pool.acquire(
+            lambda: super(PooledDatabaseWrapperMixin, self)
+            .get_new_connection(conn_params),
+            check_connection,
+        )
+
+    def _close(self):
+        if self.connection is None:
+            return
+        # Соединение с незавершённой транзакцией в пул не возвращается.
+        if self.in_atomic_block or not self.get_autocommit():
+            self.pool.discard(self.connection)
+            return
+        try:
+            self.connection.rollback()
+        except Exception:
+            self.pool.discard(self.connection)
+        else:
+            self.pool.release(self.connection)
@@ -0,0 +1,277 @@
+"""Фоновые задачи без внешнего брокера.
+
+Очередь — таблица ``Job`` в основной базе. Задача регистрируется
+декоратором ``@task`` или ``@background`` и ставится в очередь через
+``enqueue``. Что происходит дальше, решает ``JOBS_MODE``:
+
+* ``sync`` — задача выполняется сразу (тесты);
+* ``thread`` — после коммита запускается поток в этом же процессе;
+* ``worker`` — задача только сохраняется, её выполняет
+  ``manage.py runworker``.
+
+Отложенную задачу (``delay``) в любом режиме выполняет обработчик,
+когда подойдёт её время.
+
+Обработчик берёт задачи по приоритету, упавшие повторяет с
+экспоненциальной задержкой. Прогресс виден в админке.
+"""
+import json
+import os
+import random
+import socket
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+TASKS = {}
+
+# Сколько готовых задач просматривать за одну попытку захвата.
+CLAIM_BATCH = 10
+
+
+def task(func):
+    """Регистрирует функцию как фоновую задачу.
+
+    Функция получает первым аргументом объект ``Job``, остальные
+    параметры передаются именованными аргументами из ``Job.payload``.
+    Задачи ищутся по имени функции, поэтому одноимённая задача из
+    другого модуля — ошибка конфигурации.
+    """
+    registered = TASKS.get(func.__name__)
+    if registered is not None and (
+            (registered.__module__, registered.__qualname__)
+            != (func.__module__, func.__qualname__)):
+        raise ImproperlyConfigured(
+            f'Задача {func.__name__} уже объявлена в '
+            f'{registered.__module__}.'
+        )
+    TASKS[func.__name__] = func
+    return func
+
+
+def background(func=None, *, priority=Job.NORMAL, max_attempts=3):
+    """Делает из обычной функции фоновую задачу.
+
+    Прямой вызов по-прежнему выполняет функцию сразу, а
+    ``func.delay(**params)`` ставит её в очередь. Параметры хранятся в
+    JSON, поэтому передавать нужно id, а не объекты моделей.
+    """
+    def decorator(func):
+        def run(job, **params):
+            return func(**params)
+        run.__module__ = func.__module__
+        run.__name__ = func.__name__
+        run.__qualname__ = func.__qualname__
+        task(run)
+
+        def delay(**params):
+            return enqueue(func.__name__, params, priority=priority,
+                           max_attempts=max_attempts)
+        func.delay = delay
+        return func
+
+    if func is None:
+        return decorator
+    return decorator(func)
+
+
+def chunked(items, size):
+    """Режет последовательность на куски не длиннее ``size``."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def worker_name(suffix=''):
+    name = f'{socket.gethostname()}:{os.getpid()}'
+    return f'{name}:{suffix}' if suffix else name
+
+
+def backoff(attempt):
+    """Задержка перед повтором: 10, 20, 40... секунд с разбросом."""
+    base = getattr(settings, 'JOBS_RETRY_DELAY', 10)
+    limit = getattr(settings, 'JOBS_RETRY_MAX_DELAY', 60 * 60)
+    delay = min(base * 2 ** (attempt - 1), limit)
+    return timedelta(seconds=delay * random.uniform(1, 1.25))
+
+
+def _lock(job_id, worker):
+    """Переводит задачу в работу, если её ещё никто не взял."""
+    return Job.objects.filter(pk=job_id, status=Job.PENDING).update(
+        status=Job.RUNNING,
+        locked_by=worker,
+        locked_at=timezone.now(),
+        attempts=F('attempts') + 1,
+    ) == 1
+
+
+def claim(worker):
+    """Берёт в работу самую приоритетную из готовых задач.
+
+    Захват — условный UPDATE по статусу, поэтому несколько
+    обработчиков не получат одну задачу и без SELECT FOR UPDATE.
+    """
+    ready = Job.objects.filter(
+        status=Job.PENDING, run_at__lte=timezone.now()
+    ).order_by('-priority', 'run_at', 'pk').values_list('pk', flat=True)
+    for job_id in ready[:CLAIM_BATCH]:
+        if _lock(job_id, worker):
+            return Job.objects.get(pk=job_id)
+    return None
+
+
+def execute(job):
+    """Выполняет взятую задачу и записывает результат.
+
+    Упавшая задача возвращается в очередь с задержкой, пока не
+    исчерпаны попытки.
+    """
+    try:
+        TASKS[job.name](job, **job.params)
+    except Exception:
+        job.error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = Job.PENDING
+            job.run_at = timezone.now() + backoff(job.attempts)
+            job.processed = 0
+        else:
+            job.status = Job.FAILED
+            job.finished = timezone.now()
+    else:
+        job.status = Job.DONE
+        job.error = ''
+        job.finished = timezone.now()
+    job.locked_by = ''
+    job.locked_at = None
+    job.save(update_fields=(
+        'status', 'error', 'finished', 'run_at', 'processed',
+        'locked_by', 'locked_at',
+    ))
+    return job
+
+
+def run_job(job_id, worker=None):
+    if _lock(job_id, worker or worker_name()):
+        return execute(Job.objects.get(pk=job_id))
+    return Job.objects.get(pk=job_id)
+
+
+def _run_in_thread(job_id):
+    try:
+        run_job(job_id)
+    finally:
+        connection.close()
+
+
+def create_job(name, params=None, *, priority=Job.NORMAL, delay=0,
+               max_attempts=3):
+    """Сохраняет задачу в очереди, не запуская её."""
+    if name not in TASKS:
+        raise KeyError(f'Неизвестная задача: {name}')
+    return Job.objects.create(
+        name=name,
+        payload=json.dumps(params or {}),
+        priority=priority,
+        max_attempts=max_attempts,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def enqueue(name, params=None, *, priority=Job.NORMAL, delay=0,
+            max_attempts=3):
+    """Ставит задачу в очередь и запускает её согласно ``JOBS_MODE``.
+
+    ``params`` — словарь именованных аргументов задачи; ``priority``,
+    ``delay`` (секунды до запуска) и ``max_attempts`` относятся к
+    самой очереди.
+    """
+    job = create_job(name, params, priority=priority, delay=delay,
+                     max_attempts=max_attempts)
+    if delay:
+        return job
+    mode = getattr(settings, 'JOBS_MODE', 'thread')
+    if mode == 'sync':
+        return run_job(job.pk)
+    if mode == 'thread':
+        transaction.on_commit(lambda: threading.Thread(
+            target=_run_in_thread, args=(job.pk,), daemon=True
+        ).start())
+    return job
+
+
+def release_stale(timeout):
+    """Возвращает в очередь задачи, обработчик которых пропал.
+
+    Задача, от которой ``timeout`` секунд не было вестей (``locked_at``
+    обновляется при захвате и в ``Job.advance``), считается брошенной:
+    она снова ставится в очередь или, если попытки кончились,
+    помечается ошибкой.
+    """
+    stale = Job.objects.filter(
+        status=Job.RUNNING,
+        locked_at__lt=timezone.now() - timedelta(seconds=timeout),
+    )
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.FAILED,
+        error='Обработчик не завершил задачу.',
+        finished=timezone.now(),
+        locked_by='',
+        locked_at=None,
+    )
+    retried = stale.update(
+        status=Job.PENDING, locked_by='', locked_at=None
+    )
+    return failed + retried
+
+
+def schedule_periodic(schedule=None):
+    """Ставит в очередь периодические задачи из ``JOBS_SCHEDULE``.
+
+    Задача не ставится, пока предыдущая ещё в очереди или с момента
+    её создания не прошёл интервал, поэтому несколько обработчиков
+    не дублируют друг друга.
+    """
+    if schedule is None:
+        schedule = getattr(settings, 'JOBS_SCHEDULE', {})
+    created = []
+    for name, options in schedule.items():
+        since = timezone.now() - timedelta(seconds=options['interval'])
+        if Job.objects.filter(
+            Q(created__gte=since) | Q(status__in=(Job.PENDING, Job.RUNNING)),
+            name=name,
+        ).exists():
+            continue
+        created.append(create_job(
+            name, options.get('params'),
+            priority=options.get('priority', Job.LOW),
+        ))
+    return created
+
+
+def work(worker, stop, poll_interval=1.0, burst=False):
+    """Цикл обработчика: берёт и выполняет задачи до сигнала ``stop``.
+
+    С ``burst`` выходит, как только очередь опустела. Возвращает число
+    выполненных задач.
+    """
+    done = 0
+    try:
+        while not stop.is_set():
+            job = claim(worker)
+            if job is None:
+                if burst:
+                    break
+                stop.wait(poll_interval)
+                continue
+            execute(job)
+            done += 1
+    finally:
+        connection.close()
+    return done
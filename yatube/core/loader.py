@@ -0,0 +1,209 @@
+"""Пакетная загрузка связанных объектов в пределах запроса.
+
+После ``install()`` обращение к ещё не загруженному ``post.author``
+загружает авторов сразу для всех постов этого запроса, у которых
+автор тоже не загружен: один ``IN (...)`` на модель вместо запроса на
+каждый пост. Загруженные объекты хранятся в карте идентичности, так
+что один и тот же пользователь не читается из базы дважды. Шаблоны и
+представления менять не нужно. Загрузчик включает
+``BatchLoaderMiddleware``; вне запроса работает обычная ленивая
+загрузка Django.
+
+Тот же объект служит кэшем запроса для явных выборок: ``get_object``
+и ``memoize`` выполняют одинаковый поиск или проверку один раз за
+запрос, где бы их ни вызвали — в представлении, шаблонном теге или
+контекст-процессоре.
+"""
+import threading
+import weakref
+from collections import defaultdict
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.fields.related_descriptors import (
+    ForwardManyToOneDescriptor)
+from django.db.models.signals import post_init
+
+_local = threading.local()
+_originals = {}
+
+
+class BatchLoader:
+    """Экземпляры моделей запроса и карта идентичности."""
+
+    def __init__(self):
+        # Слабые ссылки: загрузчик не должен удерживать объекты,
+        # которые представление уже отпустило.
+        self.instances = defaultdict(dict)
+        self.identity = defaultdict(dict)
+        self.memo = {}
+        self.queries = 0
+        self.resolved = 0
+
+    def register(self, instance):
+        self.instances[type(instance)][id(instance)] = weakref.ref(instance)
+
+    def loaded(self, model, complete=False):
+        """Живые экземпляры ``model``, прочитанные из базы.
+
+        С ``complete`` — только без отложенных полей: такие можно
+        отдавать вместо нового чтения.
+        """
+        for ref in list(self.instances[model].values()):
+            instance = ref()
+            if (instance is not None and not instance._state.adding
+                    and not (complete and instance.get_deferred_fields())):
+                yield instance
+
+    def lookup(self, model, keys, db):
+        """Объекты ``model`` по первичным ключам: из карты или одним IN."""
+        identity = self.identity[model, db]
+        missing = set(keys) - identity.keys()
+        if missing:
+            for instance in self.loaded(model, complete=True):
+                if instance.pk in missing and instance._state.db == db:
+                    identity[instance.pk] = instance
+            missing -= identity.keys()
+        if missing:
+            for instance in model._base_manager.db_manager(db).filter(
+                    pk__in=missing):
+                identity[instance.pk] = instance
+            self.queries += 1
+        return identity
+
+    def find(self, queryset, lookup):
+        """Уже прочитанный объект, подходящий под простой ``lookup``."""
+        attnames = {}
+        for name, value in lookup.items():
+            if name == 'pk':
+                attnames[queryset.model._meta.pk.attname] = value
+                continue
+            try:
+                field = queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete or field.is_relation:
+                return None
+            attnames[field.attname] = value
+        for instance in self.loaded(queryset.model, complete=True):
+            if instance._state.db == queryset.db and all(
+                    getattr(instance, attname) == value
+                    for attname, value in attnames.items()):
+                return instance
+        return None
+
+    def load(self, field, instance):
+        """Загружает ``field`` у ``instance`` и у всех его соседей."""
+        db = instance._state.db
+        peers = [
+            peer for peer in self.loaded(type(instance))
+            if peer._state.db == db and not field.is_cached(peer)
+            and peer.__dict__.get(field.attname) is not None
+        ]
+        if not any(peer is instance for peer in peers):
+            peers.append(instance)
+        found = self.lookup(
+            field.remote_field.model,
+            {getattr(peer, field.attname) for peer in peers},
+            db,
+        )
+        for peer in peers:
+            related = found.get(getattr(peer, field.attname))
+            if related is not None and peer is not instance:
+                field.set_cached_value(peer, related)
+                self.resolved += 1
+        key = getattr(instance, field.attname)
+        if key not in found:
+            raise field.remote_field.model.DoesNotExist(
+                f'{field.remote_field.model._meta.object_name} '
+                f'с ключом {key} не найден.'
+            )
+        return found[key]
+
+
+def memoize(key, func):
+    """Результат ``func()``, вычисленный один раз за запрос."""
+    loader = getattr(_local, 'loader', None)
+    if loader is None:
+        return func()
+    if key not in loader.memo:
+        loader.memo[key] = func()
+    else:
+        loader.resolved += 1
+    return loader.memo[key]
+
+
+def get_object(queryset, **lookup):
+    """Как ``queryset.get(**lookup)``, но без повторных запросов.
+
+    Объект берётся из прочитанных в этом запросе, если простой поиск
+    по полям однозначно на него указывает, а у выборки нет своих
+    условий (их прочитанный объект может не проходить). Отсутствие
+    объекта тоже запоминается.
+    """
+    queryset = getattr(queryset, '_default_manager', queryset).all()
+    loader = getattr(_local, 'loader', None)
+    if loader is None:
+        return queryset.get(**lookup)
+    key = ('get', queryset.model, queryset.db, str(queryset.query),
+           tuple(sorted(lookup.items())))
+    if key in loader.memo:
+        loader.resolved += 1
+    else:
+        instance = None
+        if not queryset.query.where:
+            instance = loader.find(queryset, lookup)
+        if instance is not None:
+            loader.resolved += 1
+        else:
+            try:
+                instance = queryset.get(**lookup)
+            except queryset.model.DoesNotExist:
+                pass
+        loader.memo[key] = instance
+    if loader.memo[key] is None:
+        raise queryset.model.DoesNotExist(
+            f'{queryset.model._meta.object_name} не найден.'
+        )
+    return loader.memo[key]
+
+
+def remember(instance):
+    """Добавляет к объектам запроса экземпляр не из базы, например из кэша."""
+    loader = getattr(_local, 'loader', None)
+    if loader is not None:
+        loader.register(instance)
+
+
+def _register(sender, instance, **kwargs):
+    loader = getattr(_local, 'loader', None)
+    if loader is not None:
+        loader.register(instance)
+
+
+def _batched_get_object(self, instance):
+    loader = getattr(_local, 'loader', None)
+    field = self.field
+    if (loader is None or field.remote_field.parent_link
+            or not field.target_field.primary_key):
+        return _originals['get_object'](self, instance)
+    return loader.load(field, instance)
+
+
+def install():
+    """Подменяет ленивую загрузку FK; повторный вызов ничего не делает."""
+    if _originals:
+        return
+    _originals['get_object'] = ForwardManyToOneDescriptor.get_object
+    ForwardManyToOneDescriptor.get_object = _batched_get_object
+    post_init.connect(_register, dispatch_uid='core.loader')
+
+
+def start():
+    _local.loader = BatchLoader()
+    return _local.loader
+
+
+def stop():
+    loader = getattr(_local, 'loader', None)
+    _local.loader = None
+    return loader
@@ -0,0 +1,111 @@
+"""Кэш поиска объектов по полю из URL: slug группы, имя пользователя.
+
+Найденный объект хранится в общем кэше ``LOOKUP_CACHE_TIMEOUT``
+секунд, отсутствие — ``LOOKUP_MISSING_TIMEOUT`` секунд, чтобы перебор
+несуществующих адресов не доходил до базы. Сохранение и удаление
+объекта сбрасывают ключи старого и нового значения поля; изменения в
+обход сигналов (``QuerySet.update``) видны по истечении таймаута.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.http import Http404
+
+from . import loader
+
+MISSING = 'missing'
+
+
+class LookupCache:
+    def __init__(self, model, field, only=None, filters=None):
+        self.model = model
+        self.field = field
+        # Поля, которые попадают в кэш; остальные отложены.
+        self.only = only
+        # Условия, без которых объект считается отсутствующим.
+        self.filters = filters or {}
+
+    def key(self, value):
+        digest = hashlib.md5(str(value).encode()).hexdigest()
+        return f'lookup:{self.model._meta.label_lower}:{self.field}:{digest}'
+
+    def fetch(self, value):
+        queryset = self.model._default_manager.all()
+        if self.only:
+            queryset = queryset.only(*self.only)
+        return queryset.filter(**self.filters, **{self.field: value}).first()
+
+    def get(self, value):
+        """Объект с ``field == value``; ``DoesNotExist``, если его нет."""
+        instance = loader.memoize(
+            ('lookup', self.model, self.field, value),
+            lambda: self._get(value),
+        )
+        if instance is None:
+            raise self.model.DoesNotExist(
+                f'{self.model._meta.object_name} {value} не найден.'
+            )
+        return instance
+
+    def _get(self, value):
+        key = self.key(value)
+        instance = cache.get(key)
+        if instance == MISSING:
+            return None
+        if instance is None:
+            instance = self.fetch(value)
+            if instance is None:
+                cache.set(key, MISSING, settings.LOOKUP_MISSING_TIMEOUT)
+                return None
+            cache.set(key, instance, settings.LOOKUP_CACHE_TIMEOUT)
+        loader.remember(instance)
+        return instance
+
+    def get_or_404(self, value):
+        try:
+            return self.get(value)
+        except self.model.DoesNotExist:
+            raise Http404(f'{self.model._meta.object_name} не найден.')
+
+    def invalidate(self, *values):
+        cache.delete_many([self.key(value) for value in set(values)])
+
+    def _skip(self, update_fields):
+        """Сохранение не трогает закэшированные поля (например, last_login)."""
+        if update_fields is None or not self.only:
+            return False
+        cached = {self.field, *self.only, *self.filters}
+        return not (cached & set(update_fields))
+
+    def _remember_old_value(self, sender, instance, update_fields=None,
+                            **kwargs):
+        if instance.pk is None or self._skip(update_fields):
+            return
+        old_values = instance.__dict__.setdefault('_lookup_old_values', {})
+        old_values[self.field] = (
+            self.model._default_manager.filter(pk=instance.pk)
+            .values_list(self.field, flat=True).first()
+        )
+
+    def _invalidate_saved(self, sender, instance, update_fields=None,
+                          **kwargs):
+        if self._skip(update_fields):
+            return
+        old = instance.__dict__.get('_lookup_old_values', {}).pop(
+            self.field, None
+        )
+        self.invalidate(getattr(instance, self.field), *filter(None, [old]))
+
+    def _invalidate_deleted(self, sender, instance, **kwargs):
+        self.invalidate(getattr(instance, self.field))
+
+    def connect(self):
+        uid = f'lookup:{self.model._meta.label_lower}:{self.field}'
+        pre_save.connect(self._remember_old_value, sender=self.model,
+                         dispatch_uid=uid, weak=False)
+        post_save.connect(self._invalidate_saved, sender=self.model,
+                          dispatch_uid=uid, weak=False)
+        post_delete.connect(self._invalidate_deleted, sender=self.model,
+                            dispatch_uid=uid, weak=False)
@@ -0,0 +1,131 @@
+import asyncio
+import io
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+
+from core.asgi import WsgiToAsgi
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает WSGI и ASGI-режим при медленных клиентах: один и тот '
+        'же пул из --workers потоков, --connections одновременных '
+        'соединений, каждый клиент читает ответ --client-delay секунд.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/about/author/')
+        parser.add_argument('--requests', type=int, default=400)
+        parser.add_argument('--connections', type=int, default=100)
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument('--client-delay', type=float, default=0.05)
+
+    def handle(self, *args, **options):
+        application = get_wsgi_application()
+        for label, bench in (('WSGI', self.bench_wsgi),
+                             ('ASGI', self.bench_asgi)):
+            started = time.perf_counter()
+            latencies = bench(application, options)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'{label}: {len(latencies) / elapsed:.1f} запросов/с, '
+                f'медиана {statistics.median(latencies) * 1000:.1f} мс, '
+                f'p95 {self.p95(latencies) * 1000:.1f} мс'
+            )
+
+    @staticmethod
+    def p95(latencies):
+        return sorted(latencies)[int(len(latencies) * 0.95) - 1]
+
+    @staticmethod
+    def environ(path):
+        return {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path,
+            'QUERY_STRING': '',
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'wsgi.input': io.BytesIO(),
+            'wsgi.errors': sys.stderr,
+            'wsgi.url_scheme': 'http',
+        }
+
+    @staticmethod
+    def per_connection(options):
+        return max(options['requests'] // options['connections'], 1)
+
+    def bench_wsgi(self, application, options):
+        """Поток синхронного сервера занят, пока клиент читает ответ."""
+        workers = threading.BoundedSemaphore(options['workers'])
+
+        def connection(_):
+            latencies = []
+            for _ in range(self.per_connection(options)):
+                started = time.perf_counter()
+                with workers:
+                    result = application(
+                        self.environ(options['path']), lambda *args: None
+                    )
+                    for _ in result:
+                        pass
+                    time.sleep(options['client_delay'])
+                    result.close()
+                latencies.append(time.perf_counter() - started)
+            return latencies
+
+        with ThreadPoolExecutor(options['connections']) as executor:
+            return [
+                latency
+                for latencies in executor.map(
+                    connection, range(options['connections'])
+                )
+                for latency in latencies
+            ]
+
+    def bench_asgi(self, application, options):
+        """Поток занят только на время работы Django."""
+        adapter = WsgiToAsgi(application, max_workers=options['workers'])
+        scope = {
+            'type': 'http',
+            'method': 'GET',
+            'path': options['path'],
+            'query_string': b'',
+            'headers': [(b'host', b'localhost')],
+        }
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            if (message['type'] == 'http.response.body'
+                    and not message.get('more_body')):
+                await asyncio.sleep(options['client_delay'])
+
+        async def connection():
+            latencies = []
+            for _ in range(self.per_connection(options)):
+                started = time.perf_counter()
+                await adapter(scope, receive, send)
+                latencies.append(time.perf_counter() - started)
+            return latencies
+
+        async def run():
+            return await asyncio.gather(*(
+                connection() for _ in range(options['connections'])
+            ))
+
+        try:
+            return [
+                latency
+                for latencies in asyncio.run(run())
+                for latency in latencies
+            ]
+        finally:
+            adapter.executor.shutdown()
@@ -0,0 +1,117 @@
+import io
+import statistics
+import sys
+import time
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.urls import reverse
+
+from core.db import pool
+from posts.models import Post
+
+ENGINES = {
+    'django.db.backends.postgresql': 'core.db.backends.postgresql',
+    'django.db.backends.sqlite3': 'core.db.backends.sqlite3',
+}
+PLAIN_ENGINES = {pooled: plain for plain, pooled in ENGINES.items()}
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает стоимость соединения с базой на запрос для index и '
+        'post_detail: новое соединение на каждый запрос, постоянное '
+        'соединение потока (CONN_MAX_AGE) и пул core.db.backends. '
+        'Запросы идут через WSGIHandler, поэтому соединения закрываются '
+        'так же, как на сервере.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+
+    def handle(self, *args, **options):
+        post = Post.objects.order_by('pk').first()
+        if post is None:
+            raise CommandError('В базе нет постов для post_detail.')
+        paths = {
+            'index': reverse('posts:index'),
+            'post_detail': reverse('posts:post_detail', args=(post.pk,)),
+        }
+        base = dict(connections.databases['default'])
+        engine = PLAIN_ENGINES.get(base['ENGINE'], base['ENGINE'])
+        if engine not in ENGINES:
+            raise CommandError(f'Пул не поддерживает {engine}.')
+        modes = (
+            ('соединение на запрос', dict(base, ENGINE=engine,
+                                          CONN_MAX_AGE=0)),
+            ('CONN_MAX_AGE', dict(base, ENGINE=engine, CONN_MAX_AGE=None)),
+            ('пул', dict(base, ENGINE=ENGINES[engine], CONN_MAX_AGE=0)),
+        )
+        handler = WSGIHandler()
+        for label, database in modes:
+            self.use_database(database)
+            for name, path in paths.items():
+                latencies, opened = self.bench(
+                    handler, path, options['requests']
+                )
+                self.stdout.write(
+                    f'{label:>20} {name:>12}: медиана '
+                    f'{statistics.median(latencies) * 1000:.2f} мс, '
+                    f'новых соединений {opened}'
+                )
+        self.stdout.write(f'Пул: {pool.stats().get("default")}')
+        self.use_database(base)
+
+    @staticmethod
+    def use_database(database):
+        """Переключает псевдоним default на другие настройки базы."""
+        connections['default'].close()
+        connections.databases['default'] = database
+        del connections._connections.default
+
+    def opened(self):
+        """Сколько соединений открыто с начала замера.
+
+        У пула connection_created срабатывает на каждую выдачу
+        соединения, поэтому для него берётся счётчик самого пула.
+        """
+        if isinstance(connections['default'],
+                      pool.PooledDatabaseWrapperMixin):
+            return pool.stats().get('default', {}).get('created', 0)
+        return self.connections_created
+
+    def count_connection(self, sender, connection, **kwargs):
+        self.connections_created += 1
+
+    def bench(self, handler, path, count):
+        self.connections_created = 0
+        opened = self.opened()
+        connection_created.connect(self.count_connection)
+        latencies = []
+        try:
+            for _ in range(count):
+                started = time.perf_counter()
+                self.request(handler, path)
+                latencies.append(time.perf_counter() - started)
+        finally:
+            connection_created.disconnect(self.count_connection)
+        return latencies, self.opened() - opened
+
+    @staticmethod
+    def request(handler, path):
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path,
+            'QUERY_STRING': '',
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'wsgi.input': io.BytesIO(),
+            'wsgi.errors': sys.stderr,
+            'wsgi.url_scheme': 'http',
+        }
+        response = handler(environ, lambda status, headers: None)
+        b''.join(response)
+        response.close()
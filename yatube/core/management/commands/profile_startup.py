@@ -0,0 +1,60 @@
+import statistics
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.startup import import_report, measure_first_request
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет холодный старт: время импорта по пакетам (-X '
+        'importtime) и время от запуска процесса до первого ответа. '
+        'Завершается ошибкой, если медиана хуже цели STARTUP_TARGET_MS. '
+        'Профиль настроек выбирается через --settings.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/')
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument(
+            '--top', type=int, default=15,
+            help='Сколько самых дорогих пакетов показать.',
+        )
+        parser.add_argument(
+            '--target', type=int, default=None,
+            help='Цель в миллисекундах до первого ответа.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            self.report(options)
+        except RuntimeError as error:
+            raise CommandError(f'Процесс не запустился: {error}')
+
+    def report(self, options):
+        apps = {
+            name.split('.')[0] for name in settings.INSTALLED_APPS
+        }
+        self.stdout.write(f'Импорт при старте ({settings.SETTINGS_MODULE}):')
+        for package, own in import_report(options['path'])[:options['top']]:
+            mark = '*' if package in apps else ' '
+            self.stdout.write(f'{own / 1000:9.1f} мс {mark} {package}')
+
+        runs = [measure_first_request(options['path'])
+                for _ in range(options['runs'])]
+        median = {
+            key: statistics.median(run[key] for run in runs) * 1000
+            for key in ('boot', 'request', 'total')
+        }
+        self.stdout.write(
+            f'Первый ответ {runs[0]["status"]}: загрузка '
+            f'{median["boot"]:.0f} мс, запрос {median["request"]:.0f} мс, '
+            f'от запуска процесса {median["total"]:.0f} мс '
+            f'(медиана из {len(runs)})'
+        )
+        target = options['target'] or settings.STARTUP_TARGET_MS
+        if median['total'] > target:
+            raise CommandError(
+                f'Старт {median["total"]:.0f} мс дольше цели {target} мс'
+            )
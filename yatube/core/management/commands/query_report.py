@@ -0,0 +1,80 @@
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Post
+
+User = get_user_model()
+
+MODES = (('без кэша запроса', False), ('с кэшем запроса', True))
+
+
+class Command(BaseCommand):
+    help = (
+        'Считает SQL-запросы страниц ленты с кэшем запроса '
+        '(core.loader) и без него: сколько всего и сколько из них '
+        'повторяют уже выполненные. Кэши страниц и фрагментов на время '
+        'замера отключаются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--username',
+            help='Открывать страницы от имени этого пользователя.',
+        )
+
+    def handle(self, *args, **options):
+        user = None
+        if options['username']:
+            user = User.objects.filter(username=options['username']).first()
+            if user is None:
+                raise CommandError(
+                    f'Пользователь {options["username"]} не найден.'
+                )
+        for path in self.paths(user):
+            counts = [self.measure(path, user, enabled)
+                      for _, enabled in MODES]
+            self.stdout.write(f'{path:>40}  ' + '  '.join(
+                f'{label}: {total} (повторов {duplicates})'
+                for (label, _), (total, duplicates) in zip(MODES, counts)
+            ))
+
+    @staticmethod
+    def paths(user):
+        post = Post.objects.select_related('author', 'group').first()
+        if post is None:
+            raise CommandError('В базе нет постов.')
+        paths = [
+            reverse('posts:index'),
+            reverse('posts:popular'),
+            reverse('posts:profile', args=(post.author.username,)),
+            reverse('posts:post_detail', args=(post.pk,)),
+        ]
+        if post.group:
+            paths.append(reverse('posts:group_list', args=(post.group.slug,)))
+        if user is not None:
+            paths.append(reverse('posts:follow_index'))
+        return paths
+
+    @staticmethod
+    def measure(path, user, enabled):
+        """Число запросов страницы и повторов среди них."""
+        with override_settings(
+            BATCH_LOADER=enabled,
+            ALLOWED_HOSTS=['*'],
+            CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+            }},
+        ):
+            client = Client()
+            if user is not None:
+                client.force_login(user)
+            with CaptureQueriesContext(connection) as queries:
+                client.get(path)
+        repeats = Counter(query['sql'] for query in queries)
+        return len(queries), sum(count - 1 for count in repeats.values())
@@ -0,0 +1,93 @@
+import multiprocessing
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.jobs import release_stale, schedule_periodic, work, worker_name
+
+
+def serve(stop, threads, poll_interval, burst):
+    """Запускает ``threads`` обработчиков в текущем процессе."""
+    pool = [
+        threading.Thread(
+            target=work,
+            args=(worker_name(str(number)), stop, poll_interval, burst),
+            name=f'worker-{number}',
+        )
+        for number in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет фоновые задачи из очереди в базе данных. Задачи '
+        'разбираются пулом процессов и потоков по приоритету; упавшие '
+        'повторяются с задержкой. Периодические задачи из JOBS_SCHEDULE '
+        'ставятся в очередь этим же процессом.'
+    )
+    # Проверки моделей импортируют Pillow ради ImageField, а обработчику
+    # задач они не нужны.
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=1,
+            help='Сколько процессов запустить.',
+        )
+        parser.add_argument(
+            '--threads', type=int, default=4,
+            help='Сколько потоков-обработчиков в каждом процессе.',
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=1.0,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+        parser.add_argument(
+            '--burst', action='store_true',
+            help='Выйти, когда очередь опустеет.',
+        )
+
+    def handle(self, *args, **options):
+        context = multiprocessing.get_context('fork')
+        stop = context.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *args: stop.set())
+        self.maintain()
+        serve_args = (stop, options['threads'], options['poll_interval'],
+                      options['burst'])
+        # Дочерние процессы не должны наследовать открытые соединения.
+        connections.close_all()
+        children = [
+            context.Process(target=serve, args=serve_args)
+            for _ in range(options['processes'] - 1)
+        ]
+        for child in children:
+            child.start()
+        supervisor = threading.Thread(target=serve, args=serve_args)
+        supervisor.start()
+        self.stdout.write(
+            f'Обработчиков: {options["processes"] * options["threads"]}'
+        )
+        while supervisor.is_alive():
+            stop.wait(settings.JOBS_MAINTENANCE_INTERVAL)
+            if supervisor.is_alive() and not stop.is_set():
+                self.maintain()
+        for child in children:
+            child.join()
+        connections.close_all()
+
+    def maintain(self):
+        released = release_stale(settings.JOBS_LOCK_TIMEOUT)
+        scheduled = schedule_periodic()
+        if released or scheduled:
+            self.stdout.write(
+                f'Возвращено в очередь: {released}, '
+                f'запланировано: {len(scheduled)}'
+            )
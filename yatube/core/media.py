@@ -0,0 +1,139 @@
+"""Раздача загруженных файлов из MEDIA_ROOT в боевом режиме.
+
+Файл отдаётся через ``FileResponse``: WSGI-сервер с
+``wsgi.file_wrapper`` (gunicorn, uWSGI) передаёт его через
+``os.sendfile`` без чтения в Python. Поддерживаются ``Range`` и
+``If-None-Match``. С ``MEDIA_ACCEL`` файл вообще не читается —
+ответ с заголовком X-Accel-Redirect (nginx) или X-Sendfile (Apache)
+отдаёт веб-сервер.
+"""
+import os
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (FileResponse, Http404, HttpResponse,
+                         HttpResponseNotModified)
+from django.utils._os import safe_join
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeFile:
+    """Файл, читаемый только в пределах диапазона байтов."""
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.file.seek(start)
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def tell(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """Возвращает (начало, длина) для одного диапазона или None.
+
+    Несколько диапазонов не поддерживаются — тогда отдаётся весь файл.
+    Для невыполнимого диапазона возбуждает ValueError.
+    """
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start > end:
+        raise ValueError(header)
+    return start, end - start + 1
+
+
+def _accel_response(path, name):
+    accel = settings.MEDIA_ACCEL
+    response = HttpResponse()
+    if accel == 'nginx':
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_PREFIX + name
+    else:
+        response['X-Sendfile'] = path
+    del response['Content-Type']
+    return response
+
+
+def _file_response(request, full_path, size):
+    byte_range = None
+    if 'HTTP_RANGE' in request.META:
+        try:
+            byte_range = parse_range(request.META['HTTP_RANGE'], size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+    file = open(full_path, 'rb')
+    if byte_range is None:
+        response = FileResponse(file)
+    else:
+        start, length = byte_range
+        response = FileResponse(
+            RangeFile(file, start, length),
+            filename=os.path.basename(full_path),
+        )
+        response.status_code = 206
+        response['Content-Length'] = length
+        response['Content-Range'] = (
+            f'bytes {start}-{start + length - 1}/{size}'
+        )
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def _media_file(path):
+    """Путь и os.stat файла из MEDIA_ROOT или Http404."""
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        stat = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+    return full_path, stat
+
+
+@require_safe
+def serve_media(request, path):
+    full_path, stat = _media_file(path)
+    etag = quote_etag(f'{stat.st_size:x}-{int(stat.st_mtime):x}')
+    if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+    if getattr(settings, 'MEDIA_ACCEL', None):
+        response = _accel_response(full_path, path)
+    else:
+        response = _file_response(request, full_path, stat.st_size)
+        if response.status_code == 416:
+            return response
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = (
+        f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}'
+    )
+    return response
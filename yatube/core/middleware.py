@@ -0,0 +1,113 @@
+import logging
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import MiddlewareNotUsed
+from django.shortcuts import render
+
+from . import loader, ratelimit, template_profile
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+class AnonymousReadMiddleware:
+    """Отмечает чтение без сессионной куки как анонимное.
+
+    Такому запросу сразу назначается ``AnonymousUser``, поэтому ни
+    аутентификация, ни шаблоны не обращаются к сессии.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.anonymous_read = (
+            request.method in SAFE_METHODS
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        )
+        if request.anonymous_read:
+            request.user = AnonymousUser()
+        return self.get_response(request)
+
+
+class BatchLoaderMiddleware:
+    """Включает пакетную загрузку связанных объектов на время запроса."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'BATCH_LOADER', False):
+            raise MiddlewareNotUsed
+        loader.install()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        loader.start()
+        try:
+            return self.get_response(request)
+        finally:
+            batch = loader.stop()
+            if batch.resolved:
+                logger.debug(
+                    'Пакетная загрузка %s: %s запросов вместо %s',
+                    request.path, batch.queries,
+                    batch.queries + batch.resolved,
+                )
+
+
+class TemplateProfileMiddleware:
+    """Добавляет в ответ заголовок Server-Timing со временем шаблонов."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'TEMPLATE_PROFILING', False):
+            raise MiddlewareNotUsed
+        template_profile.install()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        template_profile.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            profile = template_profile.stop()
+        if profile.templates:
+            response['Server-Timing'] = profile.server_timing()
+            templates, tags = profile.top()
+            logger.info(
+                'Рендеринг %s: шаблоны %s; теги %s',
+                request.path,
+                ', '.join(f'{name}={spent * 1000:.2f}ms'
+                          for name, spent in templates),
+                ', '.join(f'{name}={spent * 1000:.2f}ms/{calls}'
+                          for name, spent, calls in tags),
+            )
+        return response
+
+
+class RateLimitMiddleware:
+    """Отвечает 429 на запись чаще лимитов из ``RATE_LIMITS``.
+
+    Проверяются маршруты, перечисленные в настройке, и только методы,
+    которые меняют данные (см. ``ratelimit.limited_method``).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        name = request.resolver_match.view_name
+        if (not settings.RATE_LIMIT_ENABLED
+                or name not in settings.RATE_LIMITS
+                or not ratelimit.limited_method(request, name)):
+            return None
+        retry_after = ratelimit.check(request, name)
+        if not retry_after:
+            return None
+        logger.warning('Превышен лимит %s: %s, пользователь %s',
+                       name, ratelimit.client_ip(request), request.user.pk)
+        response = render(request, 'core/429.html', status=429)
+        response['Retry-After'] = retry_after
+        return response
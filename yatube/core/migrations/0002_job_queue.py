@@ -0,0 +1,48 @@
+# Generated by Django 2.2.16 on 2026-10-19 07:59
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Попыток'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='locked_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Взята в работу'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='locked_by',
+            field=models.CharField(blank=True, max_length=100, verbose_name='Обработчик'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='max_attempts',
+            field=models.PositiveSmallIntegerField(default=3, verbose_name='Максимум попыток'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='priority',
+            field=models.SmallIntegerField(choices=[(-10, 'Низкий'), (0, 'Обычный'), (10, 'Высокий')], default=0, verbose_name='Приоритет'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='run_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Запустить не раньше'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', 'priority', 'run_at'], name='core_job_queue_idx'),
+        ),
+    ]
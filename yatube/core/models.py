@@ -1,4 +1,8 @@
+import json
+
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
 
 
 class CreatedModel(models.Model):
@@ -10,3 +14,125 @@ class CreatedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class LiveManager(models.Manager):
+    """Менеджер без мягко удалённых записей."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted__isnull=True)
+
+
+def delete_rows(queryset):
+    """Удаляет строки выборки одним DELETE и возвращает их число.
+
+    В отличие от ``QuerySet.delete()`` не собирает каскад и не
+    отправляет сигналы ``pre_delete``/``post_delete``: зависимые строки
+    вызывающий код удаляет сам, а счётчики и кэши пересчитывает после
+    пачки. Это единственное место, где вызывается закрытый
+    ``QuerySet._raw_delete``.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+class SoftDeleteModel(models.Model):
+    """Абстрактная модель с мягким удалением.
+
+    ``objects`` скрывает записи с отметкой ``deleted``, ``all_objects``
+    видит все.
+    """
+    deleted = models.DateTimeField(
+        'Дата удаления',
+        null=True,
+        blank=True,
+        db_index=True,
+    )
+
+    objects = LiveManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        abstract = True
+
+
+class Job(CreatedModel):
+    """Фоновая задача с отслеживанием прогресса."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Завершена'),
+        (FAILED, 'Ошибка'),
+    )
+    LOW = -10
+    NORMAL = 0
+    HIGH = 10
+    PRIORITY_CHOICES = (
+        (LOW, 'Низкий'),
+        (NORMAL, 'Обычный'),
+        (HIGH, 'Высокий'),
+    )
+
+    name = models.CharField('Задача', max_length=100)
+    payload = models.TextField('Параметры', default='{}')
+    status = models.CharField(
+        'Статус',
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+    )
+    priority = models.SmallIntegerField(
+        'Приоритет',
+        choices=PRIORITY_CHOICES,
+        default=NORMAL,
+    )
+    run_at = models.DateTimeField('Запустить не раньше', default=timezone.now)
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    max_attempts = models.PositiveSmallIntegerField(
+        'Максимум попыток',
+        default=3,
+    )
+    locked_by = models.CharField('Обработчик', max_length=100, blank=True)
+    locked_at = models.DateTimeField('Взята в работу', null=True, blank=True)
+    total = models.PositiveIntegerField('Всего объектов', default=0)
+    processed = models.PositiveIntegerField('Обработано', default=0)
+    error = models.TextField('Ошибка', blank=True)
+    finished = models.DateTimeField('Дата завершения', null=True, blank=True)
+
+    class Meta:
+        ordering = ('-created',)
+        indexes = (
+            models.Index(
+                fields=('status', 'priority', 'run_at'),
+                name='core_job_queue_idx',
+            ),
+        )
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
+
+    @property
+    def params(self):
+        return json.loads(self.payload)
+
+    def set_total(self, total):
+        self.total = total
+        Job.objects.filter(pk=self.pk).update(total=total)
+
+    def advance(self, count):
+        """Увеличивает счётчик обработанных объектов одним UPDATE.
+
+        Заодно обновляет ``locked_at``: долгая задача, которая сообщает
+        о прогрессе, не считается брошенной (см. ``release_stale``).
+        """
+        self.processed += count
+        self.locked_at = timezone.now()
+        Job.objects.filter(pk=self.pk).update(
+            processed=F('processed') + count,
+            locked_at=self.locked_at,
+        )
@@ -0,0 +1,122 @@
+"""Кэш целых страниц для анонимных читателей.
+
+Страница кэшируется по пути с query-строкой только для запросов без
+сессионной куки. Представление помечает ответ тегами
+(``add_surrogate_keys``), они же уходят в заголовке ``Surrogate-Key``
+для обратного прокси. ``purge_tags`` сбрасывает все страницы с тегом:
+у каждого тега есть версия, и запись с устаревшей версией считается
+промахом.
+"""
+import hashlib
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from .jobs import enqueue
+
+SURROGATE_HEADER = 'Surrogate-Key'
+CACHED_HEADERS = ('Content-Type', SURROGATE_HEADER)
+
+
+def _page_key(request):
+    path = request.get_full_path().encode()
+    return f'pagecache:{hashlib.md5(path).hexdigest()}'
+
+
+def _tag_key(tag):
+    return f'pagecache-tag:{tag}'
+
+
+def _tag_versions(tags):
+    keys = {tag: _tag_key(tag) for tag in tags}
+    found = cache.get_many(keys.values())
+    missing = [key for key in keys.values() if key not in found]
+    for key in missing:
+        cache.add(key, uuid.uuid4().hex, None)
+    if missing:
+        found.update(cache.get_many(missing))
+    return {tag: found.get(key) for tag, key in keys.items()}
+
+
+def tags_etag(*tags):
+    """ETag, который меняется при сбросе любого из тегов."""
+    versions = _tag_versions([str(tag) for tag in tags])
+    return hashlib.md5(' '.join(
+        f'{tag}:{versions[tag]}' for tag in sorted(versions)
+    ).encode()).hexdigest()
+
+
+def add_surrogate_keys(response, *tags):
+    keys = response.get(SURROGATE_HEADER, '').split()
+    keys += [str(tag) for tag in tags if tag not in keys]
+    response[SURROGATE_HEADER] = ' '.join(keys)
+    return response
+
+
+def purge_tags(*tags):
+    """Сбрасывает страницы с тегами здесь и, если задан, в прокси."""
+    tags = [str(tag) for tag in tags]
+    cache.set_many(
+        {_tag_key(tag): uuid.uuid4().hex for tag in tags}, None
+    )
+    if getattr(settings, 'PAGE_CACHE_PURGE_URL', None):
+        enqueue('purge_surrogate_keys', {'keys': tags})
+
+
+def _get_cached(request):
+    entry = cache.get(_page_key(request))
+    if entry is None:
+        return None
+    content, status, headers, versions = entry
+    current = cache.get_many([_tag_key(tag) for tag in versions])
+    for tag, version in versions.items():
+        if version is None or current.get(_tag_key(tag)) != version:
+            return None
+    response = HttpResponse(content, status=status)
+    for header, value in headers.items():
+        response[header] = value
+    return response
+
+
+def _store(request, response, timeout):
+    tags = response.get(SURROGATE_HEADER, '').split()
+    headers = {
+        header: response[header]
+        for header in CACHED_HEADERS if response.has_header(header)
+    }
+    cache.set(
+        _page_key(request),
+        (response.content, response.status_code, headers,
+         _tag_versions(tags)),
+        timeout,
+    )
+
+
+def cache_anonymous_page(timeout=None):
+    """Кэширует страницу представления для анонимного чтения."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not (getattr(settings, 'PAGE_CACHE_ENABLED', False)
+                    and getattr(request, 'anonymous_read', False)):
+                return view(request, *args, **kwargs)
+            response = _get_cached(request)
+            if response is not None:
+                response['X-Page-Cache'] = 'hit'
+            else:
+                response = view(request, *args, **kwargs)
+                if (response.status_code == 200
+                        and not response.streaming
+                        and not response.cookies):
+                    _store(request, response, timeout or getattr(
+                        settings, 'PAGE_CACHE_TIMEOUT', 300
+                    ))
+                response['X-Page-Cache'] = 'miss'
+            patch_vary_headers(response, ('Cookie',))
+            return response
+        return wrapper
+    return decorator
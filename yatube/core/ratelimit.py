@@ -0,0 +1,107 @@
+"""Ограничение частоты записи по пользователю и по IP.
+
+Лимиты задаются в ``RATE_LIMITS`` по имени маршрута::
+
+    RATE_LIMITS = {'posts:add_comment': {'user': '20/m', 'ip': '60/m'}}
+
+По умолчанию считаются только небезопасные методы. Маршрут, который
+меняет данные по GET, перечисляет методы явно: ``'methods': ('GET',)``.
+
+Счётчики живут в общем кэше и меняются только атомарным ``incr``, без
+обращения к базе. Ведро токенов приближено скользящим окном: к
+счётчику текущего окна добавляется доля предыдущего, поэтому «токены»
+возвращаются постепенно, а не все разом на границе окна.
+"""
+import math
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+SCOPES = ('user', 'ip')
+
+counters = Counter()
+
+
+def parse_rate(rate):
+    """'20/m' -> (20, 60)."""
+    limit, period = rate.split('/')
+    return int(limit), PERIODS[period]
+
+
+def client_ip(request):
+    return request.META.get(
+        getattr(settings, 'RATE_LIMIT_IP_META', 'REMOTE_ADDR'), ''
+    ).split(',')[0].strip()
+
+
+def _identity(request, scope):
+    if scope == 'user':
+        if request.user.is_authenticated:
+            return str(request.user.pk)
+        return None
+    return client_ip(request) or None
+
+
+def hit(key, limit, period, now=None):
+    """Учитывает запрос и возвращает, через сколько секунд можно снова.
+
+    Ноль — запрос разрешён.
+    """
+    now = time.time() if now is None else now
+    window = int(now // period)
+    current, previous = f'{key}:{window}', f'{key}:{window - 1}'
+    cache.add(current, 0, period * 2)
+    try:
+        count = cache.incr(current)
+    except ValueError:
+        # Ключ вытеснен из кэша между add и incr.
+        cache.set(current, 1, period * 2)
+        count = 1
+    seconds_left = (window + 1) * period - now
+    previous_count = cache.get(previous, 0)
+    estimate = previous_count * seconds_left / period + count
+    if estimate <= limit:
+        return 0
+    if count > limit or not previous_count:
+        # Ждать конца текущего окна.
+        return math.ceil(seconds_left) or 1
+    # Ждать, пока доля предыдущего окна не уменьшится до лимита.
+    return math.ceil((estimate - limit) / previous_count * period) or 1
+
+
+def limited_method(request, name):
+    """Учитывается ли метод запроса лимитом маршрута ``name``."""
+    methods = settings.RATE_LIMITS[name].get('methods')
+    if methods is None:
+        return request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+    return request.method in methods
+
+
+def check(request, name):
+    """Секунды до следующей разрешённой попытки или 0."""
+    retry_after = 0
+    limits = settings.RATE_LIMITS[name]
+    for scope in SCOPES:
+        rate = limits.get(scope)
+        if rate is None:
+            continue
+        identity = _identity(request, scope)
+        if identity is None:
+            continue
+        limit, period = parse_rate(rate)
+        retry_after = max(retry_after, hit(
+            f'ratelimit:{name}:{scope}:{identity}', limit, period
+        ))
+    counters[name, 'limited' if retry_after else 'allowed'] += 1
+    return retry_after
+
+
+def stats():
+    """Счётчики разрешённых и отклонённых запросов в этом процессе."""
+    result = {}
+    for (name, outcome), count in counters.items():
+        result.setdefault(name, {'allowed': 0, 'limited': 0})[outcome] = count
+    return result
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.http import Http404
+from django.shortcuts import render
+
+from . import loader
+
+
+def render_public(request, template_name, context=None, status=None):
+    """Рендерит публичную страницу.
+
+    Анонимное чтение (см. ``AnonymousReadMiddleware``) рендерится
+    движком ``PUBLIC_TEMPLATE_ENGINE`` без контекст-процессоров auth и
+    messages: в шаблонах ``user`` не определён и они показывают
+    вариант для гостя.
+    """
+    using = None
+    if getattr(request, 'anonymous_read', False):
+        using = settings.PUBLIC_TEMPLATE_ENGINE
+    return render(request, template_name, context, status=status, using=using)
+
+
+def cached_object_or_404(klass, **lookup):
+    """``get_object_or_404`` через кэш запроса (``core.loader``)."""
+    queryset = getattr(klass, '_default_manager', klass).all()
+    try:
+        return loader.get_object(queryset, **lookup)
+    except queryset.model.DoesNotExist:
+        raise Http404(
+            f'{queryset.model._meta.object_name} не найден.'
+        )
@@ -0,0 +1,93 @@
+"""Замер холодного старта процесса.
+
+Каждый замер идёт в отдельном интерпретаторе: ``-X importtime``
+показывает, сколько стоит импорт каждого пакета, а загрузка
+``yatube.wsgi`` с первым запросом — сколько проходит от запуска
+процесса до первого ответа.
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)$')
+
+BOOT_SCRIPT = '''
+import json
+import sys
+import time
+from wsgiref.util import setup_testing_defaults
+
+start = time.perf_counter()
+from yatube.wsgi import application
+booted = time.perf_counter()
+environ = {'PATH_INFO': sys.argv[1]}
+setup_testing_defaults(environ)
+statuses = []
+result = application(
+    environ, lambda status, headers, exc_info=None: statuses.append(status)
+)
+b''.join(result)
+if hasattr(result, 'close'):
+    result.close()
+print(json.dumps({
+    'boot': booted - start,
+    'request': time.perf_counter() - booted,
+    'finished': time.time(),
+    'status': statuses[0],
+}))
+'''
+
+
+def _run(args):
+    environ = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+    result = subprocess.run(
+        [sys.executable, *args],
+        cwd=settings.BASE_DIR,
+        env=environ,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return result
+
+
+def summarize_importtime(lines):
+    """Суммирует собственное время импорта по пакетам верхнего уровня.
+
+    Возвращает список (пакет, микросекунды) по убыванию времени.
+    """
+    totals = defaultdict(int)
+    for line in lines:
+        match = IMPORTTIME_RE.match(line.rstrip())
+        if match is None:
+            continue
+        own, _, module = match.groups()
+        totals[module.split('.')[0]] += int(own)
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def import_report(path='/'):
+    """Время импорта по пакетам при загрузке WSGI-приложения."""
+    result = _run(['-X', 'importtime', '-c', BOOT_SCRIPT, path])
+    return summarize_importtime(result.stderr.splitlines())
+
+
+def measure_first_request(path='/'):
+    """Секунды от запуска интерпретатора до первого ответа.
+
+    Возвращает словарь с ключами boot (загрузка Django и прогрев),
+    request (сам запрос), total и status.
+    """
+    started = time.time()
+    result = _run(['-c', BOOT_SCRIPT, path])
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['total'] = report.pop('finished') - started
+    return report
@@ -0,0 +1,112 @@
+"""Раздача собранной статики прямо из WSGI-приложения.
+
+Файлы из ``STATIC_ROOT`` сканируются один раз при старте, заголовки
+считаются заранее. Клиенту отдаётся заранее сжатая копия (.br или .gz)
+по ``Accept-Encoding``; файлы с хэшем в имени кэшируются навсегда.
+"""
+import json
+import mimetypes
+import os
+from email.utils import formatdate
+from wsgiref.util import FileWrapper
+
+from django.conf import settings
+
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+BLOCK_SIZE = 64 * 1024
+
+
+class StaticFile:
+    def __init__(self, path, immutable, max_age):
+        stat = os.stat(path)
+        content_type, _ = mimetypes.guess_type(path)
+        self.etag = f'"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+        self.common_headers = [
+            ('Cache-Control', IMMUTABLE_CACHE if immutable
+             else f'public, max-age={max_age}'),
+            ('Last-Modified', formatdate(stat.st_mtime, usegmt=True)),
+        ]
+        self.variants = {}
+        for encoding, suffix in ENCODINGS:
+            if os.path.exists(path + suffix):
+                self.variants[encoding] = self._variant(
+                    path + suffix, content_type, encoding
+                )
+        self.variants[None] = self._variant(path, content_type, None)
+        if len(self.variants) > 1:
+            self.common_headers.append(('Vary', 'Accept-Encoding'))
+
+    def _variant(self, path, content_type, encoding):
+        etag = self.etag
+        headers = [
+            ('Content-Type', content_type or 'application/octet-stream'),
+            ('Content-Length', str(os.path.getsize(path))),
+        ]
+        if encoding:
+            etag = f'{etag[:-1]}-{encoding}"'
+            headers.append(('Content-Encoding', encoding))
+        return path, etag, headers
+
+    def choose(self, accept_encoding):
+        accepted = {
+            token.split(';')[0].strip()
+            for token in accept_encoding.split(',')
+            if not token.replace(' ', '').endswith(';q=0')
+        }
+        for encoding, _ in ENCODINGS:
+            if encoding in accepted and encoding in self.variants:
+                return self.variants[encoding]
+        return self.variants[None]
+
+
+class StaticFilesApp:
+    """WSGI-обёртка: статику отдаёт сама, остальное — приложению."""
+
+    def __init__(self, application, root=None, prefix=None, max_age=60):
+        self.application = application
+        self.root = root or settings.STATIC_ROOT
+        self.prefix = prefix or settings.STATIC_URL
+        self.max_age = max_age
+        self.files = self.scan()
+
+    def _immutable_names(self):
+        manifest = os.path.join(self.root, 'staticfiles.json')
+        if not os.path.exists(manifest):
+            return set()
+        with open(manifest) as source:
+            return set(json.load(source).get('paths', {}).values())
+
+    def scan(self):
+        files = {}
+        if not self.root or not os.path.isdir(self.root):
+            return files
+        immutable = self._immutable_names()
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                if path.endswith(('.br', '.gz')) and os.path.exists(path[:-3]):
+                    continue
+                name = os.path.relpath(path, self.root).replace(os.sep, '/')
+                files[self.prefix + name] = StaticFile(
+                    path, name in immutable, self.max_age
+                )
+        return files
+
+    def __call__(self, environ, start_response):
+        static = self.files.get(environ.get('PATH_INFO', ''))
+        method = environ.get('REQUEST_METHOD')
+        if static is None or method not in ('GET', 'HEAD'):
+            return self.application(environ, start_response)
+        path, etag, headers = static.choose(
+            environ.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        common = static.common_headers + [('ETag', etag)]
+        if etag in environ.get('HTTP_IF_NONE_MATCH', ''):
+            start_response('304 Not Modified', common)
+            return []
+        start_response('200 OK', headers + common)
+        if method == 'HEAD':
+            return []
+        file_wrapper = environ.get('wsgi.file_wrapper', FileWrapper)
+        return file_wrapper(open(path, 'rb'), BLOCK_SIZE)
@@ -0,0 +1,91 @@
+import gzip
+import hashlib
+import os
+import posixpath
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.ico', '.txt', '.html', '.json', '.xml',
+)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Статика с хэшем в имени и заранее сжатыми копиями .gz и .br.
+
+    Сжатые копии пишутся рядом с файлом при ``collectstatic``; ``.br``
+    создаются, только если установлен пакет Brotli.
+    """
+    manifest_strict = False
+
+    def post_process(self, paths, dry_run=False, **options):
+        processed = {}
+        for name, hashed_name, result in super().post_process(
+                paths, dry_run, **options):
+            if hashed_name and not isinstance(result, Exception):
+                processed[name] = hashed_name
+            yield name, hashed_name, result
+        if dry_run:
+            return
+        for hashed_name in processed.values():
+            if hashed_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.compress(hashed_name)
+
+    def compress(self, name):
+        path = self.path(name)
+        with open(path, 'rb') as source:
+            content = source.read()
+        variants = [('.gz', gzip.compress(content, compresslevel=9))]
+        # Brotli нужен только при collectstatic, а модуль импортируется
+        # при загрузке моделей.
+        try:
+            import brotli
+        except ImportError:
+            pass
+        else:
+            variants.append(('.br', brotli.compress(content)))
+        for suffix, compressed in variants:
+            if len(compressed) >= len(content):
+                continue
+            with open(path + suffix, 'wb') as target:
+                target.write(compressed)
+            os.utime(path + suffix, (os.path.getatime(path),
+                                     os.path.getmtime(path)))
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранит загрузки под именем из хэша содержимого.
+
+    Одинаковые файлы получают одно имя и хранятся один раз, поэтому и
+    миниатюры для них строятся один раз. Каталог из ``upload_to``
+    сохраняется: ``posts/<2 символа хэша>/<sha256>.<расширение>``.
+    Файл не удаляется, пока на него ссылаются модели — за этим следит
+    приложение, которому принадлежат ссылки.
+    """
+
+    def hashed_name(self, name, content):
+        sha256 = hashlib.sha256()
+        for chunk in content.chunks():
+            sha256.update(chunk)
+        content.seek(0)
+        digest = sha256.hexdigest()
+        directory, filename = posixpath.split(name.replace('\\', '/'))
+        extension = os.path.splitext(filename)[1].lower()
+        return posixpath.join(directory, digest[:2], digest + extension)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.hashed_name(name, content)
+        if self.exists(name):
+            # Свежая дата изменения защищает файл от сборщика сирот
+            # (min_age), пока новая ссылка на него не сохранена.
+            os.utime(self.path(name))
+            return name
+        return self._save(name, content)
@@ -0,0 +1,45 @@
+import urllib.request
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.backends.db import \
+    SessionStore as DatabaseSessionStore
+from django.utils import timezone
+
+from .jobs import task
+
+
+@task
+def purge_surrogate_keys(job, keys):
+    """Просит обратный прокси сбросить страницы с тегами ``keys``."""
+    job.set_total(len(keys))
+    request = urllib.request.Request(
+        settings.PAGE_CACHE_PURGE_URL,
+        method='PURGE',
+        headers={'Surrogate-Key': ' '.join(keys)},
+    )
+    with urllib.request.urlopen(request, timeout=5):
+        pass
+    job.advance(len(keys))
+
+
+@task
+def clear_expired_sessions(job, batch_size=1000):
+    """Удаляет истёкшие сессии пачками вместо одного большого DELETE.
+
+    Для хранилищ без таблицы сессий (cache, signed_cookies) делать
+    нечего: срок жизни там соблюдает сам кэш или подпись cookie.
+    """
+    engine = import_module(settings.SESSION_ENGINE)
+    if not issubclass(engine.SessionStore, DatabaseSessionStore):
+        return
+    sessions = engine.SessionStore.get_model_class().objects.filter(
+        expire_date__lt=timezone.now()
+    )
+    job.set_total(sessions.count())
+    while True:
+        chunk = list(sessions.values_list('pk', flat=True)[:batch_size])
+        if not chunk:
+            break
+        sessions.model.objects.filter(pk__in=chunk).delete()
+        job.advance(len(chunk))
@@ -0,0 +1,101 @@
+"""Профилирование рендеринга шаблонов.
+
+После ``install()`` время рендеринга каждого шаблона (включая
+``{% include %}``) и каждого тега накапливается в профиле текущего
+запроса. Профиль включает ``TemplateProfileMiddleware``.
+"""
+import threading
+from collections import defaultdict
+from time import perf_counter
+
+from django.template.base import Node, Template, TextNode
+
+_local = threading.local()
+_originals = {}
+
+
+class RenderProfile:
+    """Время шаблонов (с вложенными) и тегов (без вложенных), в секундах."""
+
+    def __init__(self):
+        self.templates = defaultdict(float)
+        self.tags = defaultdict(float)
+        self.calls = defaultdict(int)
+        self._stack = []
+
+    def top(self, limit=10):
+        templates = sorted(
+            self.templates.items(), key=lambda item: -item[1]
+        )[:limit]
+        tags = sorted(self.tags.items(), key=lambda item: -item[1])[:limit]
+        return templates, [
+            (f'{name} {tag}', spent, self.calls[(name, tag)])
+            for (name, tag), spent in tags
+        ]
+
+    def server_timing(self, limit=5):
+        templates, tags = self.top(limit)
+        metrics = [
+            f'tpl{num};dur={spent * 1000:.2f};desc="{name}"'
+            for num, (name, spent) in enumerate(templates)
+        ]
+        metrics += [
+            f'tag{num};dur={spent * 1000:.2f};desc="{name} x{calls}"'
+            for num, (name, spent, calls) in enumerate(tags)
+        ]
+        return ', '.join(metrics)
+
+
+def _template_name(obj):
+    origin = getattr(obj, 'origin', None)
+    return getattr(origin, 'template_name', None) or '<string>'
+
+
+def _profiled_template_render(self, context):
+    profile = getattr(_local, 'profile', None)
+    if profile is None:
+        return _originals['template'](self, context)
+    start = perf_counter()
+    try:
+        return _originals['template'](self, context)
+    finally:
+        profile.templates[_template_name(self)] += perf_counter() - start
+
+
+def _profiled_node_render(self, context):
+    profile = getattr(_local, 'profile', None)
+    if profile is None or isinstance(self, TextNode):
+        return _originals['node'](self, context)
+    profile._stack.append(0.0)
+    start = perf_counter()
+    try:
+        return _originals['node'](self, context)
+    finally:
+        elapsed = perf_counter() - start
+        nested = profile._stack.pop()
+        if profile._stack:
+            profile._stack[-1] += elapsed
+        key = (_template_name(self), type(self).__name__)
+        profile.tags[key] += elapsed - nested
+        profile.calls[key] += 1
+
+
+def install():
+    """Подменяет методы рендеринга; повторный вызов ничего не делает."""
+    if _originals:
+        return
+    _originals['template'] = Template._render
+    _originals['node'] = Node.render_annotated
+    Template._render = _profiled_template_render
+    Node.render_annotated = _profiled_node_render
+
+
+def start():
+    _local.profile = RenderProfile()
+    return _local.profile
+
+
+def stop():
+    profile = getattr(_local, 'profile', None)
+    _local.profile = None
+    return profile
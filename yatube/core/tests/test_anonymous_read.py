@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+User = get_user_model()
+
+
+class AnonymousReadTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(AnonymousReadTest.user)
+
+    def test_guest_page_skips_auth_and_messages(self):
+        """Гостю страница рендерится без контекста auth и messages."""
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertTrue(response.wsgi_request.anonymous_read)
+        self.assertNotIn('messages', response.context)
+        self.assertNotIn('perms', response.context)
+        self.assertContains(response, reverse('users:login'))
+
+    def test_guest_page_does_not_touch_session(self):
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertFalse(response.wsgi_request.session.accessed)
+
+    def test_authorized_page_uses_full_context(self):
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertFalse(response.wsgi_request.anonymous_read)
+        self.assertIn('messages', response.context)
+        self.assertEqual(response.context['user'], AnonymousReadTest.user)
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, Future
+
+from django.core.handlers.wsgi import WSGIRequest
+from django.core.wsgi import get_wsgi_application
+from django.test import SimpleTestCase
+from django.urls import resolve
+
+from ..asgi import WsgiToAsgi
+
+
+def echo_application(environ, start_response):
+    start_response('201 Created', [('Content-Type', 'text/plain')])
+    body = environ['wsgi.input'].read()
+    return iter([environ['PATH_INFO'].encode('latin1'), b'?',
+                 environ['QUERY_STRING'].encode(), b':', body])
+
+
+def resolve_application(environ, start_response):
+    start_response('200 OK', [])
+    match = resolve(WSGIRequest(environ).path_info)
+    return [match.kwargs['username'].encode()]
+
+
+class ThreadRecordingResponse:
+    """Потоковый ответ, который запоминает потоки чтения и закрытия."""
+    streaming = True
+
+    def __init__(self):
+        self.threads = []
+
+    def __iter__(self):
+        for number in range(5):
+            self.threads.append(threading.get_ident())
+            yield str(number).encode()
+
+    def close(self):
+        self.threads.append(threading.get_ident())
+
+
+class ThreadPerCallExecutor(Executor):
+    """Исполнитель, который запускает каждый вызов в новом потоке."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as error:
+                future.set_exception(error)
+
+        threading.Thread(target=run).start()
+        return future
+
+
+class WsgiToAsgiTest(SimpleTestCase):
+    def request(self, application, path, body=b'', query_string=b'',
+                executor=None, **extra):
+        adapter = WsgiToAsgi(application, max_workers=2)
+        if executor is not None:
+            adapter.executor.shutdown()
+            adapter.executor = executor
+        messages = [
+            {'type': 'http.request', 'body': body[:3], 'more_body': True},
+            {'type': 'http.request', 'body': body[3:]},
+        ]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            'type': 'http',
+            'method': 'POST' if body else 'GET',
+            'path': path,
+            'query_string': query_string,
+            'headers': [(b'host', b'testserver')],
+            **extra,
+        }
+        asyncio.run(adapter(scope, receive, send))
+        adapter.executor.shutdown()
+        return sent[0], b''.join(
+            message['body'] for message in sent[1:]
+        )
+
+    def test_streams_request_and_response_bodies(self):
+        start, body = self.request(
+            echo_application, '/echo/', b'hello world', b'a=1'
+        )
+        self.assertEqual(start['status'], 201)
+        self.assertIn((b'content-type', b'text/plain'), start['headers'])
+        self.assertEqual(body, b'/echo/?a=1:hello world')
+
+    def test_decodes_escaped_path(self):
+        """PATH_INFO строится из раскодированного пути без root_path."""
+        start, body = self.request(
+            echo_application, '/app/profile/иван/',
+            raw_path=b'/app/profile/%D0%B8%D0%B2%D0%B0%D0%BD/',
+            root_path='/app',
+        )
+        self.assertEqual(body, '/profile/иван/?:'.encode())
+        start, body = self.request(
+            resolve_application, '/profile/иван/',
+            raw_path=b'/profile/%D0%B8%D0%B2%D0%B0%D0%BD/',
+        )
+        self.assertEqual(body.decode(), 'иван')
+
+    def test_runs_django_application(self):
+        start, body = self.request(
+            get_wsgi_application(), '/about/author/'
+        )
+        self.assertEqual(start['status'], 200)
+        self.assertIn('Об авторе'.encode(), body)
+
+    def test_streaming_response_uses_one_thread(self):
+        """Потоковый ответ читается и закрывается в потоке запроса."""
+        result = ThreadRecordingResponse()
+
+        def application(environ, start_response):
+            start_response('200 OK', [])
+            result.threads.append(threading.get_ident())
+            return result
+
+        start, body = self.request(
+            application, '/stream/', executor=ThreadPerCallExecutor()
+        )
+        self.assertEqual(body, b'01234')
+        self.assertEqual(len(result.threads), 7)
+        self.assertEqual(len(set(result.threads)), 1)
@@ -0,0 +1,68 @@
+from unittest import mock
+
+from django.conf import settings
+from django.core.checks import run_checks
+from django.test import SimpleTestCase, override_settings
+
+TEMPLATES = settings.TEMPLATES
+CACHED_TEMPLATES = [
+    dict(engine, OPTIONS=dict(engine['OPTIONS'], loaders=[
+        ('django.template.loaders.cached.Loader',
+         engine['OPTIONS']['loaders']),
+    ]))
+    for engine in settings.TEMPLATES
+]
+
+
+def performance_warnings():
+    return {
+        message.id
+        for message in run_checks(
+            tags=['performance'], include_deployment_checks=True
+        )
+    }
+
+
+@override_settings(
+    DEBUG=False,
+    TEMPLATES=CACHED_TEMPLATES,
+    CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': '127.0.0.1:11211',
+    }},
+    MIDDLEWARE=['django.middleware.gzip.GZipMiddleware'],
+    JOBS_MODE='worker',
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+)
+class PerformanceChecksTest(SimpleTestCase):
+    def test_tuned_settings_pass(self):
+        """Настроенный боевой профиль не вызывает предупреждений."""
+        self.assertEqual(performance_warnings(), set())
+
+    def test_hostile_settings_warn(self):
+        """Каждая вредная настройка даёт своё предупреждение."""
+        cases = {
+            'core.W001': {'DEBUG': True},
+            'core.W002': {'INSTALLED_APPS': settings.INSTALLED_APPS
+                          + ['debug_toolbar']},
+            'core.W003': {'TEMPLATES': TEMPLATES},
+            'core.W005': {'CACHES': {'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            }}},
+            'core.W006': {'MIDDLEWARE': []},
+            'core.W007': {'JOBS_MODE': 'thread'},
+            'core.W008': {
+                'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+            },
+        }
+        for check_id, overrides in cases.items():
+            with self.subTest(check_id=check_id):
+                with override_settings(**overrides):
+                    self.assertIn(check_id, performance_warnings())
+
+    def test_connections_not_persistent(self):
+        """Без CONN_MAX_AGE соединение с сервером БД не переиспользуется."""
+        with mock.patch.dict(settings.DATABASES['default'],
+                             ENGINE='django.db.backends.postgresql',
+                             CONN_MAX_AGE=0):
+            self.assertIn('core.W004', performance_warnings())
@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.db.utils import load_backend
+from django.test import SimpleTestCase
+
+from ..db.pool import ConnectionPool, PoolTimeout, get_pool
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def healthy(raw):
+    pass
+
+
+def broken(raw):
+    raise OSError('соединение разорвано')
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    def test_connection_reused(self):
+        """Возвращённое соединение выдаётся повторно без открытия."""
+        pool = ConnectionPool()
+        raw = pool.acquire(FakeConnection, healthy)
+        pool.release(raw)
+        self.assertIs(pool.acquire(FakeConnection, healthy), raw)
+        stats = pool.stats()
+        self.assertEqual((stats['created'], stats['reused']), (1, 1))
+        self.assertEqual(stats['in_use'], 1)
+
+    def test_failed_health_check(self):
+        """Соединение, не прошедшее проверку, закрывается и заменяется."""
+        pool = ConnectionPool()
+        raw = pool.acquire(FakeConnection, healthy)
+        pool.release(raw)
+        fresh = pool.acquire(FakeConnection, broken)
+        self.assertIsNot(fresh, raw)
+        self.assertTrue(raw.closed)
+        self.assertEqual(pool.stats()['discarded'], 1)
+        self.assertEqual(pool.stats()['size'], 1)
+
+    def test_expired_connection_closed(self):
+        """Простоявшее дольше MAX_IDLE соединение не выдаётся."""
+        pool = ConnectionPool(max_idle=-1)
+        raw = pool.acquire(FakeConnection, healthy)
+        pool.release(raw)
+        self.assertIsNot(pool.acquire(FakeConnection, healthy), raw)
+        self.assertTrue(raw.closed)
+
+    def test_max_size(self):
+        """Сверх MAX_SIZE соединения не открываются."""
+        pool = ConnectionPool(max_size=1, timeout=0)
+        pool.acquire(FakeConnection, healthy)
+        with self.assertRaises(PoolTimeout):
+            pool.acquire(FakeConnection, healthy)
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+
+class PooledBackendTest(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        backend = load_backend('core.db.backends.sqlite3')
+        self.connection = backend.DatabaseWrapper({
+            'ENGINE': 'core.db.backends.sqlite3',
+            'NAME': os.path.join(self.directory, 'pool.sqlite3'),
+            'CONN_MAX_AGE': 0,
+            'AUTOCOMMIT': True,
+            'ATOMIC_REQUESTS': False,
+            'OPTIONS': {},
+            'TIME_ZONE': None,
+            'USER': '', 'PASSWORD': '', 'HOST': '', 'PORT': '',
+            'POOL': {'MAX_SIZE': 2},
+        }, alias='pool-test')
+
+    def tearDown(self):
+        get_pool('pool-test').close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_close_returns_connection_to_pool(self):
+        """close() возвращает соединение в пул, а connect() берёт его."""
+        with self.connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        raw = self.connection.connection
+        self.connection.close()
+        self.assertEqual(get_pool('pool-test').stats()['idle'], 1)
+        self.connection.connect()
+        self.assertIs(self.connection.connection, raw)
+        self.assertEqual(get_pool('pool-test').stats()['max_size'], 2)
+        self.connection.close()
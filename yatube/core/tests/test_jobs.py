@@ -0,0 +1,160 @@
+import threading
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.exceptions import ImproperlyConfigured
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Post
+
+from ..jobs import (background, claim, create_job, enqueue, execute,
+                    release_stale, schedule_periodic, task, work)
+from ..models import Job
+
+User = get_user_model()
+CALLS = []
+
+
+@task
+def record_call(job, value):
+    CALLS.append(value)
+
+
+@task
+def always_fails(job):
+    raise RuntimeError('сбой')
+
+
+@background
+def add_numbers(first, second):
+    CALLS.append(first + second)
+    return first + second
+
+
+class JobQueueTest(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_claim_by_priority(self):
+        """Сначала берётся задача с высоким приоритетом."""
+        create_job('record_call', {'value': 'обычная'})
+        urgent = create_job(
+            'record_call', {'value': 'срочная'}, priority=Job.HIGH
+        )
+        job = claim('test')
+        self.assertEqual(job.pk, urgent.pk)
+        self.assertEqual(job.status, Job.RUNNING)
+        self.assertEqual(job.attempts, 1)
+
+    def test_claim_skips_delayed_and_taken(self):
+        """Отложенная и уже взятая задачи не выдаются повторно."""
+        create_job('record_call', {'value': 'позже'}, delay=60)
+        job = create_job('record_call', {'value': 'сейчас'})
+        self.assertEqual(claim('first').pk, job.pk)
+        self.assertIsNone(claim('second'))
+
+    def test_retry_with_backoff(self):
+        """Упавшая задача повторяется с задержкой, затем — ошибка."""
+        create_job('always_fails', max_attempts=2)
+        job = execute(claim('test'))
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn('сбой', job.error)
+        Job.objects.update(run_at=timezone.now())
+        job = execute(claim('test'))
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_release_stale(self):
+        """Брошенная обработчиком задача возвращается в очередь."""
+        create_job('record_call', {'value': 'x'})
+        job = claim('dead')
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(release_stale(60), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.PENDING)
+
+    def test_advance_keeps_job_alive(self):
+        """Задача, сообщающая о прогрессе, не считается брошенной."""
+        create_job('record_call', {'value': 'x'})
+        job = claim('busy')
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(hours=1)
+        )
+        job.advance(1)
+        self.assertEqual(release_stale(60), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.RUNNING)
+
+    def test_params_named_like_options(self):
+        """Параметры задачи не смешиваются с настройками очереди."""
+        job = create_job('record_call', {'value': 'x', 'priority': 1},
+                         priority=Job.HIGH)
+        self.assertEqual(job.params, {'value': 'x', 'priority': 1})
+        self.assertEqual(job.priority, Job.HIGH)
+
+    def test_duplicate_task_name(self):
+        def record_call(job):
+            pass
+        with self.assertRaises(ImproperlyConfigured):
+            task(record_call)
+
+    def test_schedule_periodic_once(self):
+        """Периодическая задача не ставится повторно до конца интервала."""
+        schedule = {'record_call': {'interval': 60, 'params': {'value': 1}}}
+        self.assertEqual(len(schedule_periodic(schedule)), 1)
+        self.assertEqual(schedule_periodic(schedule), [])
+
+    def test_work_burst(self):
+        """Обработчик выполняет всю очередь и выходит."""
+        for value in range(3):
+            create_job('record_call', {'value': value})
+        done = work('test', threading.Event(), burst=True)
+        self.assertEqual(done, 3)
+        self.assertEqual(sorted(CALLS), [0, 1, 2])
+        self.assertFalse(Job.objects.exclude(status=Job.DONE).exists())
+
+    @override_settings(JOBS_MODE='worker')
+    def test_worker_mode_only_stores(self):
+        """В режиме worker задача остаётся в очереди."""
+        job = enqueue('record_call', {'value': 'x'})
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertEqual(CALLS, [])
+
+    @override_settings(JOBS_MODE='sync')
+    def test_background_decorator(self):
+        """Функция с @background вызывается напрямую и через delay."""
+        self.assertEqual(add_numbers(1, 2), 3)
+        job = add_numbers.delay(first=2, second=3)
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual(CALLS, [3, 5])
+
+
+@override_settings(JOBS_MODE='sync')
+class BackgroundViewsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(
+            username='author', email='author@test.ru'
+        )
+        cls.reader = User.objects.create_user(username='reader')
+        cls.post = Post.objects.create(text='Пост', author=cls.author)
+
+    def test_comment_notifies_author(self):
+        """Комментарий отправляет письмо автору поста через очередь."""
+        client = Client()
+        client.force_login(BackgroundViewsTest.reader)
+        client.post(
+            reverse('posts:add_comment', args=(BackgroundViewsTest.post.pk,)),
+            {'text': 'Отличный пост'},
+        )
+        job = Job.objects.get(name='notify_post_author')
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['author@test.ru'])
@@ -0,0 +1,166 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Comment, Group, Post
+
+from .. import loader
+
+User = get_user_model()
+
+
+class BatchLoaderTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        loader.install()
+        cls.authors = [
+            User.objects.create_user(username=f'author{num}')
+            for num in range(3)
+        ]
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        for num in range(6):
+            post = Post.objects.create(
+                text=f'Пост {num}', author=cls.authors[num % 3],
+                group=cls.group if num % 2 else None,
+            )
+            Comment.objects.create(
+                text='Комментарий', post=post, author=cls.authors[0]
+            )
+
+    def setUp(self):
+        loader.start()
+
+    def tearDown(self):
+        loader.stop()
+
+    def test_one_query_per_model(self):
+        """Авторы и группы всех постов грузятся двумя запросами."""
+        posts = list(Post.objects.all())
+        with self.assertNumQueries(2):
+            authors = {post.author.username for post in posts}
+            groups = {post.group for post in posts}
+        self.assertEqual(authors, {'author0', 'author1', 'author2'})
+        self.assertEqual(groups, {BatchLoaderTest.group, None})
+
+    def test_identity_map(self):
+        """Уже прочитанный пользователь не читается снова."""
+        posts = list(Post.objects.filter(author=BatchLoaderTest.authors[0]))
+        author = posts[0].author
+        comments = list(Comment.objects.all())
+        with self.assertNumQueries(0):
+            self.assertTrue(all(
+                comment.author is author for comment in comments
+            ))
+
+    def test_nested_relations(self):
+        """Цепочка comment.post.author тоже идёт пачками."""
+        comments = list(Comment.objects.all())
+        with self.assertNumQueries(2):
+            authors = {comment.post.author for comment in comments}
+        self.assertEqual(len(authors), 3)
+
+    def test_missing_object(self):
+        post = Post.objects.first()
+        post.group_id = 10 ** 6
+        with self.assertRaises(Group.DoesNotExist):
+            post.group
+
+    def test_disabled_outside_request(self):
+        loader.stop()
+        posts = list(Post.objects.all())
+        with self.assertNumQueries(len(posts)):
+            [post.author for post in posts]
+
+    def test_index_page(self):
+        """Главная читает авторов одним запросом при любом числе постов."""
+        loader.stop()
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = Client().get(reverse('posts:index'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len([
+            query for query in queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "auth_user"' in query['sql']
+        ]), 1)
+
+
+class RequestCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        Post.objects.create(text='Пост', author=cls.author)
+
+    def setUp(self):
+        loader.install()
+        loader.start()
+
+    def tearDown(self):
+        loader.stop()
+
+    def test_get_object_once(self):
+        """Повторный поиск в запросе не обращается к базе."""
+        author = loader.get_object(User, username='author')
+        with self.assertNumQueries(0):
+            self.assertIs(loader.get_object(User, username='author'), author)
+            self.assertIs(loader.get_object(User, pk=author.pk), author)
+
+    def test_get_object_respects_filters(self):
+        """Условия выборки проверяются и для прочитанных объектов."""
+        post = Post.all_objects.get(author=RequestCacheTest.author)
+        with self.assertRaises(Post.DoesNotExist):
+            loader.get_object(
+                Post.all_objects.filter(author=RequestCacheTest.reader),
+                pk=post.pk,
+            )
+        Post.all_objects.filter(pk=post.pk).update(deleted=timezone.now())
+        with self.assertRaises(Post.DoesNotExist):
+            loader.get_object(Post, pk=post.pk)
+
+    def test_missing_object_remembered(self):
+        with self.assertRaises(User.DoesNotExist):
+            loader.get_object(User, username='nobody')
+        with self.assertNumQueries(0):
+            with self.assertRaises(User.DoesNotExist):
+                loader.get_object(User, username='nobody')
+
+    def test_memoize(self):
+        calls = []
+        for _ in range(2):
+            loader.memoize('key', lambda: calls.append(1) or len(calls))
+        self.assertEqual(calls, [1])
+
+    def test_profile_reuses_request_user(self):
+        """Свой профиль не перечитывает пользователя из сессии."""
+        loader.stop()
+        client = Client()
+        client.force_login(RequestCacheTest.author)
+        url = reverse('posts:profile', args=('author',))
+        cache.clear()
+        client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            client.get(url)
+        self.assertEqual(len([
+            query for query in queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "auth_user"' in query['sql']
+        ]), 1)
+
+    def test_report(self):
+        out = StringIO()
+        call_command('query_report', username='reader', stdout=out)
+        self.assertIn(reverse('posts:profile', args=('author',)),
+                      out.getvalue())
+        self.assertIn('повторов 0', out.getvalue())
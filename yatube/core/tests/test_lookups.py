@@ -0,0 +1,85 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.cache import author_lookup, group_lookup
+from posts.models import Group
+
+User = get_user_model()
+
+
+class LookupCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='author', first_name='Лев', last_name='Толстой',
+            password='secret',
+        )
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_hit_without_queries(self):
+        group_lookup.get('group')
+        with self.assertNumQueries(0):
+            self.assertEqual(group_lookup.get('group'), LookupCacheTest.group)
+            self.assertEqual(
+                group_lookup.get('group').title, 'Группа'
+            )
+
+    def test_user_basic_profile_only(self):
+        """Пароль и прочие поля пользователя в кэш не попадают."""
+        author_lookup.get('author')
+        with self.assertNumQueries(0):
+            author = author_lookup.get('author')
+            self.assertEqual(author.get_full_name(), 'Лев Толстой')
+        self.assertIn('password', author.get_deferred_fields())
+
+    def test_missing_cached(self):
+        """Ответ 404 на несуществующий профиль кэшируется."""
+        url = reverse('posts:profile', args=('ghost',))
+        self.assertEqual(Client().get(url).status_code, 404)
+        with self.assertNumQueries(0):
+            self.assertEqual(Client().get(url).status_code, 404)
+
+    def test_created_object_clears_missing(self):
+        with self.assertRaises(User.DoesNotExist):
+            author_lookup.get('newcomer')
+        User.objects.create_user(username='newcomer')
+        self.assertEqual(author_lookup.get('newcomer').username, 'newcomer')
+
+    def test_rename_invalidates_both_values(self):
+        group_lookup.get('group')
+        with self.assertRaises(Group.DoesNotExist):
+            group_lookup.get('renamed')
+        group = Group.objects.get(slug='group')
+        group.slug = 'renamed'
+        group.save()
+        self.assertEqual(group_lookup.get('renamed').pk, group.pk)
+        with self.assertRaises(Group.DoesNotExist):
+            group_lookup.get('group')
+
+    def test_edit_updates_cached_profile(self):
+        author_lookup.get('author')
+        user = User.objects.get(username='author')
+        user.first_name = 'Алексей'
+        user.save()
+        self.assertEqual(author_lookup.get('author').first_name, 'Алексей')
+
+    def test_login_keeps_cache(self):
+        """Обновление last_login не сбрасывает кэш профиля."""
+        author_lookup.get('author')
+        Client().login(username='author', password='secret')
+        with self.assertNumQueries(0):
+            author_lookup.get('author')
+
+    def test_delete_invalidates(self):
+        group_lookup.get('group')
+        Group.objects.filter(slug='group').delete()
+        with self.assertRaises(Group.DoesNotExist):
+            group_lookup.get('group')
@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Comment, Post
+
+from .. import ratelimit
+
+User = get_user_model()
+
+
+class SlidingWindowTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_limit_within_window(self):
+        """Сверх лимита в окне запрос отклоняется до конца окна."""
+        now = 600.0
+        self.assertEqual(ratelimit.hit('key', 2, 60, now), 0)
+        self.assertEqual(ratelimit.hit('key', 2, 60, now + 1), 0)
+        self.assertEqual(ratelimit.hit('key', 2, 60, now + 2), 58)
+
+    def test_previous_window_decays(self):
+        """Запросы прошлого окна учитываются с убывающим весом."""
+        for key in ('early', 'late'):
+            for _ in range(2):
+                ratelimit.hit(key, 2, 60, 600.0)
+        self.assertGreater(ratelimit.hit('early', 2, 60, 661.0), 0)
+        self.assertEqual(ratelimit.hit('late', 2, 60, 690.0), 0)
+
+
+@override_settings(RATE_LIMIT_ENABLED=True, RATE_LIMITS={
+    'posts:add_comment': {'user': '2/m', 'ip': '100/m'},
+    'users:signup': {'ip': '1/h'},
+    'posts:profile_follow': {'user': '2/m', 'methods': ('GET', 'POST')},
+})
+class RateLimitMiddlewareTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.post = Post.objects.create(text='Пост', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        ratelimit.counters.clear()
+        self.client = Client()
+        self.client.force_login(RateLimitMiddlewareTest.user)
+
+    def test_comment_limited_per_user(self):
+        """Третий комментарий за минуту получает 429."""
+        url = reverse('posts:add_comment',
+                      args=(RateLimitMiddlewareTest.post.pk,))
+        for _ in range(2):
+            response = self.client.post(url, {'text': 'Спам'})
+            self.assertEqual(response.status_code, 302)
+        response = self.client.post(url, {'text': 'Спам'})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(Comment.objects.count(), 2)
+        self.assertEqual(
+            ratelimit.stats()['posts:add_comment'],
+            {'allowed': 2, 'limited': 1},
+        )
+
+    def test_follow_link_limited(self):
+        """Подписка по GET-ссылке тоже ограничена."""
+        author = User.objects.create_user(username='author')
+        url = reverse('posts:profile_follow', args=(author.username,))
+        for _ in range(2):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 302)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+    def test_reads_not_limited(self):
+        """GET-запросы к ограниченным маршрутам не считаются."""
+        for _ in range(3):
+            response = Client().get(reverse('users:signup'))
+            self.assertEqual(response.status_code, 200)
+
+    def test_signup_limited_per_ip(self):
+        """Регистрация ограничена по IP-адресу."""
+        data = {
+            'username': 'newbie',
+            'password1': 'Sup3r-secret-pass',
+            'password2': 'Sup3r-secret-pass',
+        }
+        Client().post(reverse('users:signup'), data)
+        response = Client().post(
+            reverse('users:signup'), dict(data, username='another')
+        )
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(User.objects.filter(username='another').exists())
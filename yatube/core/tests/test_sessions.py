@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ..jobs import enqueue
+from ..models import Job
+
+User = get_user_model()
+
+SESSION_ENGINES = (
+    'django.contrib.sessions.backends.cached_db',
+    'django.contrib.sessions.backends.signed_cookies',
+)
+
+
+class SessionEnginesTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth', password='pass')
+
+    def test_login_logout(self):
+        """Вход и выход работают с сессиями в кэше и в cookie."""
+        for engine in SESSION_ENGINES:
+            with self.subTest(engine=engine), \
+                    override_settings(SESSION_ENGINE=engine):
+                client = Client()
+                response = client.post(
+                    reverse('users:login'),
+                    {'username': 'auth', 'password': 'pass'},
+                )
+                self.assertRedirects(response, reverse('posts:index'))
+                response = client.get(reverse('posts:post_create'))
+                self.assertEqual(response.status_code, 200)
+                client.get(reverse('users:logout'))
+                response = client.get(reverse('posts:post_create'))
+                self.assertEqual(response.status_code, 302)
+
+    @override_settings(
+        SESSION_ENGINE='django.contrib.sessions.backends.cached_db'
+    )
+    def test_authenticated_read_skips_database(self):
+        """Сессия из кэша читается без запроса к django_session."""
+        client = Client()
+        client.force_login(SessionEnginesTest.user)
+        client.get(reverse('posts:follow_index'))
+        with CaptureQueriesContext(connection) as queries:
+            client.get(reverse('about:author'))
+        self.assertFalse(
+            [query for query in queries if 'django_session' in query['sql']]
+        )
+
+
+@override_settings(JOBS_MODE='sync')
+class ClearExpiredSessionsTest(TestCase):
+    def test_clear_expired_sessions(self):
+        """Истёкшие сессии удаляются пачками, живые остаются."""
+        now = timezone.now()
+        for number in range(5):
+            Session.objects.create(
+                session_key=f'expired{number}', session_data='',
+                expire_date=now - timedelta(days=1),
+            )
+        Session.objects.create(
+            session_key='alive', session_data='',
+            expire_date=now + timedelta(days=1),
+        )
+        job = enqueue('clear_expired_sessions', {'batch_size': 2})
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual((job.processed, job.total), (5, 5))
+        self.assertEqual(
+            list(Session.objects.values_list('session_key', flat=True)),
+            ['alive'],
+        )
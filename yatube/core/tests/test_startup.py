@@ -0,0 +1,28 @@
+from django.contrib import admin
+from django.test import SimpleTestCase
+
+from posts.models import Post
+
+from ..startup import summarize_importtime
+from ..warmup import warm_urls
+
+IMPORTTIME = '''import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     posts.forms
+import time:       300 |        420 |   posts.views
+import time:      1500 |       1500 | django.db
+not an importtime line
+'''
+
+
+class StartupProfileTest(SimpleTestCase):
+    def test_summarize_importtime(self):
+        """Собственное время импорта суммируется по пакетам."""
+        self.assertEqual(
+            summarize_importtime(IMPORTTIME.splitlines()),
+            [('django', 1500), ('posts', 420)],
+        )
+
+    def test_warm_urls(self):
+        """Прогрев загружает URLconf и регистрирует модели в админке."""
+        self.assertGreater(warm_urls(), 0)
+        self.assertTrue(admin.site.is_registered(Post))
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from ..static_server import IMMUTABLE_CACHE, StaticFilesApp
+
+TEMP_STATIC_DIR = tempfile.mkdtemp(dir=settings.BASE_DIR)
+TEMP_STATIC_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+CSS = b'body { color: red; }\n' * 50
+
+
+@override_settings(
+    STATICFILES_DIRS=(TEMP_STATIC_DIR,),
+    STATIC_ROOT=TEMP_STATIC_ROOT,
+    STATICFILES_STORAGE='core.storage.CompressedManifestStaticFilesStorage',
+    INSTALLED_APPS=['django.contrib.staticfiles'],
+)
+class CompressedStaticTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(os.path.join(TEMP_STATIC_DIR, 'css'))
+        with open(os.path.join(TEMP_STATIC_DIR, 'css', 'site.css'),
+                  'wb') as css:
+            css.write(CSS)
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cls.app = StaticFilesApp(cls.fallback)
+        cls.hashed = next(
+            url for url in cls.app.files
+            if url.startswith('/static/css/site.') and url != (
+                '/static/css/site.css'
+            )
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_STATIC_DIR, ignore_errors=True)
+        shutil.rmtree(TEMP_STATIC_ROOT, ignore_errors=True)
+
+    @staticmethod
+    def fallback(environ, start_response):
+        start_response('404 Not Found', [])
+        return [b'app']
+
+    def request(self, path, **environ):
+        response = {}
+
+        def start_response(status, headers):
+            response['status'] = status
+            response['headers'] = dict(headers)
+
+        body = self.app(
+            dict({'PATH_INFO': path, 'REQUEST_METHOD': 'GET'}, **environ),
+            start_response,
+        )
+        response['body'] = b''.join(body)
+        return response
+
+    def test_collectstatic_writes_compressed_copies(self):
+        path = os.path.join(TEMP_STATIC_ROOT, self.hashed[len('/static/'):])
+        self.assertTrue(os.path.exists(path + '.gz'))
+
+    def test_serves_precompressed_immutable_file(self):
+        response = self.request(self.hashed, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['status'], '200 OK')
+        self.assertEqual(response['headers']['Content-Encoding'], 'gzip')
+        self.assertEqual(response['headers']['Cache-Control'],
+                         IMMUTABLE_CACHE)
+        self.assertLess(len(response['body']), len(CSS))
+
+    def test_serves_identity_and_not_modified(self):
+        response = self.request(self.hashed)
+        self.assertEqual(response['body'], CSS)
+        etag = response['headers']['ETag']
+        response = self.request(self.hashed, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response['status'], '304 Not Modified')
+
+    def test_unknown_path_goes_to_application(self):
+        self.assertEqual(self.request('/static/none.css')['body'], b'app')
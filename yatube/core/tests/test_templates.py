@@ -0,0 +1,34 @@
+from django.template import engines
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..warmup import warm_templates
+
+
+class TemplateWarmupTest(TestCase):
+    def test_warm_templates_compiles_project_templates(self):
+        """Прогрев компилирует шаблоны проекта без ошибок."""
+        compiled = warm_templates()
+        for name in ('base.html', 'posts/index.html',
+                     'posts/includes/post_list.html'):
+            with self.subTest(name=name):
+                self.assertIn(name, compiled)
+
+    def test_templates_use_explicit_loaders(self):
+        """Загрузчики шаблонов заданы явно, без APP_DIRS."""
+        engine = engines['django'].engine
+        self.assertFalse(engine.app_dirs)
+        self.assertTrue(engine.loaders)
+
+
+class TemplateProfileTest(TestCase):
+    @override_settings(TEMPLATE_PROFILING=True)
+    def test_server_timing_header(self):
+        """При профилировании ответ содержит время рендеринга шаблонов."""
+        response = Client().get(reverse('about:author'))
+        self.assertIn('desc="about/author.html"', response['Server-Timing'])
+        self.assertIn('tpl0;dur=', response['Server-Timing'])
+
+    def test_profiling_disabled_by_default(self):
+        response = Client().get(reverse('about:author'))
+        self.assertFalse(response.has_header('Server-Timing'))
@@ -0,0 +1,77 @@
+import logging
+import os
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.utils import get_app_template_dirs
+from django.urls import URLResolver, get_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def _template_names(directory):
+    for root, _, files in os.walk(directory):
+        for filename in files:
+            if filename.endswith(('.html', '.txt')):
+                yield os.path.relpath(
+                    os.path.join(root, filename), directory
+                ).replace(os.sep, '/')
+
+
+def warm_templates():
+    """Компилирует шаблоны проекта, заполняя кэширующий загрузчик.
+
+    Возвращает список скомпилированных шаблонов.
+    """
+    compiled = []
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        engine = backend.engine
+        # Шаблоны сторонних приложений (админка, debug_toolbar) нужны
+        # редко и компилируются при первом обращении.
+        directories = list(engine.dirs) + [
+            directory for directory in get_app_template_dirs('templates')
+            if str(directory).startswith(settings.BASE_DIR)
+        ]
+        for directory in directories:
+            for name in _template_names(directory):
+                try:
+                    engine.get_template(name)
+                except TemplateSyntaxError as error:
+                    logger.warning('Шаблон %s не скомпилирован: %s',
+                                   name, error)
+                else:
+                    compiled.append(name)
+    return compiled
+
+
+def _populate(resolver):
+    resolver.reverse_dict
+    count = 0
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            count += _populate(pattern)
+        else:
+            count += 1
+    return count
+
+
+def warm_urls():
+    """Загружает URLconf с представлениями и строит таблицы reverse.
+
+    Возвращает число маршрутов.
+    """
+    return _populate(get_resolver())
+
+
+def warm_up():
+    """Прогрев процесса перед первым запросом.
+
+    Вызывается из ``yatube.wsgi``, поэтому management-команды и
+    обработчик фоновых задач не тратят на него время.
+    """
+    warm_urls()
+    if getattr(settings, 'TEMPLATES_PRECOMPILE', False):
+        warm_templates()
@@ -1,7 +1,37 @@
-from django.contrib import admin
+from core.jobs import enqueue
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
 
+from .deletion import soft_delete_posts
+from .models import ArchivedPost, Group, Post, Comment, Follow
 
-from .models import Group, Post, Comment, Follow
+
+class PostActionForm(ActionForm):
+    group = forms.ModelChoiceField(
+        queryset=Group.objects.all(),
+        required=False,
+        label='Группа',
+    )
+
+
+class CommentActionForm(ActionForm):
+    pattern = forms.CharField(required=False, label='Шаблон текста')
+
+
+def _action_form(modeladmin, request):
+    """Форма действия с выбором действий, как её проверяет админка."""
+    form = modeladmin.action_form(request.POST)
+    form.fields['action'].choices = modeladmin.get_action_choices(request)
+    return form
+
+
+def _job_queued(modeladmin, request, job):
+    modeladmin.message_user(
+        request,
+        f'Задача «{job}» поставлена в очередь, прогресс — '
+        f'в разделе «Фоновые задачи».',
+    )
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -11,11 +41,49 @@ class PostAdmin(admin.ModelAdmin):
         'created',
         'author',
         'group',
+        'deleted',
     )
     list_editable = ('group',)
     search_fields = ('text',)
-    list_filter = ('created',)
+    list_filter = ('created', 'deleted')
     empty_value_display = '-пусто-'
+    action_form = PostActionForm
+    actions = ('reassign_group', 'delete_author_posts')
+
+    def get_queryset(self, request):
+        return Post.all_objects.select_related('author', 'group')
+
+    def delete_model(self, request, obj):
+        soft_delete_posts(Post.all_objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        # Посты скрываются сразу, а стирает их задача purge_deleted.
+        soft_delete_posts(queryset)
+
+    def reassign_group(self, request, queryset):
+        form = _action_form(self, request)
+        if not form.is_valid() or form.cleaned_data['group'] is None:
+            self.message_user(
+                request, 'Выберите существующую группу.',
+                level=messages.ERROR,
+            )
+            return
+        job = enqueue('reassign_group', {
+            'post_ids': list(queryset.values_list('pk', flat=True)),
+            'group_id': form.cleaned_data['group'].pk,
+        })
+        _job_queued(self, request, job)
+    reassign_group.short_description = 'Перенести в выбранную группу'
+
+    def delete_author_posts(self, request, queryset):
+        author_ids = list(
+            queryset.values_list('author_id', flat=True).distinct()
+        )
+        job = enqueue('delete_author_posts', {'author_ids': author_ids})
+        _job_queued(self, request, job)
+    delete_author_posts.short_description = (
+        'Удалить все посты авторов выбранных записей'
+    )
 
 
 class GroupAdmin(admin.ModelAdmin):
@@ -39,6 +107,53 @@ class CommentAdmin(admin.ModelAdmin):
     search_fields = ('author',)
     list_filter = ('created',)
     empty_value_display = '-пусто-'
+    action_form = CommentActionForm
+    actions = ('purge_comments',)
+
+    def purge_comments(self, request, queryset):
+        form = _action_form(self, request)
+        pattern = form.cleaned_data['pattern'] if form.is_valid() else ''
+        if not pattern:
+            self.message_user(
+                request, 'Укажите шаблон текста.', level=messages.ERROR
+            )
+            return
+        job = enqueue('purge_comments', {'pattern': pattern})
+        _job_queued(self, request, job)
+    purge_comments.short_description = (
+        'Удалить все комментарии, содержащие шаблон'
+    )
+
+
+class ArchivedPostAdmin(admin.ModelAdmin):
+    """Архив только просматривается и удаляется."""
+    list_display = (
+        'pk',
+        'text',
+        'created',
+        'author',
+        'group',
+        'archived',
+        'deleted',
+    )
+    search_fields = ('text',)
+    list_filter = ('created', 'deleted')
+    empty_value_display = '-пусто-'
+
+    def get_queryset(self, request):
+        return ArchivedPost.all_objects.select_related('author', 'group')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def delete_model(self, request, obj):
+        soft_delete_posts(ArchivedPost.all_objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        soft_delete_posts(queryset)
 
 
 class FollowAdmin(admin.ModelAdmin):
@@ -53,4 +168,5 @@ class FollowAdmin(admin.ModelAdmin):
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group, GroupAdmin)
 admin.site.register(Comment, CommentAdmin)
+admin.site.register(ArchivedPost, ArchivedPostAdmin)
 admin.site.register(Follow, FollowAdmin)
@@ -0,0 +1,126 @@
+"""Архив старых постов.
+
+Посты старше ``ARCHIVE_AFTER_DAYS`` вместе с комментариями переносятся
+задачей ``archive_old_posts`` в таблицы ``ArchivedPost`` и
+``ArchivedComment``, так что таблица ``Post`` и её индексы остаются
+небольшими. Переносятся всегда самые старые посты, поэтому любой пост
+архива старше любого поста горячей таблицы. На этом держится
+``ArchiveFeed``: лента читает горячую таблицу, а к архиву обращается
+только на страницах за её концом.
+"""
+import hashlib
+from datetime import timedelta
+
+from core.models import delete_rows
+from core.page_cache import purge_tags, tags_etag
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .cache import ARCHIVE_TAG, post_tag
+from .models import ArchivedComment, ArchivedPost, Comment, Post, PostScore
+
+
+def cutoff(now=None):
+    """Посты, созданные раньше этого момента, уходят в архив."""
+    now = now or timezone.now()
+    return now - timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+
+
+def archived_count(queryset):
+    """Число постов выборки архива, закэшированное до его изменения.
+
+    Архив меняется только фоновыми задачами, поэтому подсчёт на каждой
+    странице ленты не нужен. Ключи живут ``ARCHIVE_COUNT_TIMEOUT``
+    секунд, чтобы не копиться по всем авторам и группам.
+    """
+    query = hashlib.md5(str(queryset.query).encode()).hexdigest()
+    key = f'archive-count:{query}:{tags_etag(ARCHIVE_TAG)}'
+    return cache.get_or_set(
+        key, queryset.count, settings.ARCHIVE_COUNT_TIMEOUT
+    )
+
+
+def invalidate_counts():
+    purge_tags(ARCHIVE_TAG)
+
+
+class ArchiveFeed:
+    """Лента для ``Paginator``: горячие посты, а за ними архивные.
+
+    ``hot`` и ``archived`` — выборки ``Post`` и ``ArchivedPost`` с
+    одинаковыми условиями и порядком по убыванию даты. Выборки, которые
+    меняются без изменения архива (лента подписок), передаются с
+    ``cache_count=False``.
+    """
+    ordered = True
+
+    def __init__(self, hot, archived, cache_count=True):
+        self.hot = hot
+        self.archived = archived
+        self.cache_count = cache_count
+
+    @cached_property
+    def hot_count(self):
+        return self.hot.count()
+
+    def count(self):
+        if self.cache_count:
+            return self.hot_count + archived_count(self.archived)
+        return self.hot_count + self.archived.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        start, stop = key.start or 0, key.stop
+        hot_count = self.hot_count
+        rows = list(self.hot[start:stop]) if start < hot_count else []
+        if stop is None or stop > hot_count:
+            rows += self.archived[
+                max(start - hot_count, 0):
+                None if stop is None else stop - hot_count
+            ]
+        return rows
+
+
+def find_post(post_id):
+    """Пост из архива с автором и группой или None."""
+    return ArchivedPost.objects.select_related(
+        'author', 'group'
+    ).filter(pk=post_id).first()
+
+
+def archive_posts(posts):
+    """Переносит посты в архив одной транзакцией.
+
+    Удалённые комментарии не переносятся, а стираются; оценки для
+    «Популярного» старым постам не нужны.
+    """
+    ids = [post.pk for post in posts]
+    now = timezone.now()
+    comments = Comment.all_objects.filter(post_id__in=ids)
+    with transaction.atomic():
+        ArchivedPost.objects.bulk_create([
+            ArchivedPost(
+                id=post.pk, text=post.text, author_id=post.author_id,
+                group_id=post.group_id, image=post.image.name,
+                created=post.created, archived=now,
+            )
+            for post in posts
+        ])
+        ArchivedComment.objects.bulk_create([
+            ArchivedComment(
+                id=comment.pk, text=comment.text, post_id=comment.post_id,
+                author_id=comment.author_id, created=comment.created,
+            )
+            for comment in comments.filter(deleted__isnull=True)
+        ])
+        delete_rows(comments)
+        PostScore.objects.filter(post_id__in=ids).delete()
+        delete_rows(Post.all_objects.filter(pk__in=ids))
+    purge_tags(*(post_tag(pk) for pk in ids))
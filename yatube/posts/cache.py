@@ -0,0 +1,68 @@
+from core.lookups import LookupCache
+from core.page_cache import purge_tags
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+
+from .models import Group
+
+User = get_user_model()
+
+FEED_FRAGMENTS = ('page_index',)
+# Тег всех закэшированных страниц с постами.
+FEED_TAG = 'feed'
+# Тег общей ленты подписки: сбрасывается при любом изменении поста.
+LATEST_TAG = 'latest'
+# Версия содержимого архива: по ней кэшируются счётчики posts.archive.
+ARCHIVE_TAG = 'archive'
+
+# Объекты из адресов /group/<slug>/ и /profile/<username>/. У
+# пользователя кэшируются только поля для страницы профиля; удалённые
+# (неактивные) пользователи не находятся.
+group_lookup = LookupCache(Group, 'slug')
+author_lookup = LookupCache(
+    User, 'username', only=('username', 'first_name', 'last_name'),
+    filters={'is_active': True},
+)
+
+
+def group_tag(group_id):
+    return f'group-{group_id}'
+
+
+def author_tag(author_id):
+    return f'author-{author_id}'
+
+
+def post_tag(post_id):
+    return f'post-{post_id}'
+
+
+def invalidate_feed_cache(author_ids=(), group_ids=()):
+    """Сбрасывает фрагменты ленты и все страницы с постами.
+
+    Ленты RSS, Atom и JSON Feed строят ETag по ``LATEST_TAG`` и тегам
+    автора и группы, поэтому после массовых операций сбрасываются и
+    теги затронутых авторов и групп.
+    """
+    cache.delete_many(
+        [make_template_fragment_key(name) for name in FEED_FRAGMENTS]
+    )
+    purge_tags(
+        FEED_TAG, LATEST_TAG,
+        *(author_tag(author_id) for author_id in set(author_ids)),
+        *(group_tag(group_id) for group_id in set(group_ids) if group_id),
+    )
+
+
+def invalidate_post_pages(post, *old_group_ids):
+    """Сбрасывает страницы поста, его автора и групп.
+
+    Главная страница не сбрасывается: она живёт недолго по таймауту.
+    """
+    tags = [post_tag(post.pk), author_tag(post.author_id), LATEST_TAG]
+    tags += [
+        group_tag(group_id)
+        for group_id in {post.group_id, *old_group_ids} if group_id
+    ]
+    purge_tags(*tags)
@@ -0,0 +1,101 @@
+"""Мягкое удаление постов и пользователей.
+
+Удаление ставит отметку ``deleted`` одним UPDATE, и менеджеры
+``objects`` сразу скрывают записи из лент, профилей, групп и
+выгрузок. Строки окончательно стирают фоновые задачи
+``purge_deleted`` и ``purge_user`` (``posts.tasks``): пачками по
+``BULK_CHUNK_SIZE`` с паузой ``PURGE_THROTTLE``, вместо одного
+каскадного удаления, которое надолго блокирует базу.
+
+Записи пользователя получают одну отметку времени, которая хранится
+в параметрах задачи ``purge_user``. Задача ждёт ``USER_PURGE_DELAY``
+секунд, и до тех пор ``restore_user`` возвращает ровно то, что скрыло
+удаление пользователя; посты, удалённые раньше по одному, остаются
+скрытыми.
+"""
+from core.jobs import enqueue
+from core.models import Job
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import archive, popular, stats
+from .cache import invalidate_feed_cache
+from .models import ArchivedComment, ArchivedPost, Comment, Post, PostScore
+
+
+def soft_delete_posts(posts, now=None):
+    """Скрывает посты выборки (горячие или архивные), возвращает их число."""
+    now = now or timezone.now()
+    posts = posts.filter(deleted__isnull=True).order_by()
+    group_ids = set(posts.values_list('group_id', flat=True).distinct())
+    author_ids = set(posts.values_list('author_id', flat=True).distinct())
+    if posts.model is Post:
+        PostScore.objects.filter(post__in=posts).delete()
+    count = posts.update(deleted=now)
+    if posts.model is ArchivedPost:
+        archive.invalidate_counts()
+    stats.refresh(group_ids - {None})
+    invalidate_feed_cache(author_ids, group_ids)
+    return count
+
+
+def soft_delete_user(user):
+    """Отключает пользователя и скрывает его посты и комментарии.
+
+    Окончательное удаление ставится в очередь с низким приоритетом.
+    """
+    now = timezone.now()
+    user.is_active = False
+    user.save(update_fields=('is_active',))
+    commented = set(
+        Comment.objects.filter(author=user).values_list('post_id', flat=True)
+    )
+    soft_delete_posts(Post.objects.filter(author=user), now)
+    soft_delete_posts(ArchivedPost.objects.filter(author=user), now)
+    for model in (Comment, ArchivedComment):
+        model.objects.filter(author=user).update(deleted=now)
+    popular.rebuild(commented)
+    return enqueue(
+        'purge_user', {'user_id': user.pk, 'deleted': now.isoformat()},
+        priority=Job.LOW, delay=settings.USER_PURGE_DELAY,
+    )
+
+
+def pending_purge(user):
+    """Задача ``purge_user`` пользователя, которая ещё не запущена."""
+    for job in Job.objects.filter(name='purge_user', status=Job.PENDING):
+        if job.params['user_id'] == user.pk:
+            return job
+    return None
+
+
+def restore_user(user):
+    """Снова включает пользователя, пока его не стёрла ``purge_user``.
+
+    Возвращает посты и комментарии, скрытые ``soft_delete_user``, и
+    отменяет задачу. Пользователь, отключённый иначе, только
+    включается. Возвращает, было ли что восстанавливать.
+    """
+    user.is_active = True
+    user.save(update_fields=('is_active',))
+    job = pending_purge(user)
+    if job is None:
+        return False
+    job.delete()
+    deleted = parse_datetime(job.params['deleted'])
+    posts, archived, comments, archived_comments = querysets = [
+        model.all_objects.filter(author=user, deleted=deleted)
+        for model in (Post, ArchivedPost, Comment, ArchivedComment)
+    ]
+    post_ids = set(posts.values_list('pk', flat=True))
+    post_ids |= set(comments.values_list('post_id', flat=True))
+    group_ids = set(posts.values_list('group_id', flat=True))
+    group_ids |= set(archived.values_list('group_id', flat=True))
+    for queryset in querysets:
+        queryset.update(deleted=None)
+    popular.rebuild(post_ids)
+    archive.invalidate_counts()
+    stats.refresh(group_ids - {None})
+    invalidate_feed_cache([user.pk], group_ids)
+    return True
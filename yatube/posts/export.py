@@ -0,0 +1,171 @@
+"""Потоковая выгрузка всех постов автора с комментариями.
+
+Посты и комментарии читаются двумя курсорами (``.iterator()``),
+упорядоченными по id поста, и сливаются на лету, поэтому в памяти
+одновременно находится один пост с его комментариями, сколько бы их
+ни было. Сначала выгружаются посты из архива, они старше остальных.
+Архив ZIP пишется в поток без перемотки, картинки копируются
+кусками.
+"""
+import csv
+import io
+import json
+import zipfile
+
+from django.conf import settings
+
+from .models import ArchivedComment, ArchivedPost, Comment, Post
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+CSV_COLUMNS = ('type', 'post_id', 'comment_id', 'created', 'author',
+               'group', 'text', 'image')
+COPY_CHUNK_SIZE = 64 * 1024
+
+
+def _iterator(queryset):
+    return queryset.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+
+
+def _merge(post_model, comment_model, author):
+    posts = _iterator(
+        post_model.objects.filter(author=author).select_related('group')
+        .order_by('pk')
+    )
+    comments = _iterator(
+        comment_model.objects.filter(post__author=author)
+        .select_related('author').order_by('post_id', 'pk')
+    )
+    comment = next(comments, None)
+    for post in posts:
+        post_comments = []
+        while comment is not None and comment.post_id <= post.pk:
+            if comment.post_id == post.pk:
+                post_comments.append(comment)
+            comment = next(comments, None)
+        yield post, post_comments
+
+
+def posts_with_comments(author):
+    """Пары (пост, его комментарии): архив, затем горячие, по id."""
+    yield from _merge(ArchivedPost, ArchivedComment, author)
+    yield from _merge(Post, Comment, author)
+
+
+def _post_record(post):
+    return {
+        'id': post.pk,
+        'created': post.created.isoformat(),
+        'author': post.author.username,
+        'group': post.group.slug if post.group else None,
+        'text': post.text,
+        'image': post.image.name or None,
+    }
+
+
+def _comment_record(comment):
+    return {
+        'id': comment.pk,
+        'created': comment.created.isoformat(),
+        'author': comment.author.username,
+        'text': comment.text,
+    }
+
+
+class _Echo:
+    """Файл для csv.writer, который возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(author):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for post, comments in posts_with_comments(author):
+        post.author = author
+        record = _post_record(post)
+        yield writer.writerow((
+            'post', post.pk, '', record['created'], record['author'],
+            record['group'] or '', post.text, record['image'] or '',
+        ))
+        for comment in comments:
+            yield writer.writerow((
+                'comment', post.pk, comment.pk, comment.created.isoformat(),
+                comment.author.username, '', comment.text, '',
+            ))
+
+
+def ndjson_lines(author):
+    for post, comments in posts_with_comments(author):
+        post.author = author
+        record = _post_record(post)
+        record['comments'] = [_comment_record(item) for item in comments]
+        yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+LINES = {'csv': csv_lines, 'ndjson': ndjson_lines}
+
+
+def filename(author, export_format):
+    return f'yatube-posts-{author.pk}.{export_format}'
+
+
+def export(author, export_format):
+    """Строки выгрузки в формате ``csv`` или ``ndjson``, в байтах."""
+    for line in LINES[export_format](author):
+        yield line.encode()
+
+
+class _Stream(io.RawIOBase):
+    """Поток без перемотки, из которого забирают записанные байты."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def pop(self):
+        data, self.chunks = b''.join(self.chunks), []
+        return data
+
+
+def _drain(stream):
+    data = stream.pop()
+    if data:
+        yield data
+
+
+def export_zip(author, export_format, name):
+    """ZIP с выгрузкой ``name`` и картинками постов, отдаваемый кусками."""
+    stream = _Stream()
+    with zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED) as archive:
+        with archive.open(name, 'w', force_zip64=True) as entry:
+            for line in export(author, export_format):
+                entry.write(line)
+                yield from _drain(stream)
+        # Картинки хранятся по содержимому и бывают общими у постов.
+        images = _iterator(
+            Post.objects.filter(author=author).exclude(image='').order_by()
+            .values_list('image', flat=True).union(
+                ArchivedPost.objects.filter(author=author)
+                .exclude(image='').order_by().values_list('image', flat=True)
+            ).order_by('image')
+        )
+        storage = Post._meta.get_field('image').storage
+        for image in images:
+            if not storage.exists(image):
+                continue
+            with storage.open(image) as source, archive.open(
+                    image, 'w', force_zip64=True) as entry:
+                for chunk in iter(lambda: source.read(COPY_CHUNK_SIZE), b''):
+                    entry.write(chunk)
+                    yield from _drain(stream)
+    yield from _drain(stream)
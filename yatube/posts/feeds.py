@@ -0,0 +1,173 @@
+"""Ленты RSS, Atom и JSON Feed для главной, групп и авторов.
+
+Каждая лента — экземпляр ``Feed`` под свой формат. Посты читаются
+курсором из запроса с ``LIMIT``, без загрузки всей ленты. Ответ
+помечен теми же тегами, что и HTML-страница, а ``ETag`` строится из
+версий этих тегов: опрос без изменений стоит чтения версий из кэша и
+одного запроса за датой последнего поста, а клиент получает 304.
+"""
+import json
+from calendar import timegm
+
+from core.page_cache import add_surrogate_keys, tags_etag
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils.feedgenerator import (Atom1Feed, Rss201rev2Feed,
+                                        SyndicationFeed)
+from django.utils.http import http_date
+from django.utils.text import Truncator
+from django.views.decorators.http import condition
+
+from .cache import (LATEST_TAG, author_lookup, author_tag, group_lookup,
+                    group_tag)
+from .models import Post
+
+
+class JSONFeed(SyndicationFeed):
+    """Генератор JSON Feed 1.1 (https://jsonfeed.org/version/1.1)."""
+    content_type = 'application/feed+json; charset=utf-8'
+
+    def write(self, outfile, encoding):
+        feed = {
+            'version': 'https://jsonfeed.org/version/1.1',
+            'title': self.feed['title'],
+            'home_page_url': self.feed['link'],
+            'feed_url': self.feed['feed_url'],
+            'description': self.feed['description'],
+            'language': self.feed['language'],
+            'items': [self.item_dict(item) for item in self.items],
+        }
+        outfile.write(json.dumps(feed, ensure_ascii=False))
+
+    @staticmethod
+    def item_dict(item):
+        result = {
+            'id': item['unique_id'] or item['link'],
+            'url': item['link'],
+            'title': item['title'],
+            'content_text': item['description'],
+            'date_published': item['pubdate'].isoformat(),
+        }
+        if item['author_name']:
+            result['authors'] = [{'name': item['author_name']}]
+        return result
+
+
+FEED_TYPES = {
+    'rss': Rss201rev2Feed,
+    'atom': Atom1Feed,
+    'json': JSONFeed,
+}
+
+
+class PostFeed(Feed):
+    """Общая часть лент: формат, выборка постов и условный ответ."""
+
+    def __init__(self, feed_format):
+        super().__init__()
+        self.feed_type = FEED_TYPES[feed_format]
+
+    def __call__(self, request, *args, **kwargs):
+        try:
+            obj = self.get_object(request, *args, **kwargs)
+        except ObjectDoesNotExist:
+            raise Http404('Feed object does not exist.')
+        tags = self.tags(obj)
+        view = condition(
+            etag_func=lambda request: tags_etag(*tags),
+            last_modified_func=lambda request: (
+                self.posts(obj).values_list('created', flat=True).first()
+            ),
+        )(lambda request: self.render(request, obj))
+        return add_surrogate_keys(view(request), *tags)
+
+    def render(self, request, obj):
+        """``Feed.__call__`` для уже найденного объекта ленты."""
+        feedgen = self.get_feed(obj, request)
+        response = HttpResponse(content_type=feedgen.content_type)
+        response['Last-Modified'] = http_date(
+            timegm(feedgen.latest_post_date().utctimetuple())
+        )
+        feedgen.write(response, 'utf-8')
+        return response
+
+    def posts(self, obj):
+        return Post.objects.all()
+
+    def tags(self, obj):
+        return (LATEST_TAG,)
+
+    def subtitle(self, obj):
+        # Atom берёт описание ленты из subtitle.
+        return self._get_dynamic_attr('description', obj)
+
+    def items(self, obj):
+        return self.posts(obj).select_related('author')[
+            :settings.FEED_ITEMS
+        ].iterator()
+
+    def item_title(self, item):
+        return Truncator(item.text).words(10)
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', args=(item.pk,))
+
+    def item_pubdate(self, item):
+        return item.created
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+
+class LatestPostsFeed(PostFeed):
+    title = 'Yatube: последние записи'
+    description = 'Новые записи всех авторов.'
+
+    def link(self):
+        return reverse('posts:index')
+
+
+class GroupFeed(PostFeed):
+    def get_object(self, request, slug):
+        return group_lookup.get_or_404(slug)
+
+    def posts(self, obj):
+        return obj.posts.all()
+
+    def tags(self, obj):
+        return (group_tag(obj.pk),)
+
+    def title(self, obj):
+        return f'Yatube: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('posts:group_list', args=(obj.slug,))
+
+
+class AuthorFeed(PostFeed):
+    def get_object(self, request, username):
+        return author_lookup.get_or_404(username)
+
+    def posts(self, obj):
+        return obj.posts.all()
+
+    def tags(self, obj):
+        return (author_tag(obj.pk),)
+
+    def title(self, obj):
+        return f'Yatube: {obj.get_full_name() or obj.username}'
+
+    def description(self, obj):
+        return f'Записи пользователя {obj.username}.'
+
+    def link(self, obj):
+        return reverse('posts:profile', args=(obj.username,))
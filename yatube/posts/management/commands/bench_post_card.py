@@ -0,0 +1,57 @@
+import timeit
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.template import Context, Template
+from django.utils import timezone
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+INCLUDE_TEMPLATE = (
+    "{% for post in posts %}"
+    "{% include 'posts/includes/post_list.html' %}"
+    "{% if post.group.slug is not None %}"
+    "<a href=\"{% url 'posts:group_list' post.group.slug %}\">"
+    "все записи группы</a>"
+    "{% endif %}"
+    "{% endfor %}"
+)
+POST_CARD_TEMPLATE = (
+    "{% load post_cards %}"
+    "{% for post in posts %}"
+    "{% post_card post group_link=True %}"
+    "{% endfor %}"
+)
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает {% include %} карточки поста с тегом {% post_card %}'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, **options):
+        author = User(pk=1, username='bench', first_name='Лев',
+                      last_name='Толстой')
+        group = Group(pk=1, title='Группа', slug='bench')
+        posts = [
+            Post(pk=num, text=f'Пост #{num}', author=author, group=group,
+                 created=timezone.now())
+            for num in range(1, options['posts'] + 1)
+        ]
+        context = {'posts': posts}
+        for label, source in (('include', INCLUDE_TEMPLATE),
+                              ('post_card', POST_CARD_TEMPLATE)):
+            compiled = Template(source)
+            compiled.render(Context(context))
+            spent = timeit.timeit(
+                lambda: compiled.render(Context(context)),
+                number=options['repeat'],
+            )
+            self.stdout.write(
+                f'{label:>10}: {spent / options["repeat"] * 1000:.3f} мс '
+                f'на страницу из {len(posts)} постов'
+            )
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from posts.media import collect_orphans
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет картинки и миниатюры, на которые не ссылается ни один '
+        'пост. С --max-dirs обходит хранилище частями: следующий запуск '
+        'продолжает с места остановки, поэтому команду удобно ставить '
+        'в расписание.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-dirs', type=int, default=None,
+            help='Сколько каталогов обработать за запуск.',
+        )
+        parser.add_argument(
+            '--min-age', type=int, default=None,
+            help='Не трогать файлы моложе стольких секунд '
+                 '(по умолчанию MEDIA_GC_MIN_AGE).',
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        report = collect_orphans(
+            max_dirs=options['max_dirs'],
+            min_age=options['min_age'],
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+        )
+        self.stdout.write(
+            f'Каталогов: {report["directories"]}, '
+            f'файлов: {report["scanned"]}, '
+            f'удалено: {report["removed"]}, '
+            f'освобождено байт: {report["bytes"]}'
+            + ('' if report['finished'] else ' (проход не завершён)')
+        )
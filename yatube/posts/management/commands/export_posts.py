@@ -0,0 +1,44 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from posts import export
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает все посты пользователя с комментариями в CSV или '
+        'NDJSON, с --images — в ZIP вместе с картинками. Данные пишутся '
+        'потоком, память не растёт с размером истории.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument(
+            '--format', choices=sorted(export.FORMATS), default='csv',
+        )
+        parser.add_argument('--images', action='store_true')
+        parser.add_argument(
+            '--output', '-o',
+            help='Файл для выгрузки; по умолчанию стандартный вывод.',
+        )
+
+    def handle(self, *args, **options):
+        author = User.objects.filter(username=options['username']).first()
+        if author is None:
+            raise CommandError(
+                f'Пользователь {options["username"]} не найден.'
+            )
+        name = export.filename(author, options['format'])
+        if options['images']:
+            chunks = export.export_zip(author, options['format'], name)
+        else:
+            chunks = export.export(author, options['format'])
+        if options['output']:
+            with open(options['output'], 'wb') as output:
+                output.writelines(chunks)
+        else:
+            sys.stdout.buffer.writelines(chunks)
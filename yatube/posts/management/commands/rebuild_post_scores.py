@@ -0,0 +1,26 @@
+from core.jobs import chunked
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+from posts.popular import rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает оценки ленты «Популярное» по публикациям, '
+        'комментариям и подпискам. Обычно оценки ведутся сигналами; '
+        'команда нужна для постов, созданных до появления ленты, и '
+        'после смены POPULAR_WEIGHTS или POPULAR_HALF_LIFE.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        post_ids = list(Post.objects.order_by('pk').values_list(
+            'pk', flat=True
+        ))
+        rebuilt = 0
+        for chunk in chunked(post_ids, options['batch_size']):
+            rebuilt += rebuild(chunk)
+        self.stdout.write(f'Пересчитано оценок: {rebuilt}')
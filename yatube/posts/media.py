@@ -0,0 +1,154 @@
+import logging
+import posixpath
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import transaction
+from django.db.models.fields.files import ImageFieldFile
+from django.utils import timezone
+from sorl.thumbnail import default as thumbnail_default
+from sorl.thumbnail import delete as delete_thumbnails
+
+from .models import ArchivedPost, Post
+
+logger = logging.getLogger(__name__)
+
+GC_ROOTS = ('posts',)
+GC_CURSOR_KEY = 'media-gc:cursor'
+
+
+def release_images(*names):
+    """Удаляет картинки, на которые больше не ссылается ни один пост.
+
+    Картинки хранятся по хэшу содержимого и общие для одинаковых
+    загрузок, поэтому файл и его миниатюры удаляются только вместе с
+    последней ссылкой. Удаление выполняется после коммита транзакции.
+    Файлы моложе ``MEDIA_GC_MIN_AGE`` секунд не трогаются: проверка
+    ссылок и удаление не атомарны, и такой файл могли только что
+    загрузить заново. Его позже уберёт ``collect_orphans``.
+    """
+    names = {name for name in names if name}
+    if names:
+        transaction.on_commit(lambda: _delete_unreferenced(names))
+
+
+def _delete_image(name):
+    """Удаляет файл, его миниатюры и записи sorl о них."""
+    field = Post._meta.get_field('image')
+    try:
+        delete_thumbnails(ImageFieldFile(None, field, name))
+    except (SuspiciousFileOperation, OSError):
+        logger.exception('Не удалось удалить картинку %s', name)
+        return False
+    return True
+
+
+def _referenced(names):
+    """Имена из ``names``, на которые ссылаются посты или архив."""
+    referenced = set()
+    for model in (Post, ArchivedPost):
+        referenced.update(model.all_objects.filter(
+            image__in=names
+        ).values_list('image', flat=True))
+    return referenced
+
+
+def _deadline(min_age=None):
+    if min_age is None:
+        min_age = settings.MEDIA_GC_MIN_AGE
+    return timezone.now() - timedelta(seconds=min_age)
+
+
+def _delete_unreferenced(names):
+    storage = Post._meta.get_field('image').storage
+    deadline = _deadline()
+    for name in names - _referenced(names):
+        if not _is_fresh(storage, name, deadline):
+            _delete_image(name)
+
+
+def _is_fresh(storage, name, deadline):
+    try:
+        return storage.get_modified_time(name) > deadline
+    except (SuspiciousFileOperation, OSError):
+        # Отсутствующий файл или путь вне хранилища разбирает
+        # _delete_image.
+        return False
+
+
+def _directories(storage, path):
+    """Каталоги хранилища в порядке обхода в глубину с сортировкой."""
+    yield path
+    directories, _ = storage.listdir(path)
+    for directory in sorted(directories):
+        yield from _directories(storage, posixpath.join(path, directory))
+
+
+def _path_key(path):
+    # Порядок обхода _directories совпадает с порядком кортежей частей.
+    return tuple(path.split('/'))
+
+
+def collect_orphans(max_dirs=None, min_age=None, batch_size=500,
+                    dry_run=False):
+    """Удаляет файлы картинок, на которые не ссылается ни один пост.
+
+    Каталоги хранилища обходятся по порядку, файлы каталога сверяются
+    с картинками постов и архива пачками по ``batch_size`` — в памяти
+    не больше одной пачки. За один запуск обрабатывается не больше ``max_dirs``
+    каталогов; место остановки хранится в кэше, и следующий запуск
+    продолжает с него. Файлы моложе ``min_age`` секунд (по умолчанию
+    ``MEDIA_GC_MIN_AGE``) не трогаются:
+    их пост мог ещё не сохраниться. После полного прохода sorl
+    удаляет записи о миниатюрах исчезнувших файлов.
+    """
+    storage = Post._meta.get_field('image').storage
+    cursor = cache.get(GC_CURSOR_KEY)
+    deadline = _deadline(min_age)
+    report = {'directories': 0, 'scanned': 0, 'removed': 0, 'bytes': 0,
+              'finished': True}
+    last = None
+    for root in GC_ROOTS:
+        if not storage.exists(root):
+            continue
+        for directory in _directories(storage, root):
+            if cursor and _path_key(directory) <= _path_key(cursor):
+                continue
+            if max_dirs is not None and report['directories'] >= max_dirs:
+                report['finished'] = False
+                break
+            _collect_directory(
+                storage, directory, deadline, batch_size, dry_run, report
+            )
+            report['directories'] += 1
+            last = directory
+        if not report['finished']:
+            break
+    if report['finished']:
+        cache.delete(GC_CURSOR_KEY)
+        if not dry_run:
+            thumbnail_default.kvstore.cleanup()
+    elif last:
+        cache.set(GC_CURSOR_KEY, last, None)
+    return report
+
+
+def _collect_directory(storage, directory, deadline, batch_size, dry_run,
+                       report):
+    _, files = storage.listdir(directory)
+    names = [posixpath.join(directory, name) for name in sorted(files)]
+    for start in range(0, len(names), batch_size):
+        batch = names[start:start + batch_size]
+        report['scanned'] += len(batch)
+        referenced = _referenced(batch)
+        for name in batch:
+            if name in referenced:
+                continue
+            if storage.get_modified_time(name) > deadline:
+                continue
+            size = storage.size(name)
+            if dry_run or _delete_image(name):
+                report['removed'] += 1
+                report['bytes'] += size
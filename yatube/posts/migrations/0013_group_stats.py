@@ -0,0 +1,34 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_post_image_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupStats',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='posts.Group')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Постов')),
+                ('posts_day', models.PositiveIntegerField(default=0, verbose_name='Постов за сутки')),
+                ('posts_week', models.PositiveIntegerField(default=0, verbose_name='Постов за неделю')),
+                ('author_count', models.PositiveIntegerField(default=0, verbose_name='Авторов')),
+                ('last_post', models.DateTimeField(null=True, verbose_name='Последний пост')),
+                ('refreshed', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Пересчитано')),
+            ],
+            options={
+                'ordering': ('-posts_day', '-posts_week', '-last_post'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='groupstats',
+            index=models.Index(fields=['-posts_day', '-posts_week', '-last_post'], name='posts_group_trending_idx'),
+        ),
+    ]
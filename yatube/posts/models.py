@@ -1,11 +1,13 @@
-from core.models import CreatedModel
+from core.models import CreatedModel, SoftDeleteModel
+from core.storage import ContentAddressedStorage
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
 
 User = get_user_model()
 
 
-class Post(CreatedModel):
+class Post(CreatedModel, SoftDeleteModel):
     text = models.TextField(
         'Текст поста',
         help_text='Введите текст поста'
@@ -28,7 +30,8 @@ class Post(CreatedModel):
     image = models.ImageField(
         'Картинка',
         upload_to='posts/',
-        blank=True
+        blank=True,
+        storage=ContentAddressedStorage(),
     )
 
     class Meta:
@@ -47,7 +50,58 @@ class Group(models.Model):
         return self.title
 
 
-class Comment(CreatedModel):
+class GroupStats(models.Model):
+    """Сводка по группе, которую ведут сигналы постов.
+
+    Счётчики за сутки и неделю только растут при публикации и
+    пересчитываются задачей ``refresh_group_stats``, когда посты
+    выходят из окна.
+    """
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+    )
+    post_count = models.PositiveIntegerField('Постов', default=0)
+    posts_day = models.PositiveIntegerField('Постов за сутки', default=0)
+    posts_week = models.PositiveIntegerField('Постов за неделю', default=0)
+    author_count = models.PositiveIntegerField('Авторов', default=0)
+    last_post = models.DateTimeField('Последний пост', null=True)
+    refreshed = models.DateTimeField('Пересчитано', default=timezone.now)
+
+    class Meta:
+        ordering = ('-posts_day', '-posts_week', '-last_post')
+        indexes = [models.Index(
+            fields=['-posts_day', '-posts_week', '-last_post'],
+            name='posts_group_trending_idx',
+        )]
+
+    def __str__(self):
+        return str(self.group_id)
+
+
+class PostScore(models.Model):
+    """Оценка поста для ленты «Популярное», см. ``posts.popular``."""
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='popularity',
+    )
+    score = models.FloatField('Оценка', default=0)
+    updated = models.DateTimeField('Обновлено', default=timezone.now)
+
+    class Meta:
+        ordering = ('-score',)
+        indexes = [models.Index(fields=['-score'],
+                                name='posts_score_top_idx')]
+
+    def __str__(self):
+        return f'{self.post_id}: {self.score:.2f}'
+
+
+class Comment(CreatedModel, SoftDeleteModel):
     text = models.TextField(
         'Текст комментария',
     )
@@ -70,6 +124,68 @@ class Comment(CreatedModel):
         return self.post
 
 
+class ArchivedPost(SoftDeleteModel):
+    """Старый пост, перенесённый из ``Post`` задачей ``archive_old_posts``.
+
+    Сохраняет id и дату исходного поста. Архив только читается: в
+    лентах он продолжает горячую таблицу, см. ``posts.archive``.
+    """
+    id = models.PositiveIntegerField(primary_key=True)
+    text = models.TextField('Текст поста')
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_posts',
+        verbose_name='Автор',
+    )
+    group = models.ForeignKey(
+        Group,
+        blank=True,
+        null=True,
+        related_name='archived_posts',
+        on_delete=models.SET_NULL,
+        verbose_name='Группа',
+    )
+    image = models.ImageField(
+        'Картинка',
+        upload_to='posts/',
+        blank=True,
+        storage=ContentAddressedStorage(),
+    )
+    created = models.DateTimeField('Дата создания', db_index=True)
+    archived = models.DateTimeField('Дата архивации', default=timezone.now)
+
+    class Meta:
+        ordering = ['-created']
+
+    def __str__(self):
+        return self.text[:15]
+
+
+class ArchivedComment(SoftDeleteModel):
+    """Комментарий к посту из архива."""
+    id = models.PositiveIntegerField(primary_key=True)
+    text = models.TextField('Текст комментария')
+    post = models.ForeignKey(
+        ArchivedPost,
+        on_delete=models.CASCADE,
+        related_name='comments',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_comments',
+        verbose_name='Автор',
+    )
+    created = models.DateTimeField('Дата создания')
+
+    class Meta:
+        ordering = ('-created',)
+
+    def __str__(self):
+        return self.text[:15]
+
+
 class Follow(CreatedModel):
     user = models.ForeignKey(
         User,
@@ -0,0 +1,141 @@
+"""Лента «Популярное»: посты по затухающей со временем оценке.
+
+Публикация, комментарий и подписка на автора добавляют посту вес из
+``POPULAR_WEIGHTS``, который вдвое уменьшается за
+``POPULAR_HALF_LIFE`` секунд. Все оценки затухают одинаково, поэтому
+хранится не текущая оценка, а log2 суммы весов, приведённых к общей
+эпохе: порядок по ней совпадает с порядком по текущей оценке и не
+требует пересчёта со временем. Событие — один UPDATE выражением над
+``score``, первые K постов — чтение K строк по индексу.
+"""
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Greatest, Least, Log, Power
+from django.utils import timezone
+
+from .models import Comment, Follow, Post, PostScore
+
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def _half_lives(when):
+    return (when - EPOCH).total_seconds() / settings.POPULAR_HALF_LIFE
+
+
+def exponent(event, when):
+    """log2 веса события, приведённого к эпохе."""
+    return math.log2(settings.POPULAR_WEIGHTS[event]) + _half_lives(when)
+
+
+def current(score, now=None):
+    """Оценка на момент ``now`` по сохранённому значению."""
+    return 2 ** (score - _half_lives(now or timezone.now()))
+
+
+def _add(score, value):
+    """log2(2 ** score + 2 ** value) выражением базы данных."""
+    value = Value(value, output_field=FloatField())
+    high = Greatest(score, value)
+    low = Least(score, value)
+    return high + Log(2, 1 + Power(2, low - high))
+
+
+def _log2_sum(exponents):
+    high = max(exponents)
+    return high + math.log2(sum(2 ** (value - high) for value in exponents))
+
+
+def post_published(post):
+    PostScore.objects.bulk_create([PostScore(
+        post=post, score=exponent('post', post.created),
+    )], ignore_conflicts=True)
+
+
+def commented(comment):
+    """Поднимает пост, к которому оставили комментарий."""
+    value = exponent('comment', comment.created)
+    updated = PostScore.objects.filter(post_id=comment.post_id).update(
+        score=_add(F('score'), value), updated=comment.created
+    )
+    if not updated:
+        rebuild([comment.post_id])
+
+
+def followed(follow):
+    """Поднимает свежие посты автора, на которого подписались."""
+    window = timedelta(seconds=settings.POPULAR_FOLLOW_WINDOW)
+    PostScore.objects.filter(
+        post__author_id=follow.author_id,
+        post__created__gte=follow.created - window,
+    ).update(
+        score=_add(F('score'), exponent('follow', follow.created)),
+        updated=follow.created,
+    )
+
+
+def unfollowed(*follows):
+    """Снимает с постов авторов подъём от удалённых подписок."""
+    if not follows:
+        return
+    window = timedelta(seconds=settings.POPULAR_FOLLOW_WINDOW)
+    rescore(Post.objects.filter(
+        author_id__in={follow.author_id for follow in follows},
+        created__range=(
+            min(follow.created for follow in follows) - window,
+            max(follow.created for follow in follows),
+        ),
+    ).values_list('pk', flat=True))
+
+
+def rescore(post_ids):
+    """Пересчитывает оценки постов, у которых они есть.
+
+    Посты без оценки пропускаются: их удаляют или уже удалили.
+    """
+    return rebuild(list(PostScore.objects.filter(
+        post_id__in=post_ids
+    ).values_list('post_id', flat=True)))
+
+
+def rebuild(post_ids):
+    """Пересчитывает оценки постов по всем их событиям."""
+    posts = list(Post.objects.filter(pk__in=post_ids).values_list(
+        'pk', 'author_id', 'created'
+    ))
+    events = defaultdict(list)
+    for post_id, _, created in posts:
+        events[post_id].append(exponent('post', created))
+    for post_id, created in Comment.objects.filter(
+            post_id__in=post_ids).values_list('post_id', 'created'):
+        events[post_id].append(exponent('comment', created))
+    follows = defaultdict(list)
+    for author_id, created in Follow.objects.filter(
+            author_id__in={author_id for _, author_id, _ in posts}
+    ).values_list('author_id', 'created'):
+        follows[author_id].append(created)
+    window = timedelta(seconds=settings.POPULAR_FOLLOW_WINDOW)
+    scores = []
+    for post_id, author_id, created in posts:
+        events[post_id] += [
+            exponent('follow', followed_at)
+            for followed_at in follows[author_id]
+            if followed_at - window <= created <= followed_at
+        ]
+        scores.append(PostScore(post_id=post_id,
+                                score=_log2_sum(events[post_id])))
+    PostScore.objects.filter(post_id__in=post_ids).delete()
+    PostScore.objects.bulk_create(scores, ignore_conflicts=True)
+    return len(scores)
+
+
+def top(limit):
+    """Первые ``limit`` постов по оценке."""
+    return [
+        score.post for score in PostScore.objects.select_related(
+            'post__author', 'post__group'
+        )[:limit]
+    ]
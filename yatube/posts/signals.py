@@ -0,0 +1,142 @@
+from core.page_cache import purge_tags
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import (FEED_TAG, author_lookup, author_tag, group_lookup,
+                    group_tag, invalidate_post_pages, post_tag)
+from . import popular, stats
+from .media import release_images
+from .models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+group_lookup.connect()
+author_lookup.connect()
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_state(sender, instance, **kwargs):
+    instance._old_group_ids = ()
+    instance._old_images = ()
+    if instance.pk:
+        old = list(Post.all_objects.filter(pk=instance.pk).values_list(
+            'group_id', 'image'
+        ))
+        instance._old_group_ids = tuple(group_id for group_id, _ in old)
+        instance._old_images = tuple(image for _, image in old)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def purge_post_pages(sender, instance, **kwargs):
+    invalidate_post_pages(instance, *getattr(instance, '_old_group_ids', ()))
+
+
+@receiver(post_save, sender=Post)
+def release_replaced_image(sender, instance, **kwargs):
+    release_images(*(
+        name for name in getattr(instance, '_old_images', ())
+        if name != instance.image.name
+    ))
+
+
+@receiver(post_delete, sender=Post)
+def release_deleted_image(sender, instance, **kwargs):
+    release_images(instance.image.name)
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, **kwargs):
+    # Удалённые посты уже вычтены из статистики в soft_delete_posts.
+    if instance.deleted:
+        return
+    old_group_ids = getattr(instance, '_old_group_ids', ())
+    for group_id in old_group_ids:
+        if group_id and group_id != instance.group_id:
+            stats.post_removed(instance, group_id)
+    if instance.group_id and instance.group_id not in old_group_ids:
+        stats.post_added(instance, instance.group_id)
+
+
+@receiver(post_save, sender=Post)
+def score_published_post(sender, instance, created, **kwargs):
+    if created:
+        popular.post_published(instance)
+
+
+@receiver(post_save, sender=Comment)
+def score_commented_post(sender, instance, created, **kwargs):
+    if created:
+        popular.commented(instance)
+
+
+@receiver(post_save, sender=Follow)
+def score_followed_author(sender, instance, created, **kwargs):
+    if created:
+        popular.followed(instance)
+
+
+@receiver(post_delete, sender=Comment)
+def rescore_uncommented_post(sender, instance, **kwargs):
+    popular.rescore([instance.post_id])
+
+
+@receiver(post_delete, sender=Follow)
+def rescore_unfollowed_author(sender, instance, **kwargs):
+    popular.unfollowed(instance)
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    if instance.group_id and not instance.deleted:
+        stats.post_removed(instance, instance.group_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def purge_comment_pages(sender, instance, **kwargs):
+    purge_tags(post_tag(instance.post_id))
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def purge_group_pages(sender, instance, **kwargs):
+    # Ссылки на группу есть в карточках всех лент.
+    purge_tags(group_tag(instance.pk), FEED_TAG)
+
+
+@receiver(post_save, sender=Group)
+def create_group_stats(sender, instance, created, **kwargs):
+    if created:
+        stats.refresh([instance.pk])
+
+
+NAME_FIELDS = ('username', 'first_name', 'last_name')
+
+
+@receiver(pre_save, sender=User)
+def remember_author_names(sender, instance, **kwargs):
+    instance._old_names = None
+    if instance.pk:
+        instance._old_names = User.objects.filter(
+            pk=instance.pk
+        ).values_list(*NAME_FIELDS).first()
+
+
+@receiver(post_save, sender=User)
+def purge_author_pages(sender, instance, created, update_fields, **kwargs):
+    if created or update_fields == frozenset(('last_login',)):
+        return
+    tags = [author_tag(instance.pk)]
+    # Страницы своих постов помечены тегом автора, а имя комментатора
+    # есть и на страницах чужих постов.
+    old_names = getattr(instance, '_old_names', None)
+    names = tuple(getattr(instance, field) for field in NAME_FIELDS)
+    if old_names is not None and old_names != names:
+        tags += [
+            post_tag(post_id) for post_id in Comment.objects.filter(
+                author=instance
+            ).values_list('post_id', flat=True).distinct()
+        ]
+    purge_tags(*tags)
@@ -0,0 +1,136 @@
+"""Сводная статистика групп без подсчёта по таблице постов.
+
+Сигналы постов меняют строку ``GroupStats`` выражениями ``F()``, так
+что публикация стоит одного UPDATE. Окна «за сутки» и «за неделю»
+сдвигаются со временем, поэтому задача ``refresh_group_stats``
+периодически пересчитывает их агрегатом; она же исправляет расхождения
+после массовых операций в обход сигналов. Посты архива учитываются в
+общем числе постов и авторов.
+"""
+from datetime import timedelta
+
+from django.db.models import Count, Exists, F, Max, OuterRef, Q
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import ArchivedPost, Group, GroupStats, Post
+
+WINDOWS = {
+    'posts_day': timedelta(days=1),
+    'posts_week': timedelta(days=7),
+}
+FIELDS = ('post_count', 'posts_day', 'posts_week', 'author_count',
+          'last_post', 'refreshed')
+EMPTY = {'post_count': 0, 'posts_day': 0, 'posts_week': 0,
+         'author_count': 0, 'last_post': None}
+
+
+def refresh(group_ids=None, now=None):
+    """Пересчитывает статистику групп одним агрегирующим запросом."""
+    now = now or timezone.now()
+    groups = Group.objects.all()
+    if group_ids is not None:
+        groups = groups.filter(pk__in=group_ids)
+    group_ids = list(groups.values_list('pk', flat=True))
+    rows = Post.objects.filter(group_id__in=group_ids).order_by().values(
+        'group_id'
+    ).annotate(
+        post_count=Count('pk'),
+        author_count=Count('author_id', distinct=True),
+        last_post=Max('created'),
+        **{
+            field: Count('pk', filter=Q(created__gte=now - window))
+            for field, window in WINDOWS.items()
+        },
+    )
+    computed = {row.pop('group_id'): row for row in rows}
+    # Авторы архива считаются, только если в горячей таблице у них нет
+    # постов в этой группе.
+    archived = ArchivedPost.objects.filter(
+        group_id__in=group_ids
+    ).order_by().annotate(hot=Exists(Post.objects.filter(
+        group_id=OuterRef('group_id'), author_id=OuterRef('author_id'),
+    ))).values('group_id').annotate(
+        post_count=Count('pk'),
+        author_count=Count('author_id', distinct=True, filter=Q(hot=False)),
+        last_post=Max('created'),
+    )
+    for row in archived:
+        totals = computed.setdefault(row['group_id'], dict(EMPTY))
+        totals['post_count'] += row['post_count']
+        totals['author_count'] += row['author_count']
+        totals['last_post'] = totals['last_post'] or row['last_post']
+    existing = GroupStats.objects.in_bulk(group_ids)
+    created, updated = [], []
+    for group_id in group_ids:
+        stats = existing.get(group_id)
+        if stats is None:
+            stats = GroupStats(group_id=group_id)
+            created.append(stats)
+        else:
+            updated.append(stats)
+        for field, value in computed.get(group_id, EMPTY).items():
+            setattr(stats, field, value)
+        stats.refreshed = now
+    GroupStats.objects.bulk_create(created, ignore_conflicts=True)
+    GroupStats.objects.bulk_update(updated, FIELDS)
+    return len(group_ids)
+
+
+def _has_other_posts(post, group_id):
+    """Есть ли у автора другие посты в группе, в том числе в архиве."""
+    return Post.objects.filter(
+        group_id=group_id, author_id=post.author_id
+    ).exclude(pk=post.pk).exists() or ArchivedPost.objects.filter(
+        group_id=group_id, author_id=post.author_id
+    ).exists()
+
+
+def _decrement(field):
+    return Greatest(F(field) - 1, 0)
+
+
+def post_added(post, group_id):
+    """Учитывает пост, появившийся в группе."""
+    now = timezone.now()
+    changes = {
+        'post_count': F('post_count') + 1,
+        'last_post': Greatest(Coalesce('last_post', post.created),
+                              post.created),
+    }
+    for field, window in WINDOWS.items():
+        if post.created >= now - window:
+            changes[field] = F(field) + 1
+    if not _has_other_posts(post, group_id):
+        changes['author_count'] = F('author_count') + 1
+    if not GroupStats.objects.filter(group_id=group_id).update(**changes):
+        refresh([group_id])
+
+
+def post_removed(post, group_id):
+    """Убирает из статистики пост, удалённый или перенесённый из группы."""
+    stats = GroupStats.objects.filter(group_id=group_id).first()
+    if stats is None:
+        refresh([group_id])
+        return
+    changes = {'post_count': _decrement('post_count')}
+    for field, window in WINDOWS.items():
+        # Пост ещё в счётчике, если был в окне на момент пересчёта.
+        if post.created >= stats.refreshed - window:
+            changes[field] = _decrement(field)
+    if not _has_other_posts(post, group_id):
+        changes['author_count'] = _decrement('author_count')
+    if stats.last_post == post.created:
+        changes['last_post'] = Post.objects.filter(
+            group_id=group_id
+        ).exclude(pk=post.pk).aggregate(
+            last=Max('created')
+        )['last'] or ArchivedPost.objects.filter(
+            group_id=group_id
+        ).aggregate(last=Max('created'))['last']
+    GroupStats.objects.filter(group_id=group_id).update(**changes)
+
+
+def trending(limit):
+    """Самые активные группы: чтение ``limit`` строк по индексу."""
+    return GroupStats.objects.select_related('group')[:limit]
@@ -0,0 +1,252 @@
+import time
+
+from core.jobs import background, chunked, task
+from core.models import Job, delete_rows
+from core.page_cache import purge_tags
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import send_mail
+from django.db.models import Q
+from sorl.thumbnail import get_thumbnail
+
+from . import archive, popular, stats
+from .cache import invalidate_feed_cache, post_tag
+from .media import collect_orphans, release_images
+from .models import (ArchivedComment, ArchivedPost, Comment, Follow, Group,
+                     Post, PostScore)
+
+User = get_user_model()
+
+# Размеры миниатюр в карточке ленты и на странице поста.
+THUMBNAIL_GEOMETRIES = ('960x339', '960x350')
+
+
+def _chunk_size():
+    return getattr(settings, 'BULK_CHUNK_SIZE', 500)
+
+
+@task
+def reassign_group(job, post_ids, group_id):
+    """Переносит посты в группу пачками через UPDATE."""
+    job.set_total(len(post_ids))
+    group_ids, author_ids = {group_id}, set()
+    for chunk in chunked(post_ids, _chunk_size()):
+        posts = Post.objects.filter(pk__in=chunk)
+        for old_group_id, author_id in posts.values_list(
+                'group_id', 'author_id'):
+            group_ids.add(old_group_id)
+            author_ids.add(author_id)
+        posts.update(group_id=group_id)
+        job.advance(len(chunk))
+    stats.refresh(group_ids - {None})
+    invalidate_feed_cache(author_ids, group_ids)
+
+
+def _throttle():
+    """Пауза между пачками, чтобы запросы сайта успевали к базе."""
+    delay = getattr(settings, 'PURGE_THROTTLE', 0)
+    if delay:
+        time.sleep(delay)
+
+
+def _delete_in_chunks(job, queryset):
+    """Стирает строки выборки пачками, по одному DELETE на пачку.
+
+    Сигналы ``post_delete`` не отправляются, поэтому страницы и оценки
+    постов, которых касались удалённые комментарии и подписки,
+    обновляются один раз после пачки.
+    """
+    model = queryset.model
+    while True:
+        chunk = list(queryset.values_list('pk', flat=True)[:_chunk_size()])
+        if not chunk:
+            break
+        rows = model._base_manager.filter(pk__in=chunk)
+        post_ids, follows = set(), []
+        if model is Comment:
+            post_ids = set(rows.values_list('post_id', flat=True))
+        elif model is Follow:
+            follows = list(rows)
+        delete_rows(rows)
+        if post_ids:
+            purge_tags(*(post_tag(post_id) for post_id in post_ids))
+            popular.rescore(post_ids)
+        popular.unfollowed(*follows)
+        job.advance(len(chunk))
+        _throttle()
+
+
+def _delete_posts(job, posts):
+    """Стирает посты (горячие или архивные) пачками с комментариями.
+
+    Комментарии и оценки удаляются первыми, поэтому сами посты можно
+    стереть одним DELETE без сборки каскада в Python. Затем
+    освобождаются картинки и пересчитывается статистика групп.
+    """
+    model = posts.model
+    comment_model = model.comments.rel.related_model
+    group_ids, author_ids = set(), set()
+    while True:
+        rows = list(posts.values_list(
+            'pk', 'image', 'group_id', 'author_id'
+        )[:_chunk_size()])
+        if not rows:
+            break
+        chunk = [row[0] for row in rows]
+        delete_rows(comment_model.all_objects.filter(post_id__in=chunk))
+        if model is Post:
+            PostScore.objects.filter(post_id__in=chunk).delete()
+        delete_rows(model.all_objects.filter(pk__in=chunk))
+        release_images(*(row[1] for row in rows))
+        group_ids.update(row[2] for row in rows)
+        author_ids.update(row[3] for row in rows)
+        job.advance(len(chunk))
+        _throttle()
+    stats.refresh(group_ids - {None})
+    if model is ArchivedPost:
+        archive.invalidate_counts()
+    invalidate_feed_cache(author_ids, group_ids)
+
+
+@task
+def delete_author_posts(job, author_ids):
+    """Удаляет все посты авторов пачками, включая архивные."""
+    posts = Post.all_objects.filter(author_id__in=author_ids)
+    archived = ArchivedPost.all_objects.filter(author_id__in=author_ids)
+    job.set_total(posts.count() + archived.count())
+    _delete_posts(job, posts)
+    _delete_posts(job, archived)
+
+
+@task
+def purge_comments(job, pattern):
+    """Удаляет комментарии, текст которых содержит ``pattern``."""
+    comments = Comment.objects.filter(text__icontains=pattern)
+    job.set_total(comments.count())
+    _delete_in_chunks(job, comments)
+    invalidate_feed_cache()
+
+
+@task
+def purge_deleted(job):
+    """Окончательно удаляет мягко удалённые комментарии и посты.
+
+    Записи отключённых пользователей остаются до ``purge_user``, чтобы
+    их можно было вернуть через ``restore_user``.
+    """
+    querysets = [
+        model.all_objects.filter(
+            deleted__isnull=False, author__is_active=True
+        )
+        for model in (Comment, ArchivedComment, Post, ArchivedPost)
+    ]
+    job.set_total(sum(queryset.count() for queryset in querysets))
+    comments, archived_comments, posts, archived = querysets
+    _delete_in_chunks(job, comments)
+    _delete_in_chunks(job, archived_comments)
+    _delete_posts(job, posts)
+    _delete_posts(job, archived)
+
+
+@task
+def purge_user(job, user_id, deleted=None):
+    """Окончательно удаляет мягко удалённого пользователя.
+
+    Подписки, комментарии и посты стираются пачками, поэтому
+    каскадное удаление самого пользователя в конце почти ничего не
+    затрагивает. Восстановленный (снова активный) пользователь не
+    удаляется, см. ``posts.deletion.restore_user``; ``deleted`` —
+    отметка времени его скрытых записей.
+    """
+    user = User.objects.filter(pk=user_id, is_active=False).first()
+    if user is None:
+        return
+    follows = Follow.objects.filter(Q(user=user) | Q(author=user))
+    comments = Comment.all_objects.filter(author=user)
+    archived_comments = ArchivedComment.all_objects.filter(author=user)
+    posts = Post.all_objects.filter(author=user)
+    archived = ArchivedPost.all_objects.filter(author=user)
+    job.set_total(sum(queryset.count() for queryset in (
+        follows, comments, archived_comments, posts, archived,
+    )))
+    _delete_in_chunks(job, follows)
+    _delete_in_chunks(job, comments)
+    _delete_in_chunks(job, archived_comments)
+    _delete_posts(job, posts)
+    _delete_posts(job, archived)
+    user.delete()
+
+
+@task
+def archive_old_posts(job):
+    """Переносит посты старше ``ARCHIVE_AFTER_DAYS`` в архив пачками.
+
+    Посты идут от самых старых, поэтому и прерванный перенос оставляет
+    архив целиком старше горячей таблицы. Мягко удалённые посты не
+    переносятся: их сотрёт ``purge_deleted``.
+    """
+    posts = Post.objects.filter(
+        created__lt=archive.cutoff()
+    ).order_by('created', 'pk')
+    job.set_total(posts.count())
+    group_ids, author_ids = set(), set()
+    while True:
+        chunk = list(posts[:_chunk_size()])
+        if not chunk:
+            break
+        archive.archive_posts(chunk)
+        group_ids.update(post.group_id for post in chunk)
+        author_ids.update(post.author_id for post in chunk)
+        job.advance(len(chunk))
+        _throttle()
+    if job.processed:
+        archive.invalidate_counts()
+        invalidate_feed_cache(author_ids, group_ids)
+
+
+@task
+def collect_media_garbage(job, max_dirs=None, min_age=None):
+    """Удаляет картинки без постов, продолжая с прошлого места."""
+    report = collect_orphans(max_dirs=max_dirs, min_age=min_age)
+    job.set_total(report['scanned'])
+    job.advance(report['scanned'])
+
+
+@task
+def refresh_group_stats(job):
+    """Пересчитывает статистику всех групп пачками."""
+    group_ids = list(Group.objects.values_list('pk', flat=True))
+    job.set_total(len(group_ids))
+    for chunk in chunked(group_ids, _chunk_size()):
+        stats.refresh(chunk)
+        job.advance(len(chunk))
+
+
+@background(priority=Job.HIGH)
+def warm_thumbnails(post_id):
+    """Строит миниатюры нового поста до первого показа в ленте."""
+    post = Post.objects.filter(pk=post_id).only('image').first()
+    if post is None or not post.image:
+        return
+    for geometry in THUMBNAIL_GEOMETRIES:
+        get_thumbnail(post.image, geometry, crop='center', upscale=True)
+
+
+@background
+def notify_post_author(comment_id):
+    """Пишет автору поста о новом комментарии."""
+    comment = Comment.objects.select_related(
+        'author', 'post__author'
+    ).filter(pk=comment_id).first()
+    if comment is None:
+        return
+    recipient = comment.post.author
+    if not recipient.email or recipient == comment.author:
+        return
+    send_mail(
+        'Новый комментарий',
+        f'{comment.author.username} прокомментировал ваш пост '
+        f'#{comment.post_id}:\n\n{comment.text}',
+        None,
+        [recipient.email],
+    )
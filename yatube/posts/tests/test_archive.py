@@ -0,0 +1,157 @@
+from datetime import timedelta
+
+from core.jobs import enqueue, run_job
+from core.models import Job
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import stats
+from ..archive import ArchiveFeed
+from ..deletion import soft_delete_user
+from ..models import (ArchivedComment, ArchivedPost, Comment, Group,
+                      GroupStats, Post)
+
+User = get_user_model()
+
+
+@override_settings(JOBS_MODE='sync', BULK_CHUNK_SIZE=5, PURGE_THROTTLE=0,
+                   ARCHIVE_AFTER_DAYS=30)
+class ArchiveTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        # 12 старых постов и 3 свежих; тексты по убыванию даты.
+        self.posts = []
+        for number in range(15):
+            post = Post.objects.create(
+                text=f'Пост {number:02}', author=ArchiveTest.author,
+                group=ArchiveTest.group,
+            )
+            Post.objects.filter(pk=post.pk).update(
+                created=now - timedelta(days=number * 10)
+            )
+            self.posts.append(post)
+        Comment.objects.create(
+            text='Старый комментарий', post=self.posts[-1],
+            author=ArchiveTest.reader,
+        )
+        removed = Comment.objects.create(
+            text='Удалённый', post=self.posts[-1], author=ArchiveTest.reader,
+        )
+        Comment.objects.filter(pk=removed.pk).update(deleted=now)
+        stats.refresh()
+        self.job = enqueue('archive_old_posts')
+
+    def texts(self, page_obj):
+        return [post.text for post in page_obj]
+
+    def test_old_posts_moved(self):
+        """Задача переносит старые посты с комментариями пачками."""
+        self.assertEqual(self.job.status, Job.DONE)
+        self.assertEqual((self.job.processed, self.job.total), (12, 12))
+        self.assertEqual(Post.all_objects.count(), 3)
+        self.assertEqual(ArchivedPost.objects.count(), 12)
+        self.assertEqual(Comment.all_objects.count(), 0)
+        comment = ArchivedComment.objects.get()
+        self.assertEqual(
+            (comment.post_id, comment.text),
+            (self.posts[-1].pk, 'Старый комментарий'),
+        )
+        archived = ArchivedPost.objects.get(pk=self.posts[3].pk)
+        self.assertEqual(
+            (archived.text, archived.author, archived.group),
+            ('Пост 03', ArchiveTest.author, ArchiveTest.group),
+        )
+        self.assertLess(
+            archived.created, timezone.now() - timedelta(days=29)
+        )
+
+    def test_feeds_continue_into_archive(self):
+        expected = [f'Пост {number:02}' for number in range(15)]
+        for url in (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=('group',)),
+            reverse('posts:profile', args=('author',)),
+        ):
+            with self.subTest(url=url):
+                first = Client().get(url).context['page_obj']
+                second = Client().get(url + '?page=2').context['page_obj']
+                self.assertEqual(first.paginator.count, 15)
+                self.assertEqual(
+                    self.texts(first) + self.texts(second), expected
+                )
+
+    def test_follow_index_includes_archive(self):
+        client = Client()
+        client.force_login(ArchiveTest.reader)
+        url = reverse('posts:follow_index')
+        self.assertEqual(
+            client.get(url).context['page_obj'].paginator.count, 0
+        )
+        client.get(reverse('posts:profile_follow', args=('author',)))
+        response = client.get(url + '?page=2')
+        self.assertEqual(len(response.context['page_obj']), 5)
+        client.get(reverse('posts:profile_unfollow', args=('author',)))
+        self.assertEqual(
+            client.get(url).context['page_obj'].paginator.count, 0
+        )
+
+    def test_hot_pages_skip_archive(self):
+        """Срез в пределах горячей таблицы не читает архив."""
+        feed = ArchiveFeed(Post.objects.all(), ArchivedPost.objects.all())
+        self.assertEqual(feed.count(), 15)
+        with CaptureQueriesContext(connection) as queries:
+            ArchiveFeed(
+                Post.objects.all(), ArchivedPost.objects.all()
+            ).count()
+            rows = feed[0:3]
+        self.assertEqual(len(rows), 3)
+        self.assertFalse(any(
+            'posts_archivedpost' in query['sql'] for query in queries
+        ))
+        self.assertEqual(len(feed[10:15]), 5)
+
+    def test_archived_post_detail(self):
+        post = self.posts[-1]
+        client = Client()
+        client.force_login(ArchiveTest.reader)
+        response = client.get(reverse('posts:post_detail', args=(post.pk,)))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['archived'])
+        self.assertEqual(
+            [comment.text for comment in response.context['comments']],
+            ['Старый комментарий'],
+        )
+        self.assertNotContains(
+            response, reverse('posts:add_comment', args=(post.pk,))
+        )
+
+    def test_group_stats_keep_archive(self):
+        row = GroupStats.objects.get(group=ArchiveTest.group)
+        self.assertEqual((row.post_count, row.author_count), (15, 1))
+        stats.refresh([ArchiveTest.group.pk])
+        row.refresh_from_db()
+        self.assertEqual((row.post_count, row.author_count), (15, 1))
+
+    def test_deleted_user_removed_from_archive(self):
+        with self.settings(JOBS_MODE='worker'):
+            job = soft_delete_user(ArchiveTest.author)
+        response = Client().get(reverse('posts:index'))
+        self.assertEqual(response.context['page_obj'].paginator.count, 0)
+        run_job(job.pk)
+        self.assertFalse(ArchivedPost.all_objects.exists())
+        self.assertFalse(ArchivedComment.all_objects.exists())
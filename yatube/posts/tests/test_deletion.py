@@ -0,0 +1,191 @@
+from core.jobs import enqueue, run_job
+from core.models import Job
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import popular
+from ..deletion import restore_user, soft_delete_posts, soft_delete_user
+from ..models import Comment, Follow, Group, GroupStats, Post, PostScore
+
+User = get_user_model()
+
+
+@override_settings(JOBS_MODE='sync', BULK_CHUNK_SIZE=2, PURGE_THROTTLE=0)
+class SoftDeleteTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@test.ru', password='pass'
+        )
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username='author', password='pass'
+        )
+        self.reader = User.objects.create_user(username='reader')
+        self.posts = [
+            Post.objects.create(
+                text=f'Пост {num}', author=self.author,
+                group=SoftDeleteTest.group,
+            )
+            for num in range(5)
+        ]
+        self.other_post = Post.objects.create(
+            text='Пост читателя', author=self.reader
+        )
+        Comment.objects.create(
+            text='Комментарий автора', post=self.other_post,
+            author=self.author,
+        )
+        Comment.objects.create(
+            text='Комментарий читателя', post=self.posts[0],
+            author=self.reader,
+        )
+        Follow.objects.create(user=self.reader, author=self.author)
+
+    def test_soft_delete_hides_posts(self):
+        """Удалённый пост сразу пропадает из лент и статистики."""
+        post = self.posts[0]
+        soft_delete_posts(Post.objects.filter(pk=post.pk))
+        self.assertEqual(Post.objects.filter(pk=post.pk).count(), 0)
+        self.assertEqual(Post.all_objects.filter(pk=post.pk).count(), 1)
+        response = Client().get(reverse('posts:index'))
+        self.assertNotIn(post, response.context['page_obj'])
+        response = Client().get(
+            reverse('posts:post_detail', args=(post.pk,))
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(
+            GroupStats.objects.get(group=SoftDeleteTest.group).post_count, 4
+        )
+        self.assertFalse(PostScore.objects.filter(post=post).exists())
+
+    def test_purge_deleted(self):
+        """Задача стирает помеченные посты пачками с комментариями."""
+        soft_delete_posts(Post.objects.filter(author=self.author))
+        job = enqueue('purge_deleted')
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual((job.processed, job.total), (5, 5))
+        self.assertFalse(Post.all_objects.filter(author=self.author).exists())
+        self.assertEqual(Comment.all_objects.count(), 1)
+        self.assertEqual(
+            GroupStats.objects.get(group=SoftDeleteTest.group).post_count, 0
+        )
+
+    def test_soft_delete_user(self):
+        """Удалённый пользователь скрыт сразу, а стирается задачей."""
+        with self.settings(JOBS_MODE='worker'):
+            job = soft_delete_user(self.author)
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertFalse(Post.objects.filter(author=self.author).exists())
+        self.assertEqual(
+            [comment.text for comment in self.other_post.comments.all()], []
+        )
+        response = Client().get(reverse('posts:profile', args=('author',)))
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(
+            Client().login(username='author', password='pass')
+        )
+
+        run_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual(job.processed, job.total)
+        self.assertFalse(User.objects.filter(username='author').exists())
+        self.assertFalse(Follow.objects.exists())
+        self.assertEqual(
+            list(Comment.all_objects.values_list('text', flat=True)), []
+        )
+
+    def test_restored_user_not_purged(self):
+        with self.settings(JOBS_MODE='worker'):
+            job = soft_delete_user(self.author)
+        User.objects.filter(pk=self.author.pk).update(is_active=True)
+        run_job(job.pk)
+        self.assertTrue(User.objects.filter(pk=self.author.pk).exists())
+
+    def test_soft_delete_user_rescores_commented_posts(self):
+        soft_delete_user(self.author)
+        self.assertAlmostEqual(
+            PostScore.objects.get(post=self.other_post).score,
+            popular.exponent('post', self.other_post.created),
+        )
+
+    def test_restore_user(self):
+        """Восстановление возвращает то, что скрыло удаление."""
+        soft_delete_posts(Post.objects.filter(pk=self.posts[0].pk))
+        with self.settings(JOBS_MODE='worker'):
+            job = soft_delete_user(self.author)
+        enqueue('purge_deleted')
+        self.assertEqual(Post.all_objects.filter(author=self.author).count(),
+                         5)
+        self.assertTrue(restore_user(self.author))
+        self.assertFalse(Job.objects.filter(pk=job.pk).exists())
+        self.assertCountEqual(
+            Post.objects.filter(author=self.author), self.posts[1:]
+        )
+        self.assertEqual(self.other_post.comments.count(), 1)
+        self.assertEqual(
+            GroupStats.objects.get(group=SoftDeleteTest.group).post_count, 4
+        )
+        self.assertEqual(PostScore.objects.filter(
+            post__author=self.author
+        ).count(), 4)
+        self.assertTrue(
+            Client().login(username='author', password='pass')
+        )
+
+    def test_purge_user_waits(self):
+        """Пока задача ждёт, пользователя можно восстановить."""
+        job = soft_delete_user(self.author)
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertTrue(User.objects.filter(pk=self.author.pk).exists())
+
+    def test_plain_reactivation_keeps_deleted_posts(self):
+        """Отключённый не через soft_delete_user ничего не получает."""
+        soft_delete_posts(Post.objects.filter(pk=self.posts[0].pk))
+        self.author.is_active = False
+        self.author.save()
+        self.assertFalse(restore_user(self.author))
+        self.assertTrue(User.objects.get(pk=self.author.pk).is_active)
+        self.assertEqual(Post.objects.filter(author=self.author).count(), 4)
+
+    def test_admin_reactivation_restores_user(self):
+        with self.settings(JOBS_MODE='worker'):
+            soft_delete_user(self.author)
+        client = Client()
+        client.force_login(SoftDeleteTest.admin)
+        client.post(
+            reverse('admin:auth_user_change', args=(self.author.pk,)),
+            {'username': 'author', 'is_active': 'on',
+             'date_joined_0': '01.01.2020', 'date_joined_1': '00:00:00'},
+        )
+        self.assertEqual(Post.objects.filter(author=self.author).count(), 5)
+
+    def test_admin_delete_is_soft(self):
+        client = Client()
+        client.force_login(SoftDeleteTest.admin)
+        post = self.posts[1]
+        client.post(
+            reverse('admin:posts_post_delete', args=(post.pk,)),
+            {'post': 'yes'},
+        )
+        self.assertIsNotNone(Post.all_objects.get(pk=post.pk).deleted)
+        client.post(
+            reverse('admin:auth_user_delete', args=(self.reader.pk,)),
+            {'post': 'yes'},
+        )
+        self.reader.refresh_from_db()
+        self.assertFalse(self.reader.is_active)
+        self.assertEqual(
+            Job.objects.get(name='purge_user').status, Job.PENDING
+        )
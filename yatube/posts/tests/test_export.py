@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Comment, Post
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+User = get_user_model()
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, EXPORT_CHUNK_SIZE=2)
+class ExportTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(ExportTest.author)
+        self.posts = []
+        for num in range(5):
+            post = Post.objects.create(
+                text=f'Пост {num}', author=ExportTest.author
+            )
+            self.posts.append(post)
+            # Чужой пост между своими и комментарии не по порядку.
+            Post.objects.create(text='Чужой', author=ExportTest.reader)
+        for post in reversed(self.posts[::2]):
+            Comment.objects.create(
+                text=f'К посту {post.pk}', post=post, author=ExportTest.reader
+            )
+        self.image_post = Post.objects.create(
+            text='С картинкой', author=ExportTest.author,
+            image=SimpleUploadedFile('pic.gif', SMALL_GIF, 'image/gif'),
+        )
+
+    def get(self, **params):
+        response = self.client.get(reverse('posts:export_posts'), params)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    def test_ndjson(self):
+        """Каждый пост автора выгружается со своими комментариями."""
+        response, content = self.get(format='ndjson')
+        self.assertEqual(response['Content-Type'],
+                         'application/x-ndjson; charset=utf-8')
+        records = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([record['id'] for record in records],
+                         [post.pk for post in self.posts + [self.image_post]])
+        for record in records:
+            self.assertEqual(
+                [comment['text'] for comment in record['comments']],
+                [f'К посту {record["id"]}']
+                if record['id'] in [post.pk for post in self.posts[::2]]
+                else [],
+            )
+
+    def test_csv(self):
+        response, content = self.get(format='csv')
+        self.assertIn('attachment', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(content.decode())))
+        self.assertEqual(len([r for r in rows if r['type'] == 'post']), 6)
+        self.assertEqual(len([r for r in rows if r['type'] == 'comment']), 3)
+        self.assertEqual(rows[1]['type'], 'comment')
+        self.assertEqual(rows[1]['post_id'], str(self.posts[0].pk))
+
+    def test_zip_with_images(self):
+        response, content = self.get(format='ndjson', images='1')
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        archive = zipfile.ZipFile(io.BytesIO(content))
+        name = f'yatube-posts-{ExportTest.author.pk}.ndjson'
+        self.assertEqual(archive.namelist(),
+                         [name, self.image_post.image.name])
+        self.assertEqual(archive.read(self.image_post.image.name), SMALL_GIF)
+        self.assertEqual(len(archive.read(name).splitlines()), 6)
+
+    def test_unknown_format(self):
+        response = self.client.get(reverse('posts:export_posts'),
+                                   {'format': 'xml'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_login_required(self):
+        response = Client().get(reverse('posts:export_posts'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_command(self):
+        path = os.path.join(TEMP_MEDIA_ROOT, 'export.csv')
+        call_command('export_posts', 'author', output=path)
+        with open(path, encoding='utf-8') as exported:
+            self.assertEqual(len(exported.read().splitlines()), 10)
@@ -0,0 +1,135 @@
+import json
+from unittest import mock
+
+from core.jobs import enqueue
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..cache import group_lookup
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class FeedsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание группы'
+        )
+        cls.post = Post.objects.create(
+            text='Текст поста в ленте', author=cls.author, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.urls = {
+            'feed': (),
+            'group_feed': (FeedsTest.group.slug,),
+            'author_feed': (FeedsTest.author.username,),
+        }
+
+    def test_formats(self):
+        """Каждая лента отдаётся в RSS, Atom и JSON Feed."""
+        content_types = {
+            'rss': 'application/rss+xml; charset=utf-8',
+            'atom': 'application/atom+xml; charset=utf-8',
+            'json': 'application/feed+json; charset=utf-8',
+        }
+        for name, args in self.urls.items():
+            for feed_format, content_type in content_types.items():
+                with self.subTest(name=name, feed_format=feed_format):
+                    response = self.client.get(
+                        reverse(f'posts:{name}_{feed_format}', args=args)
+                    )
+                    self.assertEqual(response['Content-Type'], content_type)
+                    self.assertContains(response, 'Текст поста в ленте')
+
+    def test_json_feed(self):
+        response = self.client.get(
+            reverse('posts:group_feed_json', args=(FeedsTest.group.slug,))
+        )
+        feed = json.loads(response.content)
+        self.assertEqual(feed['version'], 'https://jsonfeed.org/version/1.1')
+        self.assertEqual(feed['description'], 'Описание группы')
+        self.assertEqual(
+            [item['url'] for item in feed['items']],
+            ['http://testserver' + reverse(
+                'posts:post_detail', args=(FeedsTest.post.pk,)
+            )],
+        )
+
+    def test_unknown_group(self):
+        response = self.client.get(
+            reverse('posts:group_feed_rss', args=('missing',))
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_not_modified(self):
+        """Повторный опрос без изменений получает 304."""
+        url = reverse('posts:author_feed_atom',
+                      args=(FeedsTest.author.username,))
+        response = self.client.get(url)
+        with self.assertNumQueries(1):
+            cached = self.client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        self.assertEqual(cached.status_code, 304)
+        cached = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(cached.status_code, 304)
+
+    def test_edit_changes_etag(self):
+        """Правка поста меняет ETag лент его группы, автора и общей."""
+        etags = {
+            name: self.client.get(
+                reverse(f'posts:{name}_rss', args=args)
+            )['ETag']
+            for name, args in self.urls.items()
+        }
+        FeedsTest.post.text = 'Исправленный текст'
+        FeedsTest.post.save()
+        for name, args in self.urls.items():
+            with self.subTest(name=name):
+                response = self.client.get(
+                    reverse(f'posts:{name}_rss', args=args),
+                    HTTP_IF_NONE_MATCH=etags[name],
+                )
+                self.assertContains(response, 'Исправленный текст')
+
+    def test_bulk_delete_changes_etag(self):
+        """Фоновое удаление постов автора меняет ETag его лент."""
+        etags = {
+            name: self.client.get(
+                reverse(f'posts:{name}_rss', args=args)
+            )['ETag']
+            for name, args in self.urls.items()
+        }
+        with self.settings(JOBS_MODE='sync'):
+            enqueue(
+                'delete_author_posts', {'author_ids': [FeedsTest.author.pk]}
+            )
+        for name, args in self.urls.items():
+            with self.subTest(name=name):
+                response = self.client.get(
+                    reverse(f'posts:{name}_rss', args=args),
+                    HTTP_IF_NONE_MATCH=etags[name],
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertNotContains(response, 'Текст поста в ленте')
+
+    def test_single_lookup(self):
+        """Объект ленты ищется один раз за запрос."""
+        with mock.patch.object(
+            group_lookup, 'get_or_404', wraps=group_lookup.get_or_404
+        ) as lookup:
+            self.client.get(
+                reverse('posts:group_feed_rss', args=(FeedsTest.group.slug,))
+            )
+        self.assertEqual(lookup.call_count, 1)
@@ -1,3 +1,4 @@
+import hashlib
 import shutil
 import tempfile
 from http import HTTPStatus
@@ -72,11 +73,13 @@ class PostFormTests(TestCase):
             follow=True
         )
         latest_post = Post.objects.latest('created')
+        image_hash = hashlib.sha256(small_gif).hexdigest()
         form_fields = [
             (form_data['text'], latest_post.text),
             (form_data['group'], latest_post.group.id),
             (PostFormTests.user, latest_post.author),
-            (f"posts/{form_data['image'].name}", latest_post.image.name),
+            (f'posts/{image_hash[:2]}/{image_hash}.gif',
+             latest_post.image.name),
         ]
         for form_field, post_data in form_fields:
             self.assertEqual(form_field, post_data)
@@ -0,0 +1,112 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Comment, Group, Post
+
+User = get_user_model()
+
+
+@override_settings(PAGE_CACHE_ENABLED=True)
+class AnonymousPageCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.other = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text='Тестовый пост',
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.urls = {
+            'index': reverse('posts:index'),
+            'group': reverse('posts:group_list', args=(self.group.slug,)),
+            'other_group': reverse(
+                'posts:group_list', args=(self.other_group.slug,)
+            ),
+            'profile': reverse('posts:profile', args=(self.author.username,)),
+            'other_profile': reverse(
+                'posts:profile', args=(self.other.username,)
+            ),
+            'post': reverse('posts:post_detail', args=(self.post.pk,)),
+        }
+        for url in self.urls.values():
+            self.guest_client.get(url)
+
+    def cache_state(self, name):
+        return self.guest_client.get(self.urls[name])['X-Page-Cache']
+
+    def test_pages_are_cached_with_surrogate_keys(self):
+        response = self.guest_client.get(self.urls['post'])
+        self.assertEqual(response['X-Page-Cache'], 'hit')
+        self.assertEqual(
+            response['Surrogate-Key'].split(),
+            ['feed', f'post-{self.post.pk}', f'author-{self.author.pk}',
+             f'group-{self.group.pk}'],
+        )
+        self.assertIn('Cookie', response['Vary'])
+
+    def test_new_post_purges_only_affected_pages(self):
+        """Новый пост сбрасывает только страницы своей группы и автора."""
+        Post.objects.create(
+            author=self.author, text='Новый пост', group=self.group
+        )
+        expected = {
+            'index': 'hit',
+            'group': 'miss',
+            'other_group': 'hit',
+            'profile': 'miss',
+            'other_profile': 'hit',
+            'post': 'miss',
+        }
+        for name, state in expected.items():
+            with self.subTest(page=name):
+                self.assertEqual(self.cache_state(name), state)
+
+    def test_moving_post_purges_old_group(self):
+        self.post.group = self.other_group
+        self.post.save()
+        self.assertEqual(self.cache_state('group'), 'miss')
+        self.assertEqual(self.cache_state('other_group'), 'miss')
+
+    def test_comment_purges_post_page(self):
+        Comment.objects.create(
+            post=self.post, author=self.other, text='Комментарий'
+        )
+        self.assertEqual(self.cache_state('post'), 'miss')
+        self.assertEqual(self.cache_state('profile'), 'hit')
+
+    def test_renamed_commenter_purges_post_page(self):
+        """Новое имя комментатора сбрасывает страницы чужих постов."""
+        Comment.objects.create(
+            post=self.post, author=self.other, text='Комментарий'
+        )
+        self.guest_client.get(self.urls['post'])
+        self.other.email = 'other@test.ru'
+        self.other.save()
+        self.assertEqual(self.cache_state('post'), 'hit')
+        self.other.first_name = 'Другой'
+        self.other.save()
+        self.assertEqual(self.cache_state('post'), 'miss')
+
+    def test_authorized_user_bypasses_cache(self):
+        client = Client()
+        client.force_login(self.other)
+        response = client.get(self.urls['index'])
+        self.assertFalse(response.has_header('X-Page-Cache'))
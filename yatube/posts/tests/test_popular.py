@@ -0,0 +1,110 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import popular
+from ..models import Comment, Follow, Post, PostScore
+
+User = get_user_model()
+
+
+@override_settings(POPULAR_HALF_LIFE=60 * 60)
+class PopularFeedTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+
+    def setUp(self):
+        self.old = Post.objects.create(
+            text='Старый пост', author=PopularFeedTest.author
+        )
+        self.new = Post.objects.create(
+            text='Новый пост', author=PopularFeedTest.reader
+        )
+
+    def scores(self):
+        return dict(PostScore.objects.values_list('post_id', 'score'))
+
+    def test_newer_post_ranks_higher(self):
+        self.assertEqual(popular.top(2), [self.new, self.old])
+
+    def test_comment_raises_post(self):
+        """Комментарий поднимает пост одним UPDATE без агрегатов."""
+        client = Client()
+        client.force_login(PopularFeedTest.reader)
+        client.post(reverse('posts:add_comment', args=(self.old.pk,)),
+                    {'text': 'Отличный пост'})
+        self.assertEqual(popular.top(2), [self.old, self.new])
+
+    def test_follow_raises_recent_posts(self):
+        Follow.objects.create(
+            user=PopularFeedTest.reader, author=PopularFeedTest.author
+        )
+        self.assertEqual(popular.top(1), [self.old])
+
+    def test_unfollow_takes_boost_back(self):
+        """Повторные подписка и отписка не копят оценку."""
+        score = self.scores()[self.old.pk]
+        for _ in range(3):
+            Follow.objects.create(
+                user=PopularFeedTest.reader, author=PopularFeedTest.author
+            )
+            Follow.objects.filter(user=PopularFeedTest.reader).delete()
+        self.assertAlmostEqual(self.scores()[self.old.pk], score)
+        Follow.objects.create(
+            user=PopularFeedTest.reader, author=PopularFeedTest.author
+        )
+        followed = self.scores()[self.old.pk]
+        popular.rebuild([self.old.pk])
+        self.assertAlmostEqual(self.scores()[self.old.pk], followed)
+
+    def test_deleted_comment_lowers_post(self):
+        score = self.scores()[self.old.pk]
+        comment = Comment.objects.create(
+            text='Спам', post=self.old, author=PopularFeedTest.reader
+        )
+        self.assertGreater(self.scores()[self.old.pk], score)
+        comment.delete()
+        self.assertAlmostEqual(self.scores()[self.old.pk], score)
+
+    def test_score_decays(self):
+        """Оценка вдвое падает за период полураспада."""
+        score = PostScore.objects.get(post=self.new).score
+        now = self.new.created + timedelta(hours=1)
+        self.assertAlmostEqual(popular.current(score, now), 0.5)
+
+    def test_rebuild_matches_incremental(self):
+        Comment.objects.create(
+            text='Раз', post=self.old, author=PopularFeedTest.reader
+        )
+        Follow.objects.create(
+            user=PopularFeedTest.reader, author=PopularFeedTest.author
+        )
+        incremental = self.scores()
+        PostScore.objects.all().delete()
+        call_command('rebuild_post_scores', stdout=StringIO())
+        for post_id, score in self.scores().items():
+            self.assertAlmostEqual(score, incremental[post_id])
+
+    def test_popular_page(self):
+        """Лента читает топ одним запросом по индексу оценок."""
+        with self.assertNumQueries(1):
+            response = Client().get(reverse('posts:popular'))
+        self.assertTemplateUsed(response, 'posts/popular.html')
+        self.assertEqual(list(response.context['page_obj']),
+                         [self.new, self.old])
+
+    def test_old_events_do_not_overflow(self):
+        """Оценки хранятся в логарифмах и не переполняются со временем."""
+        Post.objects.filter(pk=self.old.pk).update(
+            created=timezone.now() + timedelta(days=365 * 50)
+        )
+        popular.rebuild([self.old.pk])
+        self.assertEqual(popular.top(1), [self.old])
@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import stats
+from ..models import Group, GroupStats, Post
+
+User = get_user_model()
+
+
+class GroupStatsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.other = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.quiet = Group.objects.create(
+            title='Тихая группа', slug='quiet', description='Описание'
+        )
+
+    def assertStats(self, group, **expected):
+        row = GroupStats.objects.get(group=group)
+        self.assertEqual(
+            {field: getattr(row, field) for field in expected}, expected
+        )
+
+    def assertMatchesRefresh(self, group):
+        """Инкрементальные счётчики совпадают с полным пересчётом."""
+        row = GroupStats.objects.get(group=group)
+        stats.refresh([group.pk], now=row.refreshed)
+        fresh = GroupStats.objects.get(group=group)
+        for field in stats.FIELDS[:-1]:
+            self.assertEqual(getattr(row, field), getattr(fresh, field))
+
+    def test_group_created_with_empty_stats(self):
+        self.assertStats(GroupStatsTest.quiet, post_count=0, last_post=None)
+
+    def test_post_create_and_delete(self):
+        """Публикация и удаление меняют счётчики на месте."""
+        group = GroupStatsTest.group
+        first = Post.objects.create(
+            text='Первый', author=GroupStatsTest.author, group=group
+        )
+        second = Post.objects.create(
+            text='Второй', author=GroupStatsTest.author, group=group
+        )
+        Post.objects.create(
+            text='Третий', author=GroupStatsTest.other, group=group
+        )
+        self.assertStats(group, post_count=3, posts_day=3, posts_week=3,
+                         author_count=2)
+        self.assertMatchesRefresh(group)
+        second.delete()
+        self.assertStats(group, post_count=2, author_count=2)
+        first.delete()
+        self.assertStats(group, post_count=1, author_count=1)
+        self.assertMatchesRefresh(group)
+
+    def test_post_moved_between_groups(self):
+        post = Post.objects.create(
+            text='Пост', author=GroupStatsTest.author,
+            group=GroupStatsTest.group,
+        )
+        post.group = GroupStatsTest.quiet
+        post.save()
+        self.assertStats(GroupStatsTest.group, post_count=0, author_count=0,
+                         last_post=None)
+        self.assertStats(GroupStatsTest.quiet, post_count=1, author_count=1,
+                         last_post=post.created)
+
+    def test_refresh_shifts_windows(self):
+        """Пересчёт убирает посты, вышедшие из окна."""
+        Post.objects.create(
+            text='Пост', author=GroupStatsTest.author,
+            group=GroupStatsTest.group,
+        )
+        stats.refresh(now=timezone.now() + timedelta(days=2))
+        self.assertStats(GroupStatsTest.group, post_count=1, posts_day=0,
+                         posts_week=1)
+
+    def test_publish_is_constant_queries(self):
+        """Публикация не пересчитывает группу по таблице постов."""
+        with CaptureQueriesContext(connection) as queries:
+            Post.objects.create(
+                text='Пост', author=GroupStatsTest.author,
+                group=GroupStatsTest.group,
+            )
+        self.assertFalse([
+            query for query in queries
+            if 'COUNT' in query['sql'] and 'posts_post' in query['sql']
+        ])
+
+    @override_settings(TRENDING_GROUPS=1)
+    def test_trending_page(self):
+        Post.objects.create(
+            text='Пост', author=GroupStatsTest.author,
+            group=GroupStatsTest.quiet,
+        )
+        with self.assertNumQueries(1):
+            response = Client().get(reverse('posts:group_index'))
+        trending = list(response.context['trending'])
+        self.assertEqual([row.group for row in trending],
+                         [GroupStatsTest.quiet])
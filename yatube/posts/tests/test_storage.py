@@ -0,0 +1,150 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from ..media import collect_orphans
+from ..models import Post
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+User = get_user_model()
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, MEDIA_GC_MIN_AGE=0)
+class ContentAddressedImageTest(TransactionTestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='auth')
+
+    def create_post(self, filename, content=SMALL_GIF):
+        return Post.objects.create(
+            author=self.user,
+            text='Пост с картинкой',
+            image=SimpleUploadedFile(
+                name=filename, content=content, content_type='image/gif'
+            ),
+        )
+
+    def image_path(self, post):
+        return os.path.join(TEMP_MEDIA_ROOT, post.image.name)
+
+    def test_same_content_stored_once(self):
+        """Одинаковые картинки хранятся одним файлом."""
+        first = self.create_post('first.gif')
+        second = self.create_post('second.GIF')
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertTrue(first.image.name.startswith('posts/'))
+        self.assertTrue(first.image.name.endswith('.gif'))
+        files = os.listdir(os.path.dirname(self.image_path(first)))
+        self.assertEqual(files, [os.path.basename(first.image.name)])
+
+    def test_duplicate_upload_refreshes_mtime(self):
+        """Повторная загрузка старого файла обновляет дату изменения."""
+        first = self.create_post('first.gif')
+        path = self.image_path(first)
+        os.utime(path, (0, 0))
+        self.create_post('second.gif')
+        self.assertGreater(os.path.getmtime(path), 0)
+
+    def test_file_deleted_with_last_reference(self):
+        first = self.create_post('first.gif')
+        second = self.create_post('second.gif')
+        path = self.image_path(first)
+        first.delete()
+        self.assertTrue(os.path.exists(path))
+        second.delete()
+        self.assertFalse(os.path.exists(path))
+
+    def test_fresh_file_kept_on_release(self):
+        """Только что записанный файл оставляется сборщику сирот."""
+        post = self.create_post('first.gif')
+        path = self.image_path(post)
+        with self.settings(MEDIA_GC_MIN_AGE=3600):
+            post.delete()
+        self.assertTrue(os.path.exists(path))
+        self.create_post('second.gif').delete()
+        self.assertFalse(os.path.exists(path))
+
+    def test_replaced_image_released(self):
+        post = self.create_post('first.gif')
+        path = self.image_path(post)
+        post.image = SimpleUploadedFile(
+            name='other.gif',
+            content=SMALL_GIF + b'\x00',
+            content_type='image/gif',
+        )
+        post.save()
+        self.assertFalse(os.path.exists(path))
+        self.assertTrue(os.path.exists(self.image_path(post)))
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class MediaGarbageCollectorTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='auth')
+        self.storage = Post._meta.get_field('image').storage
+        self.post = Post.objects.create(
+            author=self.user,
+            text='Пост с картинкой',
+            image=SimpleUploadedFile(
+                name='small.gif', content=SMALL_GIF, content_type='image/gif'
+            ),
+        )
+        self.orphans = [
+            self.storage.save(f'posts/orphan{num}.gif',
+                              ContentFile(SMALL_GIF + bytes([num])))
+            for num in range(3)
+        ]
+        self.orphans.append(self.storage._save(
+            'posts/legacy.gif', ContentFile(SMALL_GIF)
+        ))
+
+    def tearDown(self):
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def test_removes_only_unreferenced_files(self):
+        report = collect_orphans(min_age=0)
+        self.assertTrue(report['finished'])
+        self.assertEqual(report['removed'], len(self.orphans))
+        self.assertEqual(report['bytes'], len(SMALL_GIF) * 4 + 3)
+        for name in self.orphans:
+            with self.subTest(name=name):
+                self.assertFalse(self.storage.exists(name))
+        self.assertTrue(self.storage.exists(self.post.image.name))
+
+    def test_keeps_fresh_files_and_dry_run(self):
+        self.assertEqual(collect_orphans()['removed'], 0)
+        report = collect_orphans(min_age=0, dry_run=True)
+        self.assertEqual(report['removed'], len(self.orphans))
+        self.assertTrue(all(map(self.storage.exists, self.orphans)))
+
+    def test_incremental_passes(self):
+        """Обход по частям продолжается с места остановки."""
+        reports = []
+        while not reports or not reports[-1]['finished']:
+            reports.append(collect_orphans(max_dirs=2, min_age=0))
+        self.assertGreater(len(reports), 1)
+        self.assertEqual(
+            sum(report['removed'] for report in reports), len(self.orphans)
+        )
@@ -0,0 +1,128 @@
+from core.jobs import enqueue, run_job
+from core.models import Job
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from .. import popular
+from ..models import Comment, Group, Post, PostScore
+
+User = get_user_model()
+
+
+@override_settings(JOBS_MODE='sync', BULK_CHUNK_SIZE=2)
+class BulkTasksTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@test.ru', password='pass'
+        )
+        cls.spammer = User.objects.create_user(username='spammer')
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        self.admin_client = Client()
+        self.admin_client.force_login(BulkTasksTest.admin)
+        Post.objects.bulk_create(
+            Post(text=f'Спам #{num}', author=BulkTasksTest.spammer)
+            for num in range(5)
+        )
+        self.post = Post.objects.create(
+            text='Обычный пост', author=BulkTasksTest.user
+        )
+        Comment.objects.create(
+            text='купите слонов', post=self.post, author=self.spammer
+        )
+        Comment.objects.create(
+            text='хороший пост', post=self.post, author=self.user
+        )
+
+    def test_reassign_group_action(self):
+        """Действие админки переносит посты в группу через задачу."""
+        posts = Post.objects.filter(author=BulkTasksTest.spammer)
+        self.admin_client.post(reverse('admin:posts_post_changelist'), {
+            'action': 'reassign_group',
+            '_selected_action': list(posts.values_list('pk', flat=True)),
+            'group': BulkTasksTest.group.pk,
+        })
+        job = Job.objects.get(name='reassign_group')
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual((job.processed, job.total), (5, 5))
+        self.assertEqual(BulkTasksTest.group.posts.count(), 5)
+
+    def test_reassign_group_requires_group(self):
+        """Без группы или с неверной группой задача не ставится."""
+        posts = Post.objects.filter(author=BulkTasksTest.spammer)
+        posts.update(group=BulkTasksTest.group)
+        for group in ('', '999999'):
+            with self.subTest(group=group):
+                self.admin_client.post(
+                    reverse('admin:posts_post_changelist'), {
+                        'action': 'reassign_group',
+                        '_selected_action': list(
+                            posts.values_list('pk', flat=True)
+                        ),
+                        'group': group,
+                    },
+                )
+        self.assertFalse(Job.objects.filter(name='reassign_group').exists())
+        self.assertEqual(BulkTasksTest.group.posts.count(), 5)
+
+    def test_delete_author_posts(self):
+        """Удаляются все посты автора вместе с комментариями к ним."""
+        Comment.objects.create(
+            text='сам себе',
+            post=Post.objects.filter(author=BulkTasksTest.spammer).first(),
+            author=BulkTasksTest.spammer,
+        )
+        job = enqueue(
+            'delete_author_posts', {'author_ids': [BulkTasksTest.spammer.pk]}
+        )
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual(job.processed, 5)
+        self.assertFalse(
+            Post.objects.filter(author=BulkTasksTest.spammer).exists()
+        )
+        self.assertTrue(Post.objects.filter(pk=self.post.pk).exists())
+
+    def test_purge_comments_action(self):
+        """Действие админки удаляет комментарии по шаблону."""
+        self.admin_client.post(reverse('admin:posts_comment_changelist'), {
+            'action': 'purge_comments',
+            '_selected_action': list(
+                Comment.objects.values_list('pk', flat=True)
+            ),
+            'pattern': 'слонов',
+        })
+        self.assertEqual(
+            list(Comment.objects.values_list('text', flat=True)),
+            ['хороший пост'],
+        )
+
+    def test_purge_comments_in_bulk(self):
+        """Комментарии стираются пачками: одна очистка кэша на пачку."""
+        for num in range(9):
+            Comment.objects.create(
+                text=f'купите слонов #{num}', post=self.post,
+                author=self.spammer,
+            )
+        with self.settings(JOBS_MODE='worker',
+                           PAGE_CACHE_PURGE_URL='http://cache'):
+            job = enqueue('purge_comments', {'pattern': 'слонов'})
+            run_job(job.pk)
+        self.assertEqual(Comment.objects.count(), 1)
+        # Пять пачек по два комментария и сброс лент в конце.
+        self.assertEqual(
+            Job.objects.filter(name='purge_surrogate_keys').count(), 6
+        )
+        score = PostScore.objects.get(post=self.post).score
+        popular.rebuild([self.post.pk])
+        self.assertAlmostEqual(
+            PostScore.objects.get(post=self.post).score, score
+        )
@@ -0,0 +1,51 @@
+from django.contrib.auth import get_user_model
+from django.template import Context, Template
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class PostCardTagTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='auth.user@test', first_name='Лев', last_name='Толстой'
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='<b>Текст</b>',
+            group=cls.group,
+        )
+
+    def render(self, source):
+        return Template('{% load post_cards %}' + source).render(
+            Context({'post': PostCardTagTest.post})
+        )
+
+    def test_post_card_urls_match_reverse(self):
+        """Адреса в карточке совпадают с результатом reverse."""
+        card = self.render('{% post_card post group_link=True %}')
+        post = PostCardTagTest.post
+        urls = (
+            reverse('posts:profile', args=(post.author.username,)),
+            reverse('posts:post_detail', args=(post.pk,)),
+            reverse('posts:group_list', args=(post.group.slug,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertIn(f'href="{url}"', card)
+        self.assertIn('Лев Толстой', card)
+
+    def test_post_card_escapes_text(self):
+        card = self.render('{% post_card post %}')
+        self.assertIn('&lt;b&gt;Текст&lt;/b&gt;', card)
+        self.assertNotIn('все записи группы', card)
@@ -51,6 +51,7 @@ class PostURLTest(TestCase):
         self.slug = PostURLTest.group.slug
         self.list_urls_guests = {
             '/': 'posts/index.html',
+            '/group/': 'posts/group_index.html',
             f'/group/{self.slug}/': 'posts/group_list.html',
             f'/profile/{self.user.username}/': 'posts/profile.html',
             f'/posts/{self.post_id}/': 'posts/post_detail.html',
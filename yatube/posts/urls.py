@@ -1,11 +1,14 @@
 from django.urls import path
 
 from . import views
+from .feeds import FEED_TYPES, AuthorFeed, GroupFeed, LatestPostsFeed
 
 app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('popular/', views.popular, name='popular'),
+    path('group/', views.group_index, name='group_index'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
     path('profile/<str:username>/', views.profile, name='profile'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
@@ -14,6 +17,7 @@ urlpatterns = [
     path('posts/<int:post_id>/comment/', views.add_comment,
          name='add_comment'),
     path('follow/', views.follow_index, name='follow_index'),
+    path('export/', views.export_posts, name='export_posts'),
 
     path(
         'profile/<str:username>/follow/',
@@ -26,3 +30,13 @@ urlpatterns = [
         name='profile_unfollow',
     ),
 ]
+
+for feed_format in FEED_TYPES:
+    urlpatterns += [
+        path(f'feed.{feed_format}', LatestPostsFeed(feed_format),
+             name=f'feed_{feed_format}'),
+        path(f'group/<slug:slug>/feed.{feed_format}', GroupFeed(feed_format),
+             name=f'group_feed_{feed_format}'),
+        path(f'profile/<str:username>/feed.{feed_format}',
+             AuthorFeed(feed_format), name=f'author_feed_{feed_format}'),
+    ]
@@ -1,64 +1,132 @@
+from core.page_cache import add_surrogate_keys, cache_anonymous_page
+from core.loader import memoize
+from core.shortcuts import cached_object_or_404, render_public
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
-from django.shortcuts import get_object_or_404, redirect, render
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import redirect, render
 
+from . import export
+from .archive import ArchiveFeed, find_post
+from .cache import (FEED_TAG, author_lookup, author_tag, group_lookup,
+                    group_tag, post_tag)
 from .forms import CommentForm, PostForm
-from .models import Follow, Group, Post, User
+from .models import ArchivedPost, Follow, GroupStats, Post, User
+from .popular import top
+from .stats import trending
+from .tasks import notify_post_author, warm_thumbnails
 
 User = get_user_model()
 
+# Совпадает со временем жизни фрагмента {% cache 20 page_index %}.
+INDEX_CACHE_TIMEOUT = 20
 
-def paginator_func(queryset, request):
+
+def is_following(user, author):
+    """Подписан ли ``user`` на ``author``; проверяется раз за запрос."""
+    if not user.is_authenticated:
+        return False
+    return memoize(
+        ('following', user.pk, author.pk),
+        lambda: Follow.objects.filter(user=user, author=author).exists(),
+    )
+
+
+def paginator_func(queryset, request, archived=None):
+    """Страница ленты; с ``archived`` за постами идёт архив."""
+    if archived is not None:
+        queryset = ArchiveFeed(queryset, archived)
     paginator = Paginator(queryset, settings.POSTS_PAGE)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     return page_obj
 
 
+@cache_anonymous_page(timeout=INDEX_CACHE_TIMEOUT)
 def index(request):
     template = 'posts/index.html'
     context = {
-        'page_obj': paginator_func(Post.objects.all(), request)
+        'page_obj': paginator_func(
+            Post.objects.all(), request, ArchivedPost.objects.all()
+        ),
     }
-    return render(request, template, context)
+    response = render_public(request, template, context)
+    return add_surrogate_keys(response, FEED_TAG)
 
 
+@cache_anonymous_page(timeout=INDEX_CACHE_TIMEOUT)
+def popular(request):
+    context = {
+        'page_obj': paginator_func(top(settings.POPULAR_FEED_SIZE), request),
+        'popular': True,
+    }
+    response = render_public(request, 'posts/popular.html', context)
+    return add_surrogate_keys(response, FEED_TAG)
+
+
+@cache_anonymous_page(timeout=INDEX_CACHE_TIMEOUT)
+def group_index(request):
+    context = {
+        'trending': trending(settings.TRENDING_GROUPS),
+    }
+    return render_public(request, 'posts/group_index.html', context)
+
+
+@cache_anonymous_page()
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
+    group = group_lookup.get_or_404(slug)
     post_list = group.posts.all()
     context = {
         'group': group,
-        'page_obj': paginator_func(post_list, request),
+        'stats': GroupStats.objects.filter(group=group).first(),
+        'page_obj': paginator_func(
+            post_list, request, group.archived_posts.all()
+        ),
     }
-
-    return render(request, 'posts/group_list.html', context)
+    response = render_public(request, 'posts/group_list.html', context)
+    return add_surrogate_keys(response, FEED_TAG, group_tag(group.pk))
 
 
+@cache_anonymous_page()
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
+    author = author_lookup.get_or_404(username)
     user_posts = author.posts.all()
-    following = (request.user.is_authenticated
-                 and author.following.filter(user=request.user))
+    following = is_following(request.user, author)
     context = {
         'author': author,
         'following': following,
-        'page_obj': paginator_func(user_posts, request),
+        'page_obj': paginator_func(
+            user_posts, request, author.archived_posts.all()
+        ),
     }
-    return render(request, 'posts/profile.html', context)
+    response = render_public(request, 'posts/profile.html', context)
+    return add_surrogate_keys(response, FEED_TAG, author_tag(author.pk))
 
 
+@cache_anonymous_page()
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    try:
+        post = cached_object_or_404(Post, pk=post_id)
+    except Http404:
+        # Архивный пост открывается только для чтения.
+        post = find_post(post_id)
+        if post is None:
+            raise
     comments = post.comments.all()
     form = CommentForm(request.POST or None)
     context = {
         'post': post,
         'form': form,
-        'comments': comments
+        'comments': comments,
+        'archived': isinstance(post, ArchivedPost),
     }
-    return render(request, 'posts/post_detail.html', context)
+    response = render_public(request, 'posts/post_detail.html', context)
+    tags = [FEED_TAG, post_tag(post.pk), author_tag(post.author_id)]
+    if post.group_id:
+        tags.append(group_tag(post.group_id))
+    return add_surrogate_keys(response, *tags)
 
 
 @login_required
@@ -71,6 +139,8 @@ def post_create(request):
         post = form.save(commit=False)
         post.author = request.user
         form.save()
+        if post.image:
+            warm_thumbnails.delay(post_id=post.pk)
         return redirect('posts:profile', request.user)
     form = PostForm()
     return render(request, 'posts/create_post.html', {'form': form})
@@ -78,7 +148,7 @@ def post_create(request):
 
 @login_required
 def post_edit(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    post = cached_object_or_404(Post, pk=post_id)
     if request.user != post.author:
         return redirect('posts:post_detail', post_id)
     form = PostForm(
@@ -99,28 +169,35 @@ def post_edit(request, post_id):
 
 @login_required
 def add_comment(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    post = cached_object_or_404(Post, pk=post_id)
     form = CommentForm(request.POST or None)
     if form.is_valid():
         comment = form.save(commit=False)
         comment.author = request.user
         comment.post = post
         comment.save()
+        notify_post_author.delay(comment_id=comment.pk)
     return redirect('posts:post_detail', post_id=post_id)
 
 
 @login_required
 def follow_index(request):
     posts = Post.objects.filter(author__following__user=request.user)
+    archived = ArchivedPost.objects.filter(
+        author__following__user=request.user
+    )
+    # Подписки меняются без изменения архива: его число не кэшируется.
     context = {
-        'page_obj': paginator_func(posts, request),
+        'page_obj': paginator_func(
+            ArchiveFeed(posts, archived, cache_count=False), request
+        ),
     }
     return render(request, 'posts/follow.html', context)
 
 
 @login_required
 def profile_follow(request, username):
-    author = get_object_or_404(User, username=username)
+    author = author_lookup.get_or_404(username)
     if author == request.user:
         return redirect('posts:profile', username)
 
@@ -130,6 +207,28 @@ def profile_follow(request, username):
 
 @login_required
 def profile_unfollow(request, username):
-    author = get_object_or_404(User, username=username)
+    author = author_lookup.get_or_404(username)
     Follow.objects.get(user=request.user, author=author).delete()
     return redirect('posts:profile', username)
+
+
+@login_required
+def export_posts(request):
+    """Отдаёт всю историю постов пользователя потоком."""
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in export.FORMATS:
+        raise Http404('Неизвестный формат выгрузки.')
+    name = export.filename(request.user, export_format)
+    if request.GET.get('images'):
+        response = StreamingHttpResponse(
+            export.export_zip(request.user, export_format, name),
+            content_type='application/zip',
+        )
+        name += '.zip'
+    else:
+        response = StreamingHttpResponse(
+            export.export(request.user, export_format),
+            content_type=export.FORMATS[export_format],
+        )
+    response['Content-Disposition'] = f'attachment; filename="{name}"'
+    return response
@@ -1,3 +1,34 @@
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
 
+from posts.deletion import restore_user, soft_delete_user
 
-# Register your models here.
+User = get_user_model()
+
+
+class SoftDeleteUserAdmin(UserAdmin):
+    """Удаление пользователя скрывает его сразу, а стирает в фоне."""
+
+    def get_deleted_objects(self, objs, request):
+        # Стандартная страница подтверждения собирает весь каскад
+        # удаления, у активного автора это десятки тысяч объектов.
+        return [str(obj) for obj in objs], {}, set(), []
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # Включённый снова пользователь получает обратно посты и
+        # комментарии, скрытые его удалением.
+        if change and obj.is_active and 'is_active' in form.changed_data:
+            restore_user(obj)
+
+    def delete_model(self, request, obj):
+        soft_delete_user(obj)
+
+    def delete_queryset(self, request, queryset):
+        for user in queryset:
+            soft_delete_user(user)
+
+
+admin.site.unregister(User)
+admin.site.register(User, SoftDeleteUserAdmin)
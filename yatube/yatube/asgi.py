@@ -0,0 +1,18 @@
+"""
+ASGI config for yatube project.
+
+It exposes the ASGI callable as a module-level variable named
+``application``, e.g. ``uvicorn yatube.asgi:application``. Django 2.2
+has no native ASGI support, so the WSGI application from
+``yatube.wsgi`` runs in a bounded thread pool (``ASGI_MAX_WORKERS``).
+"""
+
+from django.conf import settings
+
+from core.asgi import WsgiToAsgi
+
+from .wsgi import application as wsgi_application
+
+application = WsgiToAsgi(
+    wsgi_application, max_workers=settings.ASGI_MAX_WORKERS
+)
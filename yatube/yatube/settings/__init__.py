@@ -0,0 +1,20 @@
+"""Настройки проекта.
+
+Профиль выбирается переменной окружения ``YATUBE_ENV``: ``dev`` (по
+умолчанию), ``test`` или ``prod``. Профиль можно указать и напрямую:
+``DJANGO_SETTINGS_MODULE=yatube.settings.prod``.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+PROFILE = os.environ.get('YATUBE_ENV', 'dev')
+
+if PROFILE == 'dev':
+    from .dev import *  # noqa: F401,F403
+elif PROFILE == 'test':
+    from .test import *  # noqa: F401,F403
+elif PROFILE == 'prod':
+    from .prod import *  # noqa: F401,F403
+else:
+    raise ImproperlyConfigured(f'Неизвестный профиль YATUBE_ENV: {PROFILE}')
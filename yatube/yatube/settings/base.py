@@ -0,0 +1,278 @@
+"""
+Django settings for yatube project: common part of all profiles.
+
+Generated by 'django-admin startproject' using Django 2.2.19.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/2.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/2.2/ref/settings/
+"""
+
+import os
+
+# Build paths inside the project like this: os.path.join(BASE_DIR, ...)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)
+)))
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/2.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = 'e!aw^@twme!u47b%)^b16rjflnd4n7_dzpi8ftlfgyqtlw6dnk'
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1',
+    '[::1]',
+    'testserver',
+    'www.silkyhand.pythonanywhere.com',
+    'silkyhand.pythonanywhere.com',
+]
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'posts.apps.PostsConfig',
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'users.apps.UsersConfig',
+    'core.apps.CoreConfig',
+    'about.apps.AboutConfig',
+    'sorl.thumbnail',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'core.middleware.BatchLoaderMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.AnonymousReadMiddleware',
+    'core.middleware.RateLimitMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.TemplateProfileMiddleware',
+]
+
+ROOT_URLCONF = 'yatube.urls'
+
+# ModelBackend остаётся для сессий, открытых до RequestCachedModelBackend.
+AUTHENTICATION_BACKENDS = [
+    'core.backends.RequestCachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+LOGIN_URL = 'users:login'
+LOGIN_REDIRECT_URL = 'posts:index'
+# LOGOUT_REDIRECT_URL = 'posts:index'
+
+# Компиляция шаблонов проекта при старте (core.warmup).
+TEMPLATES_PRECOMPILE = False
+# Заголовок Server-Timing и лог со временем рендеринга шаблонов и тегов.
+TEMPLATE_PROFILING = os.environ.get('YATUBE_TEMPLATE_PROFILING') == '1'
+# Пакетная загрузка связанных объектов в запросе (core.loader).
+BATCH_LOADER = True
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+# Загрузчики заданы явно, без APP_DIRS, а app_directories в их числе:
+# проверка debug_toolbar смотрит только на APP_DIRS.
+SILENCED_SYSTEM_CHECKS = ['debug_toolbar.W006']
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'core.context_processors.year.year',
+            ],
+        },
+    },
+    # Публичные страницы для анонимных читателей: без auth и messages.
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'NAME': 'public',
+        'DIRS': [TEMPLATES_DIR],
+        'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
+            'context_processors': [
+                'django.template.context_processors.request',
+                'core.context_processors.year.year',
+            ],
+        },
+    },
+]
+PUBLIC_TEMPLATE_ENGINE = 'public'
+
+WSGI_APPLICATION = 'yatube.wsgi.application'
+ASGI_APPLICATION = 'yatube.asgi.application'
+# Сколько потоков ASGI-режима одновременно выполняют Django.
+ASGI_MAX_WORKERS = int(os.environ.get('YATUBE_ASGI_MAX_WORKERS', 16))
+
+
+# Database
+# https://docs.djangoproject.com/en/2.2/ref/settings/#databases
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+    }
+}
+
+
+# Password validation
+# https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/2.2/topics/i18n/
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/2.2/howto/static-files/
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Без DEBUG файлы отдаёт core.media.serve_media. 'nginx' или 'apache'
+# передают отправку веб-серверу (X-Accel-Redirect / X-Sendfile).
+MEDIA_ACCEL = os.environ.get('YATUBE_MEDIA_ACCEL')
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24
+# Картинки моложе стольких секунд не удаляются как ненужные: их могли
+# только что загрузить, а пост ещё не сохранён.
+MEDIA_GC_MIN_AGE = 60 * 60
+
+STATIC_URL = '/static/'
+
+STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+# Раздача собранной статики со сжатыми копиями из yatube.wsgi.
+STATIC_SERVE_COMPRESSED = False
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+POSTS_PAGE = 10
+TRENDING_GROUPS = 10
+# Сколько строк читать из базы за раз при выгрузке истории постов.
+EXPORT_CHUNK_SIZE = 500
+# Сколько последних постов отдают ленты RSS, Atom и JSON Feed.
+FEED_ITEMS = 20
+# Лента «Популярное»: сколько постов в ней, за сколько секунд вес
+# события уменьшается вдвое, веса событий и как далеко в прошлое
+# подписка на автора поднимает его посты.
+POPULAR_FEED_SIZE = 100
+POPULAR_HALF_LIFE = 12 * 60 * 60
+POPULAR_WEIGHTS = {'post': 1, 'comment': 1, 'follow': 2}
+POPULAR_FOLLOW_WINDOW = 3 * 24 * 60 * 60
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Кэш страниц для анонимных читателей (core.page_cache)
+PAGE_CACHE_ENABLED = False
+PAGE_CACHE_TIMEOUT = 60 * 5
+# Адрес обратного прокси для PURGE-запросов с заголовком Surrogate-Key.
+PAGE_CACHE_PURGE_URL = os.environ.get('YATUBE_PAGE_CACHE_PURGE_URL')
+# Кэш групп и авторов по slug и имени из адреса (core.lookups):
+# найденные объекты и, недолго, ответы 404.
+LOOKUP_CACHE_TIMEOUT = 60 * 60
+LOOKUP_MISSING_TIMEOUT = 60
+
+CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
+
+# Лимиты записи по имени маршрута (core.ratelimit): запросов за
+# секунду, минуту, час или сутки на пользователя и на IP. Подписка и
+# отписка — ссылки, поэтому для них считаются и GET-запросы.
+RATE_LIMIT_ENABLED = False
+RATE_LIMITS = {
+    'posts:post_create': {'user': '10/m', 'ip': '30/m'},
+    'posts:add_comment': {'user': '20/m', 'ip': '60/m'},
+    'posts:profile_follow': {'user': '30/m', 'ip': '100/m',
+                             'methods': ('GET', 'POST')},
+    'posts:profile_unfollow': {'user': '30/m', 'ip': '100/m',
+                               'methods': ('GET', 'POST')},
+    'users:signup': {'ip': '5/h'},
+}
+# Ключ request.META с адресом клиента; за прокси — 'HTTP_X_REAL_IP'.
+RATE_LIMIT_IP_META = 'REMOTE_ADDR'
+
+# Цель для manage.py profile_startup: от запуска процесса до первого
+# ответа, миллисекунды.
+STARTUP_TARGET_MS = 1000
+
+# Фоновые задачи (core.jobs): sync — сразу, thread — в потоке после
+# коммита, worker — только очередь, выполняет manage.py runworker.
+JOBS_MODE = os.environ.get('YATUBE_JOBS_MODE', 'thread')
+JOBS_RETRY_DELAY = 10
+JOBS_RETRY_MAX_DELAY = 60 * 60
+# Задача в работе дольше этого срока считается брошенной.
+JOBS_LOCK_TIMEOUT = 60 * 30
+JOBS_MAINTENANCE_INTERVAL = 30
+JOBS_SCHEDULE = {
+    'collect_media_garbage': {'interval': 60 * 60, 'params': {'max_dirs': 16}},
+    'clear_expired_sessions': {'interval': 60 * 60},
+    'refresh_group_stats': {'interval': 15 * 60},
+    'archive_old_posts': {'interval': 24 * 60 * 60},
+    'purge_deleted': {'interval': 10 * 60},
+}
+BULK_CHUNK_SIZE = 500
+# Пауза в секундах между пачками при окончательном удалении и архивации.
+PURGE_THROTTLE = 0.1
+# Сколько секунд удалённого пользователя можно восстановить, прежде
+# чем задача purge_user сотрёт его (posts.deletion).
+USER_PURGE_DELAY = 24 * 60 * 60
+# Посты старше стольких дней переносятся в архив (posts.archive).
+ARCHIVE_AFTER_DAYS = 365
+# Сколько секунд хранится число архивных постов ленты.
+ARCHIVE_COUNT_TIMEOUT = 60 * 60
@@ -0,0 +1,75 @@
+"""Боевой профиль.
+
+Пул постоянных соединений с базой, кэширующий загрузчик с прогревом
+шаблонов, общий для всех процессов кэш и сессии в нём, сжатие
+ответов, статика с хэшами и кэш страниц. Отладочных приложений нет.
+"""
+import copy
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import DATABASES, MIDDLEWARE, SECRET_KEY, TEMPLATES
+
+SECRET_KEY = os.environ.get('YATUBE_SECRET_KEY', SECRET_KEY)
+
+if os.environ.get('YATUBE_DB_NAME'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'core.db.backends.postgresql',
+            'NAME': os.environ['YATUBE_DB_NAME'],
+            'USER': os.environ.get('YATUBE_DB_USER', ''),
+            'PASSWORD': os.environ.get('YATUBE_DB_PASSWORD', ''),
+            'HOST': os.environ.get('YATUBE_DB_HOST', ''),
+            'PORT': os.environ.get('YATUBE_DB_PORT', ''),
+        }
+    }
+else:
+    DATABASES = copy.deepcopy(DATABASES)
+    DATABASES['default']['ENGINE'] = 'core.db.backends.sqlite3'
+# Соединения живут в пуле процесса (core.db.pool): в конце запроса
+# соединение возвращается в пул, а не закрывается, поэтому
+# CONN_MAX_AGE = 0. MAX_SIZE ограничивает число соединений процесса.
+DATABASES['default']['CONN_MAX_AGE'] = 0
+DATABASES['default']['POOL'] = {
+    'MAX_SIZE': int(os.environ.get('YATUBE_DB_POOL_SIZE', 10)),
+    'TIMEOUT': 30,
+    'MAX_IDLE': 300,
+    'MAX_LIFETIME': 60 * 60,
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': os.environ.get('YATUBE_MEMCACHED', '127.0.0.1:11211'),
+    }
+}
+
+# Сессия читается из кэша, в базу идёт только запись. Вариант без базы
+# вовсе — django.contrib.sessions.backends.signed_cookies.
+SESSION_ENGINE = os.environ.get(
+    'YATUBE_SESSION_ENGINE', 'django.contrib.sessions.backends.cached_db'
+)
+
+MIDDLEWARE = MIDDLEWARE[:1] + [
+    'django.middleware.gzip.GZipMiddleware',
+] + MIDDLEWARE[1:]
+
+TEMPLATES_PRECOMPILE = True
+TEMPLATE_LOADERS = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+TEMPLATES = [
+    dict(engine, OPTIONS=dict(engine['OPTIONS'], loaders=TEMPLATE_LOADERS))
+    for engine in TEMPLATES
+]
+
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+STATIC_SERVE_COMPRESSED = True
+PAGE_CACHE_ENABLED = True
+RATE_LIMIT_ENABLED = True
+RATE_LIMIT_IP_META = os.environ.get('YATUBE_RATE_LIMIT_IP_META', 'REMOTE_ADDR')
+
+JOBS_MODE = os.environ.get('YATUBE_JOBS_MODE', 'worker')
@@ -0,0 +1,10 @@
+"""Прогон тестов: без отладочных приложений, задачи выполняются сразу."""
+from .base import *  # noqa: F401,F403
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+JOBS_MODE = 'sync'